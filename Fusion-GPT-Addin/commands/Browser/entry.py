@@ -84,6 +84,9 @@ def start():
     # Add command created handler. The function passed here will be executed when the command is executed.
     futil.add_handler(cmd_def.commandCreated, command_created)
 
+    # commands run from the Fusion UI may change the design
+    futil.add_handler(ui.commandTerminated, command_terminated)
+
     # ******************************** Create Command Control ********************************
     # Get target workspace for the command.
     workspace = ui.workspaces.itemById(WORKSPACE_ID)
@@ -141,6 +144,10 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 # server interface
 server_itf = gpt_client.GptClient()
 
+def command_terminated(args: adsk.core.ApplicationCommandEventArgs):
+    server_itf.design_changed()
+
+
 def command_execute(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     futil.log(f'{CMD_NAME}: Command execute event.')
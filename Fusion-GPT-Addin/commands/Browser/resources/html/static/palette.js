@@ -367,6 +367,50 @@ class Thread {
     }// end toolCallResponse
 
 
+    /*
+     *  per run timing summary, sent when "Trace Runs" is selected
+     */
+    traceSummary(data){
+
+        var rows = data.rows;
+
+        // run container, fall back to output container if run id missing
+        var container = document.getElementById(`response_${data.run_id}`);
+        if (container == null){
+            container = document.querySelector('.output-container');
+        };
+
+        var traceContainer = document.createElement('div');
+        traceContainer.className = 'trace-summary';
+
+        var traceInfo = document.createElement('span');
+        traceInfo.className = "span-info";
+        traceInfo.textContent = `trace: ${data.trace_path}, spans: ${data.n_spans}`;
+        traceContainer.appendChild(traceInfo);
+
+        var table = document.createElement('table');
+        var header = table.insertRow();
+        ["process", "name", "count", "total_ms", "mean_ms", "max_ms", "pct_wall"].forEach((col) => {
+            var th = document.createElement('th');
+            th.textContent = col;
+            header.appendChild(th);
+        });
+
+        for (let i=0; i < rows.length; i++) {
+            var row = table.insertRow();
+            [rows[i].process, rows[i].name, rows[i].count, rows[i].total_ms,
+             rows[i].mean_ms, rows[i].max_ms, rows[i].pct_wall].forEach((val) => {
+                row.insertCell().textContent = val;
+            });
+        };
+
+        traceContainer.appendChild(table);
+        container.appendChild(traceContainer);
+
+        this.scrollToBottom();
+    }// end traceSummary
+
+
 
 } // end thread
 
@@ -643,6 +687,16 @@ class Control{
             this.outputContainer.innerHTML = "";
         };
 
+         /*
+          * playback most recent session recording file
+          */
+         playbackRecording(){
+            const args = {function_name: "playback_recording" };
+            adsk.fusionSendData("function_call", JSON.stringify(args))
+                .then((result) =>{ });
+            this.outputContainer.innerHTML = "";
+        };
+
          printResponseMessages(){
             const args = {function_name: "print_response_messages" };
             adsk.fusionSendData("function_call", JSON.stringify(args))
@@ -650,6 +704,15 @@ class Control{
             //this.outputContainer.innerHTML = "";
         };
 
+         /*
+          * print model backend latency (time to first token, tool round trip) to console
+          */
+         printBackendMetrics(){
+            const args = {function_name: "get_backend_metrics" };
+            adsk.fusionSendData("function_call", JSON.stringify(args))
+                .then((result) =>{ });
+        };
+
          clearOutputs(){
             this.outputContainer.innerHTML = "";
         };
@@ -1183,6 +1246,9 @@ window.fusionJavaScriptHandler = {
             } else if (action === "toolCallResponse") {
                 thread.toolCallResponse(messageData);
 
+            } else if (action === "traceSummary") {
+                thread.traceSummary(messageData);
+
             } else if (action === "get_initial") {
                 control.getSettings();
 
@@ -17,7 +17,16 @@ user_config.read(config_path)
 
 default_config = user_config["DEFAULT"]
 
-LOCAL_CAD_PATH = default_config["LOCAL_CAD_PATH"]
+LOCAL_CAD_PATH = default_config.get("LOCAL_CAD_PATH", "")
+
+# per run Chrome trace files, written when "Trace Runs" is selected
+TRACE_DIR = os.path.join(os.path.dirname(__file__), "traces")
+
+# session recordings, JSON lines, replayed with MockServer
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), "recordings")
+
+# Fusion API class descriptions, one JSON file per Fusion version
+INTROSPECTION_CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache")
 
 # Set to False to remove most log messages from text palette
 DEBUG = True
@@ -0,0 +1,253 @@
+# class_introspection
+import os
+import json
+import inspect
+import importlib
+
+
+# bump when the description format changes, invalidates cache files
+CACHE_FORMAT = 1
+
+# members never described, "detail" descriptions keep more of them
+EXCLUDE_DETAIL = {"cast", "classType", "__init__", "__del__"}
+
+EXCLUDE_SUMMARY = EXCLUDE_DETAIL | {
+    "thisown",
+    "revisionId", "dataComponent", "decals", "activeSheetMetalRule",
+    "allAsBuiltJoints", "allJointOrigins", "allJoints", "allOccurrences",
+    "allTangentRelationships", "attributes", "canvases", "findBRepUsingRay",
+    "internalCommand", "createThumbnail","allOccurrencesByComponent",
+    "occurrencesByComponent", "configurationRow", "configuredDataFile",
+    "switchConfiguration", "setAsBallJointMotion", "setAsCylindricalJointMotion",
+    "setAsPinSlotJointMotion","setAsPlanarJointMotion", "setAsRevoluteJointMotion",
+    "setAsRigidJointMotion", "createForAssemblyContext" , "meshManager", "findByTempId",
+    "convert", "createSpunProfile", "createSpunProfileInput", "partNumber",
+    "createFlatPattern", "saveCopyAs", "replace", "setAsSliderJointMotion",
+    "importSVG", "include", "redefine" , "projectCutEdges", "project", "projectToSurface",
+    "moveToComponent", "isComputeDeferred", "intersectWithSketchPlane", "isValid", "trim",
+    "lumps","copyTo", "createBRepEdgeProfile", "documentReference", "getPhysicalProperties",
+    "setCenterlineState", "findBRepUsingPoint", "createOpenProfile"
+}
+
+
+def import_class_from_path(path: str):
+    """
+    Attempt to import something like 'adsk.fusion.Sketch'.
+    Returns (cls, None) if successful, or (None, errorString) if failed.
+    """
+    tokens = path.split(".")
+    if len(tokens) < 2:
+        return None, f"Invalid class path: '{path}'."
+    mod_str = ".".join(tokens[:-1])
+    cls_str = tokens[-1]
+    try:
+        mod = importlib.import_module(mod_str)
+    except ModuleNotFoundError:
+        return None, f"Could not import module '{mod_str}'."
+    cls = getattr(mod, cls_str, None)
+    if cls is None:
+        return None, f"Class '{cls_str}' not found in '{mod_str}'."
+    return cls, None
+
+
+def resolve_class(class_name: str):
+    """
+    full path (adsk.fusion.Sketch) or class name, tries adsk.fusion then adsk.core
+    returns (cls, resolved_path, error)
+    """
+    if "." in class_name:
+        cls, err = import_class_from_path(class_name)
+        return cls, class_name, err
+
+    for mod_str in ["adsk.fusion", "adsk.core"]:
+        path = f"{mod_str}.{class_name}"
+        cls, err = import_class_from_path(path)
+        if not err and cls:
+            return cls, path, None
+
+    return None, None, f"Could not find class '{class_name}' in adsk.fusion or adsk.core."
+
+
+def method_members(cls) -> dict:
+    """pure Python functions and C++ extension method descriptors"""
+    members = dict(inspect.getmembers(cls, predicate=inspect.isfunction))
+    for name, desc in inspect.getmembers(cls, predicate=inspect.ismethoddescriptor):
+        if name not in members:
+            members[name] = desc
+    return members
+
+
+def property_type(member_obj):
+    """object type from a property getter's return annotation, or None"""
+    if not inspect.isdatadescriptor(member_obj):
+        return None
+
+    fget = getattr(member_obj, 'fget', None)
+    if not fget or not callable(fget):
+        return None
+
+    try:
+        fget_sig = inspect.signature(fget)
+    except ValueError:
+        return None
+
+    if fget_sig.return_annotation is inspect.Signature.empty:
+        return None
+
+    return_annotation = fget_sig.return_annotation
+    if isinstance(return_annotation, str) and ":" in return_annotation:
+        return return_annotation.split(":")[-1].strip(">").strip()
+    return return_annotation
+
+
+def method_params(py_callable) -> list:
+    """(name, default, annotation str) for each parameter except self"""
+    try:
+        sig = inspect.signature(py_callable)
+    except (ValueError, TypeError):
+        return []
+
+    params = []
+    for param_name, param in sig.parameters.items():
+        if param_name == "self":
+            continue
+        default_val = None if param.default is param.empty else param.default
+        annotation_str = None if param.annotation is param.empty else str(param.annotation)
+        if isinstance(annotation_str, str):
+            annotation_str = annotation_str.replace("\n", " ")
+        params.append((param_name, default_val, annotation_str))
+    return params
+
+
+def describe_class(cls, detail: bool) -> dict:
+    """
+    methods and attributes of a class
+    summary: method -> ["param:type", ...], attribute -> object type
+    detail: method -> {params, doc}, attribute -> {doc, objectType}
+    """
+    exclude = EXCLUDE_DETAIL if detail else EXCLUDE_SUMMARY
+
+    cls_info = {
+        "methods": {},
+        "attributes": {}
+    }
+
+    methods = method_members(cls)
+    for name, func_obj in methods.items():
+        if name[0] == "_" or name in exclude:
+            continue
+
+        params = method_params(func_obj)
+        if detail:
+            cls_info["methods"][name] = {
+                "params": [{"name": n, "default": d, "paramType": a} for n, d, a in params],
+                "doc": (inspect.getdoc(func_obj) or "").replace("\n", " ")
+            }
+        else:
+            cls_info["methods"][name] = [f"{n}:{a}" for n, d, a in params]
+
+    for name, member_obj in inspect.getmembers(cls):
+        if name[0] == "_" or name in exclude or name in methods:
+            continue
+        if callable(member_obj):
+            continue
+
+        object_type = property_type(member_obj) or member_obj.__class__.__name__
+        if detail:
+            cls_info["attributes"][name] = {
+                "doc": (inspect.getdoc(member_obj) or "").replace("\n", " "),
+                "objectType": object_type
+            }
+        else:
+            cls_info["attributes"][name] = object_type
+
+    return cls_info
+
+
+class ClassIntrospector:
+    """
+    Memoized class descriptions, persisted to a JSON file per Fusion version.
+    The API surface only changes with Fusion updates, so warm calls never
+    walk inspect.getmembers.
+    """
+
+    def __init__(self, cache_path: str = None, version: str = None):
+        self.cache_path = cache_path
+        self.version = version
+        self.memo = {"summary": {}, "detail": {}}
+        self.dirty = False
+        self.n_computed = 0
+
+        self.load()
+
+    def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if cached.get("format") != CACHE_FORMAT or cached.get("version") != self.version:
+            return
+
+        for mode in self.memo:
+            self.memo[mode].update(cached.get(mode, {}))
+
+    def save(self):
+        """write the cache file if new classes were described"""
+        if not self.dirty or not self.cache_path:
+            return
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # parameter defaults can be enums or other non JSON values
+            json.dump({"format": CACHE_FORMAT, "version": self.version, **self.memo}, f, default=str)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    def describe(self, class_name: str, detail: bool = False) -> dict:
+        """description of one class, errors are returned but not cached"""
+        mode = "detail" if detail else "summary"
+        info = self.memo[mode].get(class_name)
+        if info is not None:
+            return info
+
+        cls, resolved_path, err = resolve_class(class_name)
+        if err:
+            return {"error": err}
+
+        info = describe_class(cls, detail)
+        if detail and "." not in class_name:
+            info["resolvedPath"] = resolved_path
+
+        # round trip so memo and disk cache hold the same values
+        info = json.loads(json.dumps(info, default=str))
+
+        self.memo[mode][class_name] = info
+        self.dirty = True
+        self.n_computed += 1
+        return info
+
+    def describe_many(self, class_names: list, detail: bool = False) -> dict:
+        results = {name: self.describe(name, detail) for name in class_names}
+        self.save()
+        return results
+
+
+# one introspector per cache file, shared by all tool collections
+_introspectors = {}
+
+
+def get_introspector(cache_dir: str, version: str) -> ClassIntrospector:
+    """introspector for the running Fusion version"""
+    safe_version = "".join(c if c.isalnum() or c in "._-" else "_" for c in str(version))
+    cache_path = os.path.join(cache_dir, f"fusion_classes_{safe_version}.json")
+
+    introspector = _introspectors.get(cache_path)
+    if introspector is None:
+        introspector = ClassIntrospector(cache_path, str(version))
+        _introspectors[cache_path] = introspector
+    return introspector
@@ -0,0 +1,126 @@
+# columnar
+import operator
+from array import array
+
+# numpy is optional, Fusion's bundled Python does not include it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# WHERE operators evaluated on float columns
+COMPARE_OPS = {
+    "=": operator.eq,
+    "NOT =": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    "NOT >": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "NOT <": operator.ge,
+}
+
+
+def is_numeric_condition(cond: dict) -> bool:
+    """comparison against a number, e.g length > 2"""
+    value = cond["value"]
+    return (
+        cond["operator"] in COMPARE_OPS
+        and isinstance(value, (int, float))
+        and not isinstance(value, bool)
+    )
+
+
+def selected_indexes(mask) -> list:
+    """row indexes where mask is true"""
+    if np is not None:
+        return np.flatnonzero(mask).tolist()
+    return [i for i, m in enumerate(mask) if m]
+
+
+def sort_indexes(indexes: list, column, reverse: bool = False) -> list:
+    """row indexes ordered by column value, stable like sorted()"""
+    if np is not None:
+        idx = np.asarray(indexes, dtype=np.intp)
+        values = column[idx]
+        order = np.argsort(-values if reverse else values, kind="stable")
+        return idx[order].tolist()
+    return sorted(indexes, key=column.__getitem__, reverse=reverse)
+
+
+class NumericColumns:
+    """
+    Float columns for one object type, captured in one pass over the objects
+    the first time an attribute path is queried. Paths with any non numeric
+    value (None, strings, errors) are recorded as None and use the row by
+    row path, so results match it exactly.
+    """
+
+    def __init__(self, objs: list, source=None):
+        self.objs = objs
+        # collection the objects were read from, columns are indexed by its order
+        self.source = source
+        # attribute path: float column, or None when not numeric
+        self.columns = {}
+
+    def matches(self, source) -> bool:
+        """
+        snapshot taken from this collection and still the same length,
+        row indexes of the columns are only valid for it
+        """
+        return self.source is source and len(self.objs) == getattr(source, "count", None)
+
+    def captured(self, attr_path: str):
+        return self.columns.get(attr_path)
+
+    def column(self, attr_path: str, get_value):
+        """float column for attr_path, get_value(obj, attr_path) returns (value, errors)"""
+        if attr_path in self.columns:
+            return self.columns[attr_path]
+
+        values = array("d")
+        col = values
+        for obj in self.objs:
+            val, errors = get_value(obj, attr_path)
+            if errors or isinstance(val, bool) or not isinstance(val, (int, float)):
+                col = None
+                break
+            values.append(val)
+
+        if col is not None and np is not None:
+            col = np.frombuffer(values, dtype=np.float64)
+
+        self.columns[attr_path] = col
+        return col
+
+    def where_mask(self, conditions: list, get_value):
+        """
+        boolean mask for WHERE conditions chained left to right with AND/OR,
+        same as match_object_against_conditions. None unless every condition
+        is a numeric comparison on a numeric column
+        """
+        if not conditions or not all(is_numeric_condition(c) for c in conditions):
+            return None
+
+        columns = [self.column(c["attrName"], get_value) for c in conditions]
+        if any(col is None for col in columns):
+            return None
+
+        mask = None
+        for cond, col in zip(conditions, columns):
+            compare = COMPARE_OPS[cond["operator"]]
+            value = cond["value"]
+            if np is not None:
+                cond_mask = compare(col, value)
+            else:
+                cond_mask = [compare(v, value) for v in col]
+
+            if mask is None:
+                mask = cond_mask
+            elif cond.get("logicOpBefore") == "OR":
+                mask = (mask | cond_mask) if np is not None else [a or b for a, b in zip(mask, cond_mask)]
+            else:
+                mask = (mask & cond_mask) if np is not None else [a and b for a, b in zip(mask, cond_mask)]
+
+        return mask
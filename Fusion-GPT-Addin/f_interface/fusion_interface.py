@@ -25,7 +25,7 @@ from .. import config
 from ..lib import fusion360utils as futil
 
 from . import modules
-from .modules import cad_modeling, shared, transient_objects, document_data, utilities
+from .modules import cad_modeling, shared, transient_objects, document_data, utilities, design_diff
 from .modules.shared import ToolCollection
 
 #print(modules)
@@ -76,6 +76,7 @@ class FusionInterface:
             utilities.ImportExport(ent_dict),
             utilities.Joints(ent_dict),
             cad_modeling.ModifyObjects(ent_dict),
+            design_diff.DesignChanges(ent_dict),
         ]
 
         fusion_methods = {}
@@ -84,13 +85,24 @@ class FusionInterface:
                 # add method from container classes to main interface class
                 setattr(self, method_name, method)
 
+    def end_open_batch(self):
+        """
+        commit a modeling batch left open by the model, returns the commit
+        results or None. Not a tool call, called by GptClient
+        """
+        # looked up on the module, the imported name is stale after a reload
+        return shared.ToolCollection.finish_batch()
+
     # TODO do this without hard coading modules name
     def _reload_modules(self):
+        # batch state lives on the ToolCollection class replaced by the reload
+        self.end_open_batch()
         importlib.reload(shared)
         importlib.reload(transient_objects)
         importlib.reload(document_data)
         importlib.reload(cad_modeling)
         importlib.reload(utilities)
+        importlib.reload(design_diff)
 
     def update_settings(self, settings_dict ):
         ToolCollection.update(settings_dict)
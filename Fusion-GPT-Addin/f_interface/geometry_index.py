@@ -0,0 +1,142 @@
+# geometry_index
+import math
+import heapq
+
+
+class KDTree:
+    """
+    Static 3D k-d tree over row locations, rows without a location are
+    not indexed. Nodes are (row index, axis, left, right) tuples.
+    """
+
+    def __init__(self, points: list):
+        self.points = points
+        indexes = [i for i, p in enumerate(points) if p is not None]
+        self.root = self._build(indexes, 0)
+
+    def _build(self, indexes: list, depth: int):
+        if not indexes:
+            return None
+        axis = depth % 3
+        indexes.sort(key=lambda i: self.points[i][axis])
+        mid = len(indexes) // 2
+        return (
+            indexes[mid],
+            axis,
+            self._build(indexes[:mid], depth + 1),
+            self._build(indexes[mid + 1:], depth + 1),
+        )
+
+    def nearest(self, point: list, k: int, max_distance: float = math.inf, accept=None) -> list:
+        """
+        up to k (distance, row index) pairs closest to point, nearest first.
+        accept(row index) filters rows while searching
+        """
+        # max heap of (-distance, row index)
+        heap = []
+
+        def visit(node):
+            if node is None:
+                return
+            index, axis, left, right = node
+            location = self.points[index]
+
+            distance = math.dist(location, point)
+            if distance <= max_distance and (accept is None or accept(index)):
+                if len(heap) < k:
+                    heapq.heappush(heap, (-distance, index))
+                elif distance < -heap[0][0]:
+                    heapq.heapreplace(heap, (-distance, index))
+
+            diff = point[axis] - location[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+
+            bound = max_distance if len(heap) < k else min(max_distance, -heap[0][0])
+            if abs(diff) <= bound:
+                visit(far)
+
+        if k > 0:
+            visit(self.root)
+        return sorted((-d, i) for d, i in heap)
+
+
+class ReferenceTable:
+    """
+    Joint origin reference rows for one component, with the attributes
+    queries filter on kept next to each row. The k-d tree is built on the
+    first spatial query.
+    """
+
+    def __init__(self, revision: tuple):
+        # body and sketch revisions the table was built from
+        self.revision = revision
+        self.rows = []
+        self.points = []
+        self.radii = []
+        # unit normal of planar faces and circular edges, else None
+        self.normals = []
+        self._tree = None
+
+    def add(self, row: dict, location: list, radius: float = None, normal: list = None):
+        self.rows.append(row)
+        self.points.append(tuple(location) if location is not None else None)
+        self.radii.append(radius)
+        self.normals.append(unit_vector(normal) if normal is not None else None)
+
+    @property
+    def tree(self) -> KDTree:
+        if self._tree is None:
+            self._tree = KDTree(self.points)
+        return self._tree
+
+    def row_filter(self, geometry_types: set, edge_types: set, radius: float, radius_tolerance: float,
+                   normal: list, normal_tolerance_deg: float):
+        """accept(row index) for the given filters"""
+        direction = unit_vector(normal) if normal else None
+        min_cos = math.cos(math.radians(normal_tolerance_deg))
+
+        def accept(index):
+            row = self.rows[index]
+            if row["geometryType"] not in geometry_types:
+                return False
+            if row["geometryType"] == "Edge" and edge_types and row["edgeType"] not in edge_types:
+                return False
+            if radius is not None:
+                row_radius = self.radii[index]
+                if row_radius is None or abs(row_radius - radius) > radius_tolerance:
+                    return False
+            if direction is not None:
+                row_normal = self.normals[index]
+                if row_normal is None:
+                    return False
+                # either side of the face or circle
+                if abs(sum(a * b for a, b in zip(row_normal, direction))) < min_cos:
+                    return False
+            return True
+
+        return accept
+
+    def query(self, accept, near_point: list = None, max_distance: float = math.inf,
+              offset: int = 0, limit: int = 50) -> tuple:
+        """
+        (rows, has_more, total) for one page. Rows are ordered by distance
+        to near_point when given, otherwise in table order. total is None
+        for spatial queries, only the requested page is searched
+        """
+        if near_point is not None:
+            found = self.tree.nearest(near_point, offset + limit + 1, max_distance, accept)
+            page = found[offset:offset + limit]
+            rows = [dict(self.rows[i], distance=round(d, 6)) for d, i in page]
+            return rows, len(found) > offset + limit, None
+
+        matches = [i for i in range(len(self.rows)) if accept(i)]
+        rows = [self.rows[i] for i in matches[offset:offset + limit]]
+        return rows, len(matches) > offset + limit, len(matches)
+
+
+def unit_vector(vector: list):
+    length = math.sqrt(sum(v * v for v in vector))
+    if length == 0:
+        return None
+    return tuple(v / length for v in vector)
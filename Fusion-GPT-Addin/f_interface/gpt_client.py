@@ -7,6 +7,7 @@ import sys
 import math
 import os
 import json
+import re
 import inspect
 import importlib
 from multiprocessing.connection import Client
@@ -18,6 +19,9 @@ from .. import config
 from ..lib import fusion360utils as futil
 
 from . import fusion_interface
+from . import tracing
+from . import session_recording
+from . import json_stream
 
 import time
 #import asyncio
@@ -28,6 +32,14 @@ def print(string):
 
 print(f"RELOADED: {__name__.split("%2F")[-1]}")
 
+# run events after which no more tool calls arrive for the run
+RUN_END_STATUSES = (
+    "thread.run.completed",
+    "thread.run.cancelled",
+    "thread.run.failed",
+    "thread.run.expired",
+)
+
 
 class MockServer:
     """
@@ -39,25 +51,85 @@ class MockServer:
         self.call_history = []
         self.msg_index = 0
 
+        # recorded seconds before each response, set when loading a recording
+        self.call_waits = []
+        # playback speed multiplier, None or 0 plays back as fast as possible
+        self.speed = None
+        self.last_event_ts = None
+
     def set_index(self, index):
         self.msg_index = index
+        self.last_event_ts = None
 
     def send(self, message):
         time.sleep(.0001)
+        self.last_event_ts = time.monotonic()
         return True;
 
     def recv(self):
-        time.sleep(.0001)
+        self.wait_recorded(self.msg_index)
         msg = self.call_history[self.msg_index]
         self.msg_index += 1
-        return msg
+        self.last_event_ts = time.monotonic()
+        return self.rebase_trace(msg)
+
+    def wait_recorded(self, index):
+        """
+        sleep for the recorded server time before response 'index',
+        less any time already spent on the Fusion side since the last event
+        """
+        if not self.speed or index >= len(self.call_waits):
+            time.sleep(.0001)
+            return
+
+        wait = self.call_waits[index] / self.speed
+        if self.last_event_ts != None:
+            wait -= time.monotonic() - self.last_event_ts
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def rebase_trace(self, msg):
+        """
+        recorded messages carry spans from the original run,
+        shift them so replayed traces line up with the current run
+        """
+        if f'"{tracing.TRACE_META_KEY}"' not in msg:
+            return msg
+        try:
+            msg_dict = json.loads(msg)
+        except json.JSONDecodeError:
+            return msg
+
+        spans = msg_dict.get(tracing.TRACE_META_KEY)
+        if not spans:
+            return msg
+
+        msg_dict[tracing.TRACE_META_KEY] = tracing.rebase_spans(spans)
+        return json.dumps(msg_dict)
 
     def add_call(self, call):
         self.call_history.append(call)
+        self.call_waits.append(0.0)
+
+    def load_recording(self, path: str):
+        """load responses and timing from a session recording file"""
+        recording = session_recording.load_recording(path)
+        self.call_history = list(recording.recv_messages)
+        self.call_waits = list(recording.recv_waits)
+        self.set_index(0)
+        return recording
 
+    def download_call_hostory(self, path: str = None):
+        """
+        write in memory call history to a recording file, no timing data
+        """
+        if path == None:
+            path = os.path.join(config.RECORDINGS_DIR, f"call_history_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
 
-    def download_call_hostory(self):
-        pass
+        records = [{"type": "recv", "data": call} for call in self.call_history]
+        session_recording.write_recording(path, records)
+        return path
 
 
 
@@ -89,6 +161,8 @@ class GptClient:
 
         # current connection status
         self.connected = False
+        # connection.py server address
+        self.server_address = ('localhost', 6000)
 
         self.has_initial_settings = False
 
@@ -101,6 +175,17 @@ class GptClient:
         # tool call history
         self.user_messages = []
 
+        # append only session file, created on first message while
+        # record_sessions is set from the html client-setting
+        self.record_sessions = False
+        self.session_recorder = None
+        # 0 plays back recordings as fast as possible
+        self.playback_speed = 1.0
+
+        # per run timing spans, set from html client-setting
+        self.trace_runs = False
+        self.tracer = tracing.Tracer("fusion")
+
 
 
     # TODO sort setting type better
@@ -149,7 +234,23 @@ class GptClient:
         for call in call:
             print(call)
 
+    def end_open_batch(self, reason: str):
+        """
+        commit a modeling batch the model left open, compute stays
+        deferred otherwise
+        """
+        try:
+            results = self.fusion_itf.end_open_batch()
+        except Exception as e:
+            print(f"Error: could not close open batch ({reason}): {e}")
+            return None
+
+        if results != None:
+            print(f"BATCH CLOSED ({reason}): {results}")
+        return results
+
     def reload_modules(self):
+        self.end_open_batch("reload")
         importlib.reload(fusion_interface)
         self.fusion_itf._reload_modules()
         self.fusion_itf = fusion_interface.FusionInterface(self.app, self.ui)
@@ -162,6 +263,7 @@ class GptClient:
         return self.fusion_itf.reload_object_dict()
 
     def reload_fusion_intf(self):
+        self.end_open_batch("reload")
         importlib.reload(fusion_interface)
         self.fusion_itf = fusion_interface.FusionInterface(self.app, self.ui)
         print("Fusion Interface Reloded")
@@ -169,6 +271,7 @@ class GptClient:
     def reload_interface(self):
         self.connected = False
         self.palette = self.ui.palettes.itemById(self.PALETTE_ID)
+        self.end_open_batch("reload")
         importlib.reload(fusion_interface)
         self.fusion_itf = fusion_interface.FusionInterface(self.app, self.ui)
         # Get settings from js
@@ -176,6 +279,11 @@ class GptClient:
 
         print("fusion_interface reloded")
 
+    def design_changed(self):
+        """a command was run from the Fusion UI, cached query results are no longer valid"""
+        # looked up on the module, fusion_interface.ToolCollection is stale after a reload
+        fusion_interface.shared.ToolCollection.design_generation += 1
+
     # TODO
     def get_initial_settings(self):
         data = {"get_initial": "get_initial"}
@@ -183,9 +291,10 @@ class GptClient:
 
     def sendToBrowser(self, function_name, data):
         """send event data to js"""
-        json_data = json.dumps(data)
-        # create run output section in html
-        self.palette.sendInfoToHTML(function_name, json_data)
+        with self.tracer.span("sendInfoToHTML", function_name=function_name):
+            json_data = json.dumps(data)
+            # create run output section in html
+            self.palette.sendInfoToHTML(function_name, json_data)
 
     # TODO add 
     def playback(self):
@@ -195,6 +304,7 @@ class GptClient:
         self.use_mock_server = True
         self.record_calls = False
         self.conn = self.mock_server
+        self.mock_server.speed = None
         self.mock_server.set_index(0)
         self.connected = True;
 
@@ -202,6 +312,66 @@ class GptClient:
             self.send_message(message)
         self.use_mock_server = False
         self.record_calls = True
+        self.connected = False
+
+    def playback_recording(self, path: str = None, speed: float = None):
+        """
+        replay a session recording file through the mock server
+        path: recording file, defaults to the most recent recording
+        speed: 1 recorded speed, 0 as fast as possible
+        """
+        if path == None:
+            path = session_recording.latest_recording(config.RECORDINGS_DIR)
+        if path == None:
+            print(f"Error: no recordings in {config.RECORDINGS_DIR}")
+            return {"error": "no recordings found"}
+
+        if speed == None:
+            speed = float(self.playback_speed or 0)
+
+        print(f"start playback: {path}, speed: {speed}")
+        recording = self.mock_server.load_recording(path)
+        self.mock_server.speed = speed
+
+        self.use_mock_server = True
+        self.record_calls = False
+        self.conn = self.mock_server
+        self.connected = True;
+
+        start = time.monotonic()
+        try:
+            for message in recording.user_messages:
+                self.send_message(message)
+        finally:
+            self.use_mock_server = False
+            self.record_calls = True
+            self.connected = False
+
+        results = {
+            "path": path,
+            "n_messages": len(recording.user_messages),
+            "recorded_duration": round(recording.duration, 3),
+            "playback_duration": round(time.monotonic() - start, 3),
+        }
+        print(f"playback complete: {results}")
+        return results
+
+    def record_session(self, record_type: str, data: str):
+        """append message to the session recording file, opt in from the palette"""
+        if self.record_sessions != True or self.record_calls != True:
+            return
+
+        if self.session_recorder == None:
+            path = os.path.join(config.RECORDINGS_DIR, f"session_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+            try:
+                self.session_recorder = session_recording.SessionRecorder(path)
+            except Exception as e:
+                print(f"Error: could not create session recording: {e}")
+                self.record_sessions = False
+                return
+            print(f"RECORDING SESSION: {path}")
+
+        self.session_recorder.record(record_type, data)
 
 
     # TODO 
@@ -221,8 +391,7 @@ class GptClient:
             return
         else:
             try:
-                address = ('localhost', 6000)
-                self.conn = Client(address, authkey=b'fusion260')
+                self.conn = Client(self.server_address, authkey=b'fusion260')
             except Exception as e:
                 message = {"error": "connection_error"}
                 self.palette.sendInfoToHTML("connection_error", json.dumps(message))
@@ -241,6 +410,8 @@ class GptClient:
         try:
             self.conn.send(message)
         except Exception as e:
+            # the run the batch belonged to ended with the connection
+            self.end_open_batch("disconnected")
             self.connect()
             self.conn.send(message)
 
@@ -331,6 +502,21 @@ class GptClient:
         instructions = json.loads(instructions)
         return instructions 
 
+    def get_backend_metrics(self):
+        """
+        latency summary for the model backend used by connection.py
+        """
+        message = {
+            "message_type": "function_call",
+            "function_name": "get_backend_metrics",
+        }
+        message = json.dumps(message)
+        message_confirmation = self.send_msg(message)
+
+        metrics = json.loads(self.conn.recv())
+        print(f"BACKEND METRICS: {json.dumps(metrics, indent=2)}")
+        return metrics
+
     def get_models(self):
         """
         get available models
@@ -377,82 +563,156 @@ class GptClient:
 
         if self.record_calls == True:
             self.user_messages.append(message)
+        self.record_session("user", message)
+
+        if self.trace_runs == True:
+            self.tracer.start_trace(message)
+        turn_start = time.monotonic()
 
         message = {"message_type": "thread_update", "content": message}
+        trace_context = self.tracer.context()
+        if trace_context != None:
+            message[tracing.TRACE_META_KEY] = trace_context
         message = json.dumps(message)
 
-        message_confirmation = self.send_msg(message)
+        self.record_session("send", message)
+        with self.tracer.span("ipc.send"):
+            message_confirmation = self.send_msg(message)
         print(f"MESSAGE SENT,  waiting for result...")
 
+        run_id = None
+
         # continue to run as long thread is open
         run_complete = False
-        while run_complete == False:
+        try:
+            while run_complete == False:
 
-            # result from server
-            api_result = self.conn.recv()
+                # result from server
+                with self.tracer.span("ipc.recv"):
+                    api_result = self.conn.recv()
 
-            if self.record_calls == True:
-                self.mock_server.add_call(api_result)
+                if self.record_calls == True:
+                    self.mock_server.add_call(api_result)
+                self.record_session("recv", api_result)
 
-            api_result = json.loads(api_result)
+                api_result = json.loads(api_result)
 
-            response_type = api_result.get("response_type")
-            event_type = api_result.get("event")
-            run_status = api_result.get("run_status")
+                # spans recorded on connection.py since last message
+                self.tracer.add_remote_spans(api_result.get(tracing.TRACE_META_KEY))
 
-            content = api_result.get("content")
+                response_type = api_result.get("response_type")
+                event_type = api_result.get("event")
+                run_status = api_result.get("run_status")
 
-            # streaming call outputs
-            if event_type == "thread.run.created":
-                self.sendToBrowser("runCreated", content)
+                content = api_result.get("content")
 
-            # streaming call outputs
-            elif event_type == "thread.run.step.created":
-                self.sendToBrowser("stepCreated", content)
+                # streaming call outputs
+                if event_type == "thread.run.created":
+                    run_id = content.get("run_id") if isinstance(content, dict) else None
+                    self.sendToBrowser("runCreated", content)
 
-            # streaming call outputs
-            elif event_type == "thread.message.created":
-                self.sendToBrowser("messageCreated", content)
+                # streaming call outputs
+                elif event_type == "thread.run.step.created":
+                    self.sendToBrowser("stepCreated", content)
 
-            # streaming call outputs
-            elif event_type == "thread.message.delta":
-                self.sendToBrowser("messageDelta", content)
+                # streaming call outputs
+                elif event_type == "thread.message.created":
+                    self.sendToBrowser("messageCreated", content)
 
-            elif event_type in ["thread.run.step.delta"]:
-                self.sendToBrowser("stepDelta", content)
+                # streaming call outputs
+                elif event_type == "thread.message.delta":
+                    self.sendToBrowser("messageDelta", content)
 
-            # TODO, use event type not response type
-            elif response_type == "tool_call":
+                elif event_type in ["thread.run.step.delta"]:
+                    self.sendToBrowser("stepDelta", content)
 
-                tool_call_id = api_result["tool_call_id"]
-                function_name = api_result["function_name"]
-                function_args = api_result["function_args"]
+                # TODO, use event type not response type
+                elif response_type == "tool_call":
 
-                function_result = self.call_function(function_name, function_args, tool_call_id)
-                adsk.doEvents()
+                    tool_call_id = api_result["tool_call_id"]
+                    function_name = api_result["function_name"]
+                    function_args = api_result["function_args"]
+
+                    function_result = self.call_function(function_name, function_args, tool_call_id, stream=True)
+                    adsk.doEvents()
+
+                    if isinstance(function_result, json_stream.ToolResultStream):
+                        self.send_result_stream(function_result, tool_call_id)
+                        continue
 
-                message = {"message_type": "thread_update", "content": function_result}
-                message = json.dumps(message)
+                    message = {"message_type": "thread_update", "content": function_result}
+                    message = json.dumps(message)
 
-                self.send_msg(function_result)
+                    self.record_session("send", function_result)
+                    with self.tracer.span("ipc.send", tool_call_id=tool_call_id):
+                        self.send_msg(function_result)
 
-            # thread complete break loop
-            if run_status == "thread.run.completed":
-                run_complete = True
+                # thread complete break loop
+                if run_status in RUN_END_STATUSES:
+                    run_complete = True
 
-            adsk.doEvents()
+                adsk.doEvents()
+        finally:
+            # completed, cancelled, failed or connection lost
+            self.end_open_batch("run ended")
+
+        if self.tracer.active:
+            self.tracer.add_span("turn", turn_start, time.monotonic())
+            self.send_trace_summary(run_id)
 
         return api_result
 
+    def send_result_stream(self, result_stream, tool_call_id):
+        """
+        send a streamed tool result in chunks, the UI is updated between chunks
+        """
+        with self.tracer.span("ipc.send", tool_call_id=tool_call_id, streamed=True):
+            for chunk in result_stream:
+                message = json_stream.CHUNK_PREFIX + chunk
+                self.record_session("send", message)
+                self.send_msg(message)
+                adsk.doEvents()
+
+            self.record_session("send", json_stream.CHUNK_END)
+            self.send_msg(json_stream.CHUNK_END)
 
-    def call_function(self, function_name: str, function_args: str, tool_call_id=None):
+        print(f"STREAMED RESULT: {result_stream.n_chars} chars, {result_stream.n_chunks} chunks")
+
+        # full result is not kept, display the beginning
+        message_data = {
+            "tool_call_id": tool_call_id,
+            "function_result": result_stream.summary()
+        }
+        self.sendToBrowser("toolCallResponse", message_data)
+
+    def send_trace_summary(self, run_id=None):
+        """
+        write the run timeline file and send summary table to js
+        """
+        try:
+            trace_summary = self.tracer.end_trace(config.TRACE_DIR)
+        except Exception as e:
+            print(f"Error: could not write trace: {e}")
+            return
+
+        if trace_summary == None:
+            return
+
+        trace_summary["run_id"] = run_id
+        print(f"TRACE: {trace_summary['trace_path']}")
+        self.sendToBrowser("traceSummary", trace_summary)
+
+
+    def call_function(self, function_name: str, function_args: str, tool_call_id=None, stream=False):
         """
         called from Assistants API
         calls function passed from Assistants API
+        stream: return streamed tool results unconsumed, sent by send_result_stream
         """
 
         if function_args != None:
-            function_args = json.loads(validate_and_repair_json(function_args))
+            with self.tracer.span("json_repair"):
+                function_args = json.loads(validate_and_repair_json(function_args))
 
         print(f"CALL FUNCTION: {function_name}, {function_args}, {tool_call_id}")
 
@@ -460,13 +720,19 @@ class GptClient:
         function = getattr(self.fusion_itf, function_name, None)
 
         if callable(function):
-            if function_args == None:
-                result = function()
-            else:
-                result = function(**function_args)
+            with self.tracer.span(f"tool:{function_name}", tool_call_id=tool_call_id):
+                if function_args == None:
+                    result = function()
+                else:
+                    result = function(**function_args)
         else:
             result = json.dumps({"error": f"Function '{function_name}' not callable"})
 
+        if isinstance(result, json_stream.ToolResultStream):
+            if stream == True:
+                return result
+            result = result.text()
+
         # send function response to js/html
         if tool_call_id != None:
 
@@ -0,0 +1,143 @@
+# json_stream
+import json
+import re
+import traceback
+
+
+# chunked tool results are sent over the connection as tagged strings,
+# connection.py joins the chunks before submitting the tool output
+CHUNK_PREFIX = "\x1echunk:"
+CHUNK_END = "\x1eend"
+
+# characters per chunk sent over the connection
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# characters of a streamed result shown in the palette
+PREVIEW_SIZE = 2000
+
+# JSON string literals and everything but brackets, removed when tracking
+# the open arrays/objects of the sent text
+STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+NON_BRACKET_RE = re.compile(r'[^\[\]{}]+')
+
+
+class ToolResultStream:
+    """
+    Tool result written incrementally. pieces is an iterable of JSON text
+    fragments, iterating the stream yields chunks of about chunk_size characters.
+    The complete text is only built if text() is called.
+    A fragment must not end inside a JSON string.
+    """
+
+    def __init__(self, pieces, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.pieces = pieces
+        self.chunk_size = chunk_size
+
+        # filled in while iterating
+        self.n_chunks = 0
+        self.n_chars = 0
+        self.preview = ""
+        self.error = None
+
+        # arrays/objects opened and not closed in the sent chunks,
+        # and the last non whitespace character sent
+        self.open_brackets = []
+        self.last_char = ""
+
+    def __iter__(self):
+        buffer = []
+        size = 0
+        try:
+            for piece in self.pieces:
+                buffer.append(piece)
+                size += len(piece)
+                if size >= self.chunk_size:
+                    chunk = self._flush(buffer)
+                    self._track_brackets(chunk)
+                    yield chunk
+                    buffer = []
+                    size = 0
+        except Exception:
+            self.error = traceback.format_exc()
+            error_text = f"Error: An unexpected exception occurred:\n{self.error}"
+
+            # first chunk not sent yet, the result is a plain error string
+            if self.n_chunks == 0:
+                yield self._flush([error_text])
+                return
+
+            # JSON is partly sent, end it with an error entry
+            pending = "".join(buffer)
+            self._track_brackets(pending)
+            buffer = [pending, self._error_tail(error_text)]
+
+        if buffer or self.n_chunks == 0:
+            yield self._flush(buffer)
+
+    def _track_brackets(self, chunk: str):
+        """update the open arrays/objects with a chunk about to be sent"""
+        stripped = chunk.rstrip()
+        if stripped:
+            self.last_char = stripped[-1]
+
+        for bracket in NON_BRACKET_RE.sub("", STRING_RE.sub("", chunk)):
+            if bracket in "[{":
+                self.open_brackets.append(bracket)
+            elif self.open_brackets:
+                self.open_brackets.pop()
+
+    def _error_tail(self, error_text: str) -> str:
+        """
+        text that adds the error to the innermost open array or object of the
+        sent JSON, then closes every open array and object
+        """
+        if not self.open_brackets:
+            return ""
+
+        error_json = json.dumps(error_text)
+        if self.open_brackets[-1] == "[":
+            entry = '{"error": ' + error_json + '}'
+            if self.last_char not in "[,":
+                entry = ", " + entry
+        elif self.last_char == ":":
+            entry = '{"error": ' + error_json + '}'
+        else:
+            entry = '"error": ' + error_json
+            if self.last_char not in "{,":
+                entry = ", " + entry
+
+        closing = "".join("]" if bracket == "[" else "}" for bracket in reversed(self.open_brackets))
+        return entry + closing
+
+    def _flush(self, buffer: list) -> str:
+        chunk = "".join(buffer)
+        if len(self.preview) < PREVIEW_SIZE:
+            self.preview += chunk[:PREVIEW_SIZE - len(self.preview)]
+        self.n_chunks += 1
+        self.n_chars += len(chunk)
+        return chunk
+
+    def text(self) -> str:
+        """complete result as a single string"""
+        return "".join(self)
+
+    def summary(self) -> str:
+        """JSON summary of a consumed stream, displayed in place of the full result"""
+        return json.dumps({
+            "streamed": True,
+            "n_chunks": self.n_chunks,
+            "n_chars": self.n_chars,
+            "preview": self.preview,
+        })
+
+
+def json_array(items):
+    """write an iterable of JSON text fragments as a JSON array, one fragment per item"""
+    yield "["
+    first = True
+    for item in items:
+        if not first:
+            yield ", "
+        first = False
+        yield from item
+    yield "]"
@@ -21,6 +21,7 @@ import re
 from ... import config
 from ...lib import fusion360utils as futil
 from .shared import ToolCollection
+from .. import transient_array
 
 def print(string):
     """redefine print for fusion env"""
@@ -235,6 +236,98 @@ class ModifyObjects(ToolCollection):
 
 class CreateObjects(ToolCollection):
 
+    # batches opened since reload, for default batch names
+    n_batches = 0
+
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def begin_batch(self, name: str = "") -> str:
+        """
+        {
+          "name": "begin_batch",
+          "description": "Starts a modeling batch: design compute is deferred so the following modeling tool calls (extrude_profiles, revolve_profiles, thin_extrude_lines, create_pipe_from_lines, fillet_or_chamfer_edges, join_bodies, ...) only add features, and the design is recomputed once in commit_batch. Use this before building several features in a row. Bodies and faces created inside the batch may not be up to date until commit_batch is called, so query geometry after committing. A batch that is still open is committed first.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "name": {
+                "type": "string",
+                "description": "Name of the timeline group created on commit. Empty string uses a default name."
+              }
+            },
+            "required": [],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the batch name, the timeline position it started at and the commit results of a batch that was still open."
+            }
+          }
+        }
+        """
+        try:
+            design = adsk.fusion.Design.cast(self.app.activeProduct)
+            if not design:
+                return "Error: No active Fusion 360 design found."
+
+            # batch left open by an earlier run, e.g. commit_batch was never called
+            previous_batch = ToolCollection.finish_batch()
+
+            CreateObjects.n_batches += 1
+            batch_name = name or f"Batch {CreateObjects.n_batches}"
+
+            ToolCollection.batch = {
+                "name": batch_name,
+                "design": design,
+                "wasDeferred": design.isComputeDeferred,
+                "timelineStart": design.timeline.markerPosition,
+                "toolCalls": 0,
+                "started": time.time(),
+            }
+            design.isComputeDeferred = True
+
+            results = {
+                "batch": batch_name,
+                "timelineStart": ToolCollection.batch["timelineStart"],
+                "message": "Compute deferred, call commit_batch after the last modeling tool call.",
+            }
+            if previous_batch is not None:
+                results["committedPreviousBatch"] = previous_batch
+
+            return json.dumps(results)
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
+    @ToolCollection.tool_call
+    def commit_batch(self, group: bool = True) -> str:
+        """
+        {
+          "name": "commit_batch",
+          "description": "Ends the batch started with begin_batch: groups the timeline features added during the batch into one timeline group and recomputes the design once.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "group": {
+                "type": "boolean",
+                "description": "true collects the features added during the batch into a timeline group (parametric designs only)."
+              }
+            },
+            "required": [],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the batch name, the number of modeling tool calls and timeline features in the batch, the timeline group and the recompute time."
+            }
+          }
+        }
+        """
+        try:
+            results = ToolCollection.finish_batch(group=group)
+            if results is None:
+                return "Error: no open batch, call begin_batch first."
+
+            return json.dumps(results)
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
     def _get_operation_obj(self, operation_type):
 
         # Map the operation_type string to the Fusion enum
@@ -249,12 +342,220 @@ class CreateObjects(ToolCollection):
         operation_obj = operation_map.get(operation_type)
         errors = None
 
-        if operation_type is None:
+        if operation_obj is None:
             errors = f"Error: Unknown operation_type '{operation_type}', Valid: {', '.join(operation_map.keys())}."
 
         return operation_obj, errors
 
 
+    # spec key: default, for extrude_profiles_batch
+    EXTRUDE_SPEC_DEFAULTS = {
+        "profile_tokens": None,
+        "distance": None,
+        "operation_type": "NewBodyFeatureOperation",
+        "start_extent": 0.0,
+        "taper_angle": 0.0,
+    }
+
+    def _validate_extrude_specs(self, specs: list) -> tuple:
+        """
+        (list of (spec index, spec, component, profiles) groups, errors).
+        Specs with profiles in several components are split, one group per
+        component. Nothing is created when there are errors
+        """
+        if not specs or not isinstance(specs, list):
+            return None, ["Error: specs must be a non-empty list of extrude specs."]
+
+        groups = []
+        errors = []
+        for spec_index, raw_spec in enumerate(specs):
+            if not isinstance(raw_spec, dict):
+                errors.append(f"Error: spec {spec_index} must be an object, got {raw_spec}")
+                continue
+
+            unknown = [k for k in raw_spec if k not in self.EXTRUDE_SPEC_DEFAULTS]
+            if unknown:
+                errors.append(f"Error: spec {spec_index} has unknown keys {unknown}, valid: {list(self.EXTRUDE_SPEC_DEFAULTS.keys())}")
+                continue
+            spec = {**self.EXTRUDE_SPEC_DEFAULTS, **raw_spec}
+
+            operation_obj, op_errors = self._get_operation_obj(spec["operation_type"])
+            if op_errors:
+                errors.append(op_errors.replace("Error: ", f"Error: spec {spec_index} ", 1))
+
+            for key in ("distance", "start_extent", "taper_angle"):
+                val = spec[key]
+                if isinstance(val, bool) or not isinstance(val, (int, float)) or not math.isfinite(val):
+                    errors.append(f"Error: spec {spec_index} {key} must be a number, got {val}")
+            if spec["distance"] == 0:
+                errors.append(f"Error: spec {spec_index} distance must not be 0")
+
+            profile_tokens = spec["profile_tokens"]
+            if not profile_tokens or not isinstance(profile_tokens, list):
+                errors.append(f"Error: spec {spec_index} profile_tokens must be a non-empty list of profile entityTokens.")
+                continue
+
+            # component token: (component, profiles), in first seen order
+            by_component = {}
+            for token in profile_tokens:
+                profile = self.get_hash_obj(token)
+                if not isinstance(profile, adsk.fusion.Profile):
+                    errors.append(f"Error: spec {spec_index} token '{token}' is not a Profile.")
+                    continue
+                comp = profile.parentSketch.parentComponent
+                by_component.setdefault(self.get_comp_str(comp), (comp, []))[1].append(profile)
+
+            spec["operation_obj"] = operation_obj
+            for comp, profiles in by_component.values():
+                groups.append((spec_index, spec, comp, profiles))
+
+        return groups, errors
+
+    def _add_extrude(self, comp, profiles: list, spec: dict):
+        """one extrude feature for profiles in comp"""
+        extrudes = comp.features.extrudeFeatures
+        profile_collection = adsk.core.ObjectCollection.createWithArray(profiles)
+        ext_input = extrudes.createInput(profile_collection, spec["operation_obj"])
+
+        # offset start extent if requested
+        if abs(spec["start_extent"]) > 1e-7:
+            offset_val = adsk.core.ValueInput.createByReal(float(spec["start_extent"]))
+            ext_input.startExtent = adsk.fusion.OffsetStartDefinition.create(offset_val)
+
+        # taper angle in degrees if non-zero
+        if abs(spec["taper_angle"]) > 1e-7:
+            ext_input.taperAngle = adsk.core.ValueInput.createByString(f"{spec['taper_angle']} deg")
+
+        # one-side distance extent
+        ext_input.setDistanceExtent(False, adsk.core.ValueInput.createByReal(float(spec["distance"])))
+
+        return extrudes.add(ext_input)
+
+    def _extrude_specs(self, specs: list) -> str:
+        """
+        validates every spec, then adds the extrude features in spec order
+        under one deferred compute, a cut or join spec may use bodies of an
+        earlier spec. Responds with a feature list and a body table instead
+        of a full description per body
+        """
+        app = adsk.core.Application.get()
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return "Error: No active Fusion 360 design found."
+
+        groups, errors = self._validate_extrude_specs(specs)
+        if errors:
+            return json.dumps({"created": 0, "errors": errors})
+
+        components = {}
+        features = []
+        feature_objs = []
+        body_rows = []
+        feature_errors = []
+
+        defer_compute = hasattr(design, "isComputeDeferred") and len(groups) > 1
+        if defer_compute:
+            was_deferred = design.isComputeDeferred
+            design.isComputeDeferred = True
+
+        try:
+            for spec_index, spec, comp, profiles in groups:
+                comp_token = self.set_obj_hash(comp)
+                components[comp_token] = comp.name
+                try:
+                    feature = self._add_extrude(comp, profiles, spec)
+                except Exception as e:
+                    feature_errors.append({"spec": spec_index, "componentToken": comp_token, "error": f"Error: Could not extrude {len(profiles)} profile(s): {e}"})
+                    continue
+
+                feature_objs.append(feature)
+                features.append({
+                    "spec": spec_index,
+                    "name": feature.name,
+                    "entityToken": self.set_obj_hash(feature),
+                    "componentToken": comp_token,
+                    "profiles": len(profiles),
+                })
+        finally:
+            if defer_compute:
+                design.isComputeDeferred = was_deferred
+
+        # feature bodies are only up to date once compute is restored
+        for feature_index, feature in enumerate(feature_objs):
+            for body in feature.bodies:
+                body_rows.append([feature_index, body.name, self.set_obj_hash(body)])
+
+        results = {
+            "components": components,
+            "features": features,
+            "bodies": {"columns": ["feature", "name", "entityToken"], "rows": body_rows},
+        }
+        if feature_errors:
+            results["errors"] = feature_errors
+
+        return json.dumps(results)
+
+    @ToolCollection.tool_call
+    def extrude_profiles_batch(self, specs: list = [{}]) -> str:
+        """
+        {
+            "name": "extrude_profiles_batch",
+            "description": "Creates several extrudes in one call, e.g different distances, operations or components. Every spec is validated before anything is created, features are added in spec order and the design is recomputed once. Profiles of one spec in different components produce one extrude per component. Units are cm and degrees.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "specs": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "profile_tokens": {
+                                    "type": "array",
+                                    "items": { "type": "string" },
+                                    "description": "Profile entityTokens extruded together."
+                                },
+                                "distance": {
+                                    "type": "number",
+                                    "description": "Extrude distance in cm, negative for the opposite direction."
+                                },
+                                "operation_type": {
+                                    "type": "string",
+                                    "enum": [
+                                        "CutFeatureOperation",
+                                        "IntersectFeatureOperation",
+                                        "JoinFeatureOperation",
+                                        "NewBodyFeatureOperation",
+                                        "NewComponentFeatureOperation"
+                                    ],
+                                    "description": "FeatureOperation, default NewBodyFeatureOperation."
+                                },
+                                "start_extent": {
+                                    "type": "number",
+                                    "description": "Offset from the sketch plane in cm, default 0."
+                                },
+                                "taper_angle": {
+                                    "type": "number",
+                                    "description": "Taper angle in degrees, default 0."
+                                }
+                            },
+                            "required": ["profile_tokens", "distance"]
+                        },
+                        "description": "One entry per extrude."
+                    }
+                },
+                "required": ["specs"],
+                "returns": {
+                    "type": "string",
+                    "description": "JSON object with the components by token, the created features (with the spec index they came from) and a bodies table with columns feature (index into features), name and entityToken."
+                }
+            }
+        }
+        """
+        try:
+            return self._extrude_specs(specs)
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
     @ToolCollection.tool_call
     def extrude_profiles(
         self,
@@ -267,7 +568,7 @@ class CreateObjects(ToolCollection):
         """
         {
             "name": "extrude_profiles",
-            "description": "Extrudes one or more profiles. The operation_type parameter selects which FeatureOperation to use. The unit for extrudeDistance and start_extent is centimeters, and taper_angle is in degrees (can be positive or negative).",
+            "description": "Extrudes one or more profiles. The operation_type parameter selects which FeatureOperation to use. The unit for extrudeDistance and start_extent is centimeters, and taper_angle is in degrees (can be positive or negative). Profiles in different components produce one extrude per component. Use extrude_profiles_batch for several distances or operations in one call.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -277,7 +578,7 @@ class CreateObjects(ToolCollection):
                         "description": "A list of profile entityTokens to extrude."
                     },
                     "extrude_distance": {
-                        "type": "string",
+                        "type": "number",
                         "description": "The distance to extrude the profiles."
                     },
 
@@ -304,93 +605,22 @@ class CreateObjects(ToolCollection):
                 "required": ["profile_entity_tokens", "extrude_distance", "start_extent", "taper_angle"],
                 "returns": {
                     "type": "string",
-                    "description": "A message indicating whether the extrude operations completed successfully or not."
+                    "description": "JSON object with the created features and a bodies table with columns feature, name and entityToken."
                 }
             }
         }
 
         """
         try:
-            # A small dictionary to map string inputs to the appropriate enumerations.
-            operation_map = {
-                "CutFeatureOperation": adsk.fusion.FeatureOperations.CutFeatureOperation,
-                "IntersectFeatureOperation": adsk.fusion.FeatureOperations.IntersectFeatureOperation,
-                "JoinFeatureOperation": adsk.fusion.FeatureOperations.JoinFeatureOperation,
-                "NewBodyFeatureOperation": adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
-                "NewComponentFeatureOperation": adsk.fusion.FeatureOperations.NewComponentFeatureOperation
-            }
-
-            # Validate the requested operation_type.
-            if operation_type not in operation_map:
-                return (f'Error: operation_type "{operation_type}" is not recognized. '
-                        f'Valid options are: {", ".join(operation_map.keys())}.')
-
-            # Access the active design.
-            app = adsk.core.Application.get()
-            design = adsk.fusion.Design.cast(app.activeProduct)
-
-            # find the target component by name (assuming you have a local helper method).
-            targetComponent = self.get_hash_obj(profile_entity_tokens[0]).parentSketch.parentComponent
-            if not targetComponent:
-                return f"Error: No component found for for enityToken: '{component_entity_token}'."
-
-            if len(profile_entity_tokens) == 0:
-                return f"Error: '{component_entity_tokens}' Argument 'profile_entity_tokens' must not be empty."
-
-            # Prepare extrude feature objects
-            extrudes = targetComponent.features.extrudeFeatures
-            results = {}
-
-            # Convert extrudeDist (cm) to internal real value
-            distanceVal = adsk.core.ValueInput.createByReal(float(extrude_distance))
-
-            profile_collection = adsk.core.ObjectCollection.create()
-            for profile_entity_token in profile_entity_tokens:
-                profile = self.get_hash_obj(profile_entity_token)
-
-                if profile is None:
-                    results["Errors"] = f"Error: No profile found for enityToken '{profile_entity_token}'."
-                    continue
-
-                profile_collection.add(profile)
-
-            try:
-                # Create the extrude feature input with the requested operation type.
-                extInput = extrudes.createInput(profile_collection, operation_map[operation_type])
-
-                # 1) Set an offset start extent if requested
-                if abs(start_extent) > 1e-7:  # effectively non-zero
-                    offsetVal = adsk.core.ValueInput.createByReal(float(start_extent))
-                    offsetDef = adsk.fusion.OffsetStartDefinition.create(offsetVal)
-                    extInput.startExtent = offsetDef
-
-                # 2) Set the taper angle (in degrees) if non-zero
-                if abs(taper_angle) > 1e-7:
-                    # Use createByString for degrees (e.g., "15 deg")
-                    angleVal = adsk.core.ValueInput.createByString(f"{taper_angle} deg")
-                    extInput.taperAngle = angleVal
-
-                # 3) Set the extent as a one-side distance.
-                extInput.setDistanceExtent(False, distanceVal)
-
-                # Add the extrude feature
-                extrude_results = extrudes.add(extInput)
-
-                new_bodies = self.object_creation_response(extrude_results)
-
-                results["Results"] = f"Success: Extruded '{profile_collection.count}' profiles by '{extrude_distance}', startExtent={start_extent}, taper={taper_angle} with '{operation_type}'."
-
-                results["New BRepBodies"] = new_bodies
-
-
-            except Exception as e:
-                results["Errors"] = f"Error: Could not extrude profile '{profile_entity_token}'. Reason: {e}"
-
-            # Combine all messages.
-            return json.dumps(results)
-
-        except Exception as e:
-            return f"Error: An unexpected exception occurred: {e}"
+            return self._extrude_specs([{
+                "profile_tokens": profile_entity_tokens,
+                "distance": extrude_distance,
+                "operation_type": operation_type,
+                "start_extent": start_extent,
+                "taper_angle": taper_angle,
+            }])
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
 
     @ToolCollection.tool_call
@@ -400,7 +630,8 @@ class CreateObjects(ToolCollection):
                            thin_extrude_height: float = 1.0,
                            operation_type: str = "NewBodyFeatureOperation",
                            wall_location: str = "side1",
-                           taper_angle: float = 0.0) -> str:
+                           taper_angle: float = 0.0,
+                           response_profile: str = "") -> str:
         """
         {
           "name": "thin_extrude_lines",
@@ -433,6 +664,11 @@ class CreateObjects(ToolCollection):
               "taper_angle": {
                 "type": "number",
                 "description": "Taper angle in degrees (positive or negative)."
+              },
+              "response_profile": {
+                "type": "string",
+                "enum": ["", "minimal", "standard", "verbose"],
+                "description": "Detail of the new object list: minimal (entityToken and objectType), standard (plus name, area, length) or verbose (plus construction axes and planes of new components). Empty string uses the default."
               }
             },
             "required": ["line_token_list", "thin_extrude_width", "thin_extrude_height"],
@@ -529,7 +765,7 @@ class CreateObjects(ToolCollection):
 
             new_features = extrudes.add(ext_input)
 
-            new_bodies = self.object_creation_response(new_features)
+            new_bodies = self.object_creation_response(new_features, response_profile)
 
             results["Results"] = str(new_features)
             results["New BRepBodies"] = new_bodies
@@ -546,7 +782,8 @@ class CreateObjects(ToolCollection):
         profile_entity_tokens: list = [""],
         revolve_axis_entity_token: str = "",
         revolve_degrees: float = 180.0,
-        operation_type: str = "NewBodyFeatureOperation"
+        operation_type: str = "NewBodyFeatureOperation",
+        response_profile: str = ""
     ) -> str:
         """
         {
@@ -579,6 +816,11 @@ class CreateObjects(ToolCollection):
                   "NewComponentFeatureOperation"
                 ],
                 "description": "Specifies the Fusion 360 FeatureOperation. Default 'NewBodyFeatureOperation'."
+              },
+              "response_profile": {
+                "type": "string",
+                "enum": ["", "minimal", "standard", "verbose"],
+                "description": "Detail of the new object list: minimal (entityToken and objectType), standard (plus name, area, length) or verbose (plus construction axes and planes of new components). Empty string uses the default."
               }
             },
             "required": ["profile_entity_tokens", "revolve_axis_entity_token", "revolve_axis", "revolve_degrees"],
@@ -645,7 +887,7 @@ class CreateObjects(ToolCollection):
             try:
                 revolve_result = revolve_feats.add(rev_input)
 
-                new_objects = self.object_creation_response(revolve_result)
+                new_objects = self.object_creation_response(revolve_result, response_profile)
 
                 results = {}
                 msg = f"Revolved profiles in sketch '{targetSketch.name}' by '{revolve_degrees}' degrees using '{operation_type}'."
@@ -801,6 +1043,59 @@ class CreateObjects(ToolCollection):
             return f"Error: Failed to copy component with token '{source_component_entity_token}' as a new component:\n{e}"
 
 
+    # sketch point coordinates are rounded to this many decimals (cm) when
+    # matching line end points into chains
+    CHAIN_POINT_DECIMALS = 6
+
+    def _line_chains(self, lines: list) -> list:
+        """
+        lists of line indexes, each an ordered chain of connected lines in one
+        sketch with no branches. Chains end at free ends and at points shared
+        by more than two lines, closed loops are a single chain
+        """
+        adjacency = {}
+        for index, line in enumerate(lines):
+            # Fusion returns a new sketch wrapper on every access, id() is not stable
+            sketch_key = line.parentSketch.entityToken
+            ends = [
+                (sketch_key, tuple(round(v, self.CHAIN_POINT_DECIMALS) for v in sketch_point.geometry.asArray()))
+                for sketch_point in (line.startSketchPoint, line.endSketchPoint)
+            ]
+            adjacency.setdefault(ends[0], []).append((index, ends[1]))
+            adjacency.setdefault(ends[1], []).append((index, ends[0]))
+
+        used = set()
+        chains = []
+
+        def walk(node):
+            chain = []
+            while True:
+                step = next(((i, other) for i, other in adjacency[node] if i not in used), None)
+                if step is None:
+                    break
+                index, node = step
+                used.add(index)
+                chain.append(index)
+                if len(adjacency[node]) != 2:
+                    break
+            return chain
+
+        # open chains start at free ends and branch points
+        for node, edges in adjacency.items():
+            if len(edges) != 2:
+                for _ in edges:
+                    chain = walk(node)
+                    if chain:
+                        chains.append(chain)
+
+        # what is left are closed loops
+        for node in adjacency:
+            chain = walk(node)
+            if chain:
+                chains.append(chain)
+
+        return chains
+
     @ToolCollection.tool_call
     def create_pipe_from_lines(self,
                               line_token_list: list = [""],
@@ -809,7 +1104,7 @@ class CreateObjects(ToolCollection):
         """
         {
           "name": "create_pipe_from_lines",
-          "description": "Creates a Pipe feature on each SketchLine in the list, each line is referenced by a token.",
+          "description": "Creates pipes along SketchLines with as few features as possible. Connected lines in the same sketch are chained into one path and one Pipe feature per chain. With NewBodyFeatureOperation, single unconnected lines become cylinder bodies added in one Base Feature. Chains stop at points shared by more than two lines.",
 
           "parameters": {
             "type": "object",
@@ -831,16 +1126,17 @@ class CreateObjects(ToolCollection):
             "required": ["line_token_list", "pipe_diameter"],
             "returns": {
               "type": "string",
-              "description": "A JSON object mapping each line token to a success or error message."
+              "description": "JSON object with the created pipe features and segment bodies, each listing the indexes of the lines it was built from, and errors by line token."
             }
           }
         }
         """
 
-        results = {}
         try:
             if not line_token_list or not isinstance(line_token_list, list):
                 return "Error: line_token_list must be a non-empty list of token strings."
+            if not isinstance(pipe_diameter, (int, float)) or pipe_diameter <= 0:
+                return "Error: pipe_diameter must be a positive number."
 
             app = adsk.core.Application.get()
             if not app:
@@ -851,167 +1147,393 @@ class CreateObjects(ToolCollection):
                 return "Error: No active Fusion 360 design found."
 
             design = adsk.fusion.Design.cast(product)
-            #root_comp = design.rootComponent
 
             operation_obj, errors = self._get_operation_obj(operation_type)
             if operation_obj is None:
                 return errors
 
-            targetComponent = self.get_hash_obj(line_token_list[0]).parentSketch.parentComponent
-            # find the target component by name (assuming you have a local helper method).
-            if not targetComponent:
-                return f"Error: No component found"
+            errors = {}
+            lines = []
+            line_indexes = []
+            for index, token in enumerate(line_token_list):
+                line_obj = self.get_hash_obj(token)
+                if not line_obj:
+                    errors[token] = f"Error: no object found for token '{token}'."
+                elif not isinstance(line_obj, adsk.fusion.SketchLine):
+                    errors[token] = f"Error: object for token '{token}' is not a SketchLine."
+                else:
+                    lines.append(line_obj)
+                    line_indexes.append(index)
+
+            chains = self._line_chains(lines)
+
+            # unconnected lines as cylinders in one base feature per component,
+            # only for new bodies since base feature bodies can't cut or join
+            singles = []
+            if operation_type == "NewBodyFeatureOperation":
+                singles = [chain[0] for chain in chains if len(chain) == 1]
+                if len(singles) < 2:
+                    singles = []
+            single_set = set(singles)
+            pipe_chains = [chain for chain in chains if not (len(chain) == 1 and chain[0] in single_set)]
 
             # Convert extrudeDist (cm) to internal real value
-            thickness = adsk.core.ValueInput.createByReal(float( pipe_diameter))
+            thickness = adsk.core.ValueInput.createByReal(float(pipe_diameter))
 
-            # Prepare pipe feature objects
-            pipe_features = targetComponent.features.pipeFeatures
+            results = {"pipeFeatures": []}
 
-            for token in line_token_list:
-                line_obj = self.get_hash_obj(token)
+            # compute once after all pipes are added
+            defer_compute = hasattr(design, "isComputeDeferred") and len(chains) > 1
+            if defer_compute:
+                was_deferred = design.isComputeDeferred
+                design.isComputeDeferred = True
 
-                if not line_obj:
-                    results[token] = f"Error: no object found for token '{token}'."
-                    continue
+            try:
+                for chain in pipe_chains:
+                    chain_tokens = [line_token_list[line_indexes[i]] for i in chain]
+                    targetComponent = lines[chain[0]].parentSketch.parentComponent
+
+                    try:
+                        path_entity = adsk.core.ObjectCollection.createWithArray([lines[i] for i in chain])
+                        # only the given curves, isChain = False
+                        path = targetComponent.features.createPath(path_entity, False)
+
+                        pipe_input = targetComponent.features.pipeFeatures.createInput(path, operation_obj)
+                        pipe_input.sectionSize = thickness
+                        pipe_feature = targetComponent.features.pipeFeatures.add(pipe_input)
+
+                        results["pipeFeatures"].append({
+                            "name": pipe_feature.name,
+                            "entityToken": self.set_obj_hash(pipe_feature),
+                            "lineIndexes": [line_indexes[i] for i in chain],
+                        })
+                    except Exception as e:
+                        for token in chain_tokens:
+                            errors[token] = f"Error creating pipe along {len(chain)} connected line(s): {str(e)}"
+
+                if singles:
+                    results["segmentBodies"] = self._line_cylinders(design, lines, singles, line_indexes, pipe_diameter / 2)
+
+            finally:
+                if defer_compute:
+                    design.isComputeDeferred = was_deferred
+
+            results["succeeded"] = len(line_token_list) - len(errors)
+            results["failed"] = len(errors)
+            if errors:
+                results["errors"] = errors
 
-                if not isinstance(line_obj, adsk.fusion.SketchLine):
-                    results[token] = f"Error: object for token '{token}' is not a SketchLine."
-                    continue
+            return json.dumps(results)
 
-                # 2) Create a Path from this line
-                path_entity = adsk.core.ObjectCollection.create()
-                path_entity.add(line_obj)
-                # Create a path object
-                path = targetComponent.features.createPath(path_entity, False)  # isChain = False
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
-                pipe_input = pipe_features.createInput(path, operation_obj)
-                pipe_input.sectionSize = thickness
+    def _line_cylinders(self, design, lines: list, singles: list, line_indexes: list, radius: float) -> list:
+        """
+        one cylinder per line, inserted with one base feature edit per
+        component. Returns a body set summary per component
+        """
+        temp_brep_mgr = adsk.fusion.TemporaryBRepManager.get()
+
+        by_component = {}
+        for i in singles:
+            comp = lines[i].parentSketch.parentComponent
+            by_component.setdefault(self.get_comp_str(comp), (comp, []))[1].append(i)
+
+        summaries = []
+        for comp, indexes in by_component.values():
+            temp_bodies = []
+            for i in indexes:
+                line = lines[i]
+                sketch = line.parentSketch
+                start = sketch.sketchToModelSpace(line.startSketchPoint.geometry)
+                end = sketch.sketchToModelSpace(line.endSketchPoint.geometry)
+                temp_bodies.append(temp_brep_mgr.createCylinderOrCone(start, radius, end, radius))
+
+            new_bodies, base_feat = self._insert_temporary_bodies(design, comp, temp_bodies)
+            body_set_token = self.set_obj_hash(adsk.core.ObjectCollection.createWithArray(new_bodies))
+
+            summary = {
+                "componentName": comp.name,
+                "bodySetToken": body_set_token,
+                "itemToken": f"{body_set_token}[i]",
+                "lineIndexes": [line_indexes[i] for i in indexes],
+            }
+            if base_feat is not None:
+                summary["baseFeatureToken"] = self.set_obj_hash(base_feat)
+            summaries.append(summary)
 
-                #creationOccurrence
+        return summaries
 
-                try:
-                    pipe_feature = pipe_features.add(pipe_input)
 
-                    results[token] = f"Success: Created pipe with diameter={pipe_diameter} using line token '{token}'."
-                except Exception as e:
-                    results[token] = f"Error creating sweep for line token '{token}': {str(e)}"
+    # primitive: dimensions argument names, for create_bodies_from_points
+    BODY_PRIMITIVES = {
+        "sphere": ["radius"],
+        "box": ["size"],
+        "cylinder": ["radius", "height", "axis"],
+    }
 
+    # errors listed in bulk body responses, the rest are only counted
+    MAX_LISTED_ERRORS = 20
 
+    def _points_from_tokens(self, point_tokens: list) -> tuple:
+        """
+        (Point3D list, errors) from Point3D tokens, transient Point3D array
+        tokens and array items like "aB3xZ[4]"
+        """
+        points = []
+        errors = []
+        for token in point_tokens:
+            obj = self.get_hash_obj(token)
+            if isinstance(obj, transient_array.TransientArray) and obj.kind == "Point3D":
+                points.extend(obj.items())
+            elif isinstance(obj, adsk.core.Point3D):
+                points.append(obj)
+            else:
+                errors.append(f"Error: token '{token}' is not a Point3D or a transient Point3D array.")
+        return points, errors
 
-            return json.dumps(results)
+    def _temporary_primitive_factory(self, primitive: str, radius: float, size: list, height: float, axis: list):
+        """
+        (function point -> TemporaryBRep body, None) or (None, error string).
+        Spheres and boxes are centered on the point, cylinders start at the
+        point and extend height along axis
+        """
+        temp_brep_mgr = adsk.fusion.TemporaryBRepManager.get()
+
+        if primitive == "sphere":
+            if not isinstance(radius, (int, float)) or radius <= 0:
+                return None, "Error: radius must be a positive number."
+            return lambda point: temp_brep_mgr.createSphere(point, radius), None
+
+        if primitive == "box":
+            if not isinstance(size, list) or len(size) != 3 or not all(isinstance(v, (int, float)) and v > 0 for v in size):
+                return None, f"Error: size must be an array of 3 positive numbers [length, width, height], got {size}"
+            length_dir = adsk.core.Vector3D.create(1, 0, 0)
+            width_dir = adsk.core.Vector3D.create(0, 1, 0)
+
+            def create_box(point):
+                box = adsk.core.OrientedBoundingBox3D.create(point, length_dir, width_dir, *size)
+                return temp_brep_mgr.createBox(box)
+            return create_box, None
+
+        if primitive == "cylinder":
+            if not isinstance(radius, (int, float)) or radius <= 0:
+                return None, "Error: radius must be a positive number."
+            if not isinstance(height, (int, float)) or height <= 0:
+                return None, "Error: height must be a positive number."
+            if not isinstance(axis, list) or len(axis) != 3 or not any(axis):
+                return None, f"Error: axis must be a non zero array of 3 numbers, got {axis}"
+            offset = adsk.core.Vector3D.create(*axis)
+            offset.normalize()
+            offset.scaleBy(height)
+
+            def create_cylinder(point):
+                top = point.copy()
+                top.translateBy(offset)
+                return temp_brep_mgr.createCylinderOrCone(point, radius, top, radius)
+            return create_cylinder, None
+
+        return None, f"Error: unknown primitive '{primitive}', valid: {list(self.BODY_PRIMITIVES.keys())}"
+
+    def _insert_temporary_bodies(self, design, targetComponent, temp_bodies: list) -> tuple:
+        """
+        (BRepBody list, base feature or None). Parametric designs get every
+        body in one base feature edit, direct designs add them to the component
+        """
+        if design.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+            return [targetComponent.bRepBodies.add(body) for body in temp_bodies], None
+
+        base_feat = targetComponent.features.baseFeatures.add()
+        base_feat.startEdit()
+        try:
+            new_bodies = [targetComponent.bRepBodies.add(body, base_feat) for body in temp_bodies]
+        finally:
+            base_feat.finishEdit()
+        return new_bodies, base_feat
+
+    def _create_primitive_bodies(self,
+                                 component_entity_token: str,
+                                 point_tokens: list,
+                                 primitive: str,
+                                 radius: float = 1.0,
+                                 size: list = None,
+                                 height: float = 1.0,
+                                 axis: list = None,
+                                 union: bool = False) -> str:
+        """
+        builds every body with TemporaryBRepManager, optionally unions them in
+        memory, then inserts them at once. Responds with one token for the
+        created body set instead of a token per body
+        """
+        if not point_tokens or not isinstance(point_tokens, list):
+            return "Error: point_tokens must be a non-empty list of Point3D or transient array tokens."
+
+        app = adsk.core.Application.get()
+        if not app:
+            return "Error: Fusion 360 is not running."
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return "Error: No active Fusion 360 design found."
+
+        if component_entity_token:
+            targetComponent = self.get_hash_obj(component_entity_token)
+            if not isinstance(targetComponent, adsk.fusion.Component):
+                return f"Error: No component found for entityToken: '{component_entity_token}'."
+        else:
+            targetComponent = design.rootComponent
+
+        create_body, errors = self._temporary_primitive_factory(primitive, radius, size or [1, 1, 1], height, axis or [0, 0, 1])
+        if errors:
+            return errors
+
+        points, point_errors = self._points_from_tokens(point_tokens)
+        if point_errors:
+            return "\n".join(point_errors[:self.MAX_LISTED_ERRORS])
+        if not points:
+            return "Error: the point tokens contain no points."
+
+        temp_bodies = []
+        errors = []
+        for index, point in enumerate(points):
+            try:
+                temp_bodies.append(create_body(point))
+            except Exception as e:
+                errors.append({"index": index, "error": f"Error creating {primitive}: {e}"})
+
+        if union and len(temp_bodies) > 1:
+            temp_brep_mgr = adsk.fusion.TemporaryBRepManager.get()
+            target = temp_bodies[0]
+            for tool_body in temp_bodies[1:]:
+                temp_brep_mgr.booleanOperation(target, tool_body, adsk.fusion.BooleanTypes.UnionBooleanType)
+            temp_bodies = [target]
+
+        new_bodies, base_feat = self._insert_temporary_bodies(design, targetComponent, temp_bodies)
+
+        body_set = adsk.core.ObjectCollection.createWithArray(new_bodies)
+        body_set_token = self.set_obj_hash(body_set)
+
+        results = {
+            "bodySetToken": body_set_token,
+            "itemToken": f"{body_set_token}[i]",
+            "primitive": primitive,
+            "points": len(points),
+            "bodies": len(new_bodies),
+            "unioned": bool(union),
+            "componentName": targetComponent.name,
+        }
+        if base_feat is not None:
+            results["baseFeatureToken"] = self.set_obj_hash(base_feat)
+        if errors:
+            results["failed"] = len(errors)
+            results["errors"] = errors[:self.MAX_LISTED_ERRORS]
 
+        return json.dumps(results)
+
+    @ToolCollection.tool_call
+    def create_bodies_from_points(self,
+                                  component_entity_token: str = "",
+                                  point_tokens: list = [""],
+                                  primitive: str = "sphere",
+                                  radius: float = 1.0,
+                                  size: list = [1, 1, 1],
+                                  height: float = 1.0,
+                                  axis: list = [0, 0, 1],
+                                  union: bool = False) -> str:
+        """
+        {
+          "name": "create_bodies_from_points",
+          "description": "Creates one primitive body (sphere, box or cylinder) at every point in a single step, using TemporaryBRepManager and one Base Feature. Pass a transient Point3D array token (from create_point3d_list, create_point_grid or the pattern tools) instead of thousands of point tokens. Returns one bodySetToken for all created bodies, body i is '<bodySetToken>[i]'.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "component_entity_token": {
+                "type": "string",
+                "description": "Entity token of the component the bodies are added to. Empty string uses the root component."
+              },
+              "point_tokens": {
+                "type": "array",
+                "items": { "type": "string" },
+                "description": "Transient Point3D array tokens, Point3D tokens or array items like '<arrayToken>[3]'."
+              },
+              "primitive": {
+                "type": "string",
+                "enum": ["sphere", "box", "cylinder"],
+                "description": "Body created at each point. Spheres and boxes are centered on the point, cylinders start at the point."
+              },
+              "radius": {
+                "type": "number",
+                "description": "Sphere or cylinder radius in cm."
+              },
+              "size": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "Box [length, width, height] along x, y and z in cm."
+              },
+              "height": {
+                "type": "number",
+                "description": "Cylinder height in cm."
+              },
+              "axis": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "Cylinder [x, y, z] direction."
+              },
+              "union": {
+                "type": "boolean",
+                "description": "true joins all the bodies into one before they are added to the design."
+              }
+            },
+            "required": ["point_tokens", "primitive"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the bodySetToken, body count, baseFeatureToken and any errors."
+            }
+          }
+        }
+        """
+        try:
+            return self._create_primitive_bodies(component_entity_token, point_tokens, primitive,
+                                                 radius=radius, size=size, height=height, axis=axis, union=union)
         except:
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
-
-    #@ToolCollection.tool_call
+    @ToolCollection.tool_call
     def create_spheres_from_points(self,
                                    point_token_list: list = None,
                                    sphere_radius: float = 1.0) -> str:
         """
         {
           "name": "create_spheres_from_points",
-          "description": "Creates a set of sphere bodies from a list of Point3D references using TemporaryBRepManager. Adds all spheres to a single Base Feature. Returns JSON with body tokens for each sphere or any errors.",
+          "description": "Creates a sphere body at every point in the root component, using TemporaryBRepManager and a single Base Feature. Accepts Point3D tokens and transient Point3D array tokens. Returns one bodySetToken for all created spheres, sphere i is '<bodySetToken>[i]'.",
           "parameters": {
             "type": "object",
             "properties": {
               "point_token_list": {
                 "type": "array",
-                "description": "A list of tokens referencing adsk.core.Point3D objects, each specifying a center for a sphere.",
+                "description": "Point3D tokens or transient Point3D array tokens, each point is the center of a sphere.",
                 "items": { "type": "string" }
               },
               "sphere_radius": {
                 "type": "number",
-                "description": "The radius of each sphere in the current design's length units."
+                "description": "The radius of each sphere in cm."
               }
             },
             "required": ["point_token_list", "sphere_radius"],
             "returns": {
               "type": "string",
-              "description": "A JSON object mapping each token to success or error, plus a 'baseFeatureToken' referencing the base feature, and new body tokens if desired."
+              "description": "JSON object with the bodySetToken, body count, baseFeatureToken and any errors."
             }
           }
         }
         """
         try:
-            if not point_token_list or not isinstance(point_token_list, list):
-                return "Error: point_token_list must be a non-empty list of string tokens."
-            if sphere_radius <= 0:
-                return "Error: sphere_radius must be positive."
-
-            app = adsk.core.Application.get()
-            if not app:
-                return "Error: Fusion 360 is not running."
-
-            product = app.activeProduct
-            if not product or not isinstance(product, adsk.fusion.Design):
-                return "Error: No active Fusion 360 design found."
-
-            design = adsk.fusion.Design.cast(product)
-            root_comp = design.rootComponent
-            results = {}
-
-            # 1) Create or retrieve a TemporaryBRepManager
-            temp_brep_mgr = adsk.fusion.TemporaryBRepManager.get()
-
-            # 2) Create a new Base Feature (non-parametric) in the root component
-            base_feat = root_comp.features.baseFeatures.add()
-            base_feat.startEdit()
-
-            # We'll store references to newly created bodies so we can assign tokens
-            # if desired. For example, "sphere_body_tokens": { "tokenForPointA": "bodyToken123", ... }
-            sphere_body_tokens = {}
-
-            # 3) Loop over each point token
-            for token in point_token_list:
-                pt_obj = self.get_hash_obj(token)
-                if not pt_obj or not isinstance(pt_obj, adsk.core.Point3D):
-                    results[token] = f"Error: token '{token}' is not a valid Point3D."
-                    continue
-
-                # Create a sphere for each point using the temporary BRep manager
-                try:
-                    sphere_body = temp_brep_mgr.createSphere(pt_obj, sphere_radius)
-                except Exception as e:
-                    results[token] = f"Error creating sphere for token '{token}': {str(e)}"
-                    continue
-
-                # Add the BRep body to the Base Feature
-                try:
-                    new_body = base_feat.bodies.add(sphere_body)
-                    # Generate a token if you want to keep track of it
-                    # e.g. "Sphere_{x}_{y}_{z}" or something similar
-                    sphere_name = f"Sphere_{token}"
-                    sphere_body_token = self.set_obj_hash(sphere_name, new_body)
-                    sphere_body_tokens[token] = sphere_body_token
-
-                    results[token] = f"Success: Created sphere with radius={sphere_radius} at token '{token}'."
-                except Exception as e:
-                    results[token] = f"Error adding BRep body to base feature: {str(e)}"
-
-            # 4) Finish editing the Base Feature
-            try:
-                base_feat.finishEdit()
-            except Exception as e:
-                results["Error_baseFeature"] = f"Error finishing Base Feature: {str(e)}"
-
-            # 5) Optionally store a token for the entire base feature
-            base_feat_name = f"BaseFeature_{len(point_token_list)}Spheres"
-            base_feat_token = self.set_obj_hash(base_feat, base_feat_name)
-
-            # Build final JSON
-            results["baseFeatureToken"] = base_feat_token
-            results["sphere_body_tokens"] = sphere_body_tokens
-
-            return json.dumps(results, indent=2)
-
+            return self._create_primitive_bodies("", point_token_list, "sphere", radius=sphere_radius)
         except:
-            import traceback
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
 
-
     @ToolCollection.tool_call
     def join_bodies(self, body_token_list: list = None) -> str:
         """
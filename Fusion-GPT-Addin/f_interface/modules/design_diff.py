@@ -0,0 +1,258 @@
+# design_diff
+import adsk.core
+import adsk.fusion
+import traceback
+import json
+import time
+from ...lib import fusion360utils as futil
+
+# send info to html palette
+from .shared import ToolCollection
+
+def print(string):
+    """redefine print for fusion env"""
+    futil.log(str(string))
+print(f"RELOADED: {__name__.split("%2F")[-1]}")
+
+
+class DesignChanges(ToolCollection):
+    """
+    Lightweight design fingerprints, compared to report what changed
+    between tool calls instead of re-listing the whole design.
+    """
+
+    # kind: (component collection attribute, attributes compared for "modified")
+    FINGERPRINT_KINDS = {
+        "occurrences": ("occurrences", ["name", "isLightBulbOn", "transform2"]),
+        "bodies": ("bRepBodies", ["name", "revisionId", "isLightBulbOn"]),
+        "sketches": ("sketches", ["name", "revisionId", "isLightBulbOn"]),
+        "features": ("features", ["name", "isSuppressed"]),
+        "joints": ("joints", ["name", "isSuppressed"]),
+        "jointOrigins": ("jointOrigins", ["name"]),
+    }
+
+    # oldest snapshots are dropped
+    MAX_SNAPSHOTS = 10
+
+    def __init__(self, ent_dict):
+        super().__init__(ent_dict)
+
+        # snapshot id: fingerprint, in creation order
+        self.snapshots = {}
+        self.n_snapshots = 0
+
+    def _attr_value(self, entity, attr_name):
+        """comparable attribute value, matrices and points as rounded arrays"""
+        try:
+            val = getattr(entity, attr_name, None)
+        except Exception:
+            return None
+
+        if hasattr(val, "asArray"):
+            return [round(v, 6) for v in val.asArray()]
+        if isinstance(val, (str, int, float, bool)) or val is None:
+            return val
+        return str(val)
+
+    def _fingerprint(self, design) -> dict:
+        """
+        per component token sets with a few cheap attributes per entity,
+        no geometry or physical properties are computed
+        """
+        timeline = design.timeline
+        components = {}
+
+        for comp in design.allComponents:
+            kinds = {}
+            for kind, (attr_name, compare_attrs) in self.FINGERPRINT_KINDS.items():
+                collection = getattr(comp, attr_name, None)
+                if collection is None:
+                    continue
+
+                entities = {}
+                for ent in collection:
+                    token = self.set_obj_hash(ent)
+                    entities[token] = [self._attr_value(ent, a) for a in compare_attrs]
+                kinds[kind] = entities
+
+            components[self.set_obj_hash(comp)] = {"name": comp.name, "kinds": kinds}
+
+        return {
+            "created": time.time(),
+            "timeline": {"count": timeline.count, "markerPosition": timeline.markerPosition},
+            "components": components,
+        }
+
+    def _store_snapshot(self, fingerprint: dict) -> str:
+        self.n_snapshots += 1
+        snapshot_id = f"snapshot_{self.n_snapshots}"
+        self.snapshots[snapshot_id] = fingerprint
+
+        while len(self.snapshots) > self.MAX_SNAPSHOTS:
+            self.snapshots.pop(next(iter(self.snapshots)))
+
+        return snapshot_id
+
+    def _diff(self, old: dict, new: dict) -> dict:
+        """added/removed/modified entities grouped by component"""
+        results = {}
+
+        if old["timeline"] != new["timeline"]:
+            results["timeline"] = {"before": old["timeline"], "after": new["timeline"]}
+
+        old_comps = old["components"]
+        new_comps = new["components"]
+
+        added_comps = [
+            {"name": new_comps[t]["name"], "componentToken": t}
+            for t in new_comps if t not in old_comps
+        ]
+        removed_comps = [
+            {"name": old_comps[t]["name"], "componentToken": t}
+            for t in old_comps if t not in new_comps
+        ]
+        if added_comps:
+            results["addedComponents"] = added_comps
+        if removed_comps:
+            results["removedComponents"] = removed_comps
+
+        component_changes = []
+        for comp_token, new_comp in new_comps.items():
+            old_comp = old_comps.get(comp_token, {"name": None, "kinds": {}})
+            comp_change = {}
+
+            if old_comp["name"] is not None and old_comp["name"] != new_comp["name"]:
+                comp_change["renamedFrom"] = old_comp["name"]
+
+            for kind, (attr_name, compare_attrs) in self.FINGERPRINT_KINDS.items():
+                old_ents = old_comp["kinds"].get(kind, {})
+                new_ents = new_comp["kinds"].get(kind, {})
+                if old_ents == new_ents:
+                    continue
+
+                added = [{"name": v[0], "token": t} for t, v in new_ents.items() if t not in old_ents]
+                removed = [{"name": v[0], "token": t} for t, v in old_ents.items() if t not in new_ents]
+
+                modified = []
+                for token, new_vals in new_ents.items():
+                    old_vals = old_ents.get(token)
+                    if old_vals is None or old_vals == new_vals:
+                        continue
+                    changed = {
+                        attr: {"before": o, "after": n}
+                        for attr, o, n in zip(compare_attrs, old_vals, new_vals) if o != n
+                    }
+                    modified.append({"name": new_vals[0], "token": token, "changed": changed})
+
+                for key, val in (("added", added), ("removed", removed), ("modified", modified)):
+                    if val:
+                        comp_change.setdefault(key, {})[kind] = val
+
+            if comp_change:
+                component_changes.append({"componentName": new_comp["name"], "componentToken": comp_token, **comp_change})
+
+        if component_changes:
+            results["componentChanges"] = component_changes
+
+        return results
+
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def take_design_snapshot(self) -> str:
+        """
+        {
+            "name": "take_design_snapshot",
+            "description": "Stores a lightweight fingerprint of the current design (per component occurrences, bodies, sketches, features, joints and joint origins with their entity tokens, and the timeline marker). Returns a snapshotId that can be passed to get_design_changes.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": [],
+                "returns": {
+                    "type": "string",
+                    "description": "JSON object with the snapshotId and entity counts."
+                }
+            }
+        }
+        """
+        try:
+            design = adsk.fusion.Design.cast(self.app.activeProduct)
+            if not design:
+                return "Error: No active Fusion 360 design found."
+
+            fingerprint = self._fingerprint(design)
+            snapshot_id = self._store_snapshot(fingerprint)
+
+            n_entities = sum(
+                len(ents)
+                for comp in fingerprint["components"].values()
+                for ents in comp["kinds"].values()
+            )
+
+            return json.dumps({
+                "snapshotId": snapshot_id,
+                "components": len(fingerprint["components"]),
+                "entities": n_entities,
+                "timeline": fingerprint["timeline"],
+            })
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def get_design_changes(self, since_snapshot: str = "") -> str:
+        """
+        {
+            "name": "get_design_changes",
+            "description": "Returns only what changed in the design since a snapshot: added/removed components, and per component the added, removed and modified occurrences, bodies, sketches, features, joints and joint origins (with entity tokens and changed attributes). Use this after modeling tool calls instead of re-running list_document_structure. A new snapshot is stored on every call and its snapshotId is returned, pass it to the next call.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "since_snapshot": {
+                        "type": "string",
+                        "description": "snapshotId from take_design_snapshot or a previous get_design_changes call. Empty string compares against the most recent snapshot."
+                    }
+                },
+                "required": [],
+                "returns": {
+                    "type": "string",
+                    "description": "JSON object with the new snapshotId and the changes, 'unchanged': true when nothing changed."
+                }
+            }
+        }
+        """
+        try:
+            design = adsk.fusion.Design.cast(self.app.activeProduct)
+            if not design:
+                return "Error: No active Fusion 360 design found."
+
+            if since_snapshot:
+                old = self.snapshots.get(since_snapshot)
+                if old is None:
+                    return f"Error: unknown snapshot '{since_snapshot}', available snapshots: {list(self.snapshots.keys())}"
+            elif self.snapshots:
+                since_snapshot = next(reversed(self.snapshots))
+                old = self.snapshots[since_snapshot]
+            else:
+                old = None
+
+            fingerprint = self._fingerprint(design)
+            snapshot_id = self._store_snapshot(fingerprint)
+
+            if old is None:
+                return json.dumps({
+                    "snapshotId": snapshot_id,
+                    "message": "No earlier snapshot, stored the current design as the first snapshot."
+                })
+
+            changes = self._diff(old, fingerprint)
+
+            return json.dumps({
+                "sinceSnapshot": since_snapshot,
+                "snapshotId": snapshot_id,
+                "unchanged": len(changes) == 0,
+                **changes
+            })
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
@@ -14,15 +14,22 @@ import re
 from array import array
 import time
 import functools
+import collections
 import base64
 import re
 import hashlib
 import importlib
+import operator
+import types
 from ... import config
 from ...lib import fusion360utils as futil
 
 # send info to html palette
 from .shared import ToolCollection
+from .. import json_stream
+from .. import class_introspection
+from .. import tracing
+from .. import columnar
 
 
 def print(string):
@@ -31,6 +38,10 @@ def print(string):
 print(f"RELOADED: {__name__.split("%2F")[-1]}")
 
 
+def class_introspector():
+    """class descriptions for the running Fusion version, cached on disk"""
+    app = adsk.core.Application.get()
+    return class_introspection.get_introspector(config.INTROSPECTION_CACHE_DIR, app.version)
 
 
 class SQL(ToolCollection):
@@ -43,12 +54,11 @@ class SQL(ToolCollection):
 
         rev_errors_dict = {v:k for k,v in errors_dict.items()}
 
-        existing_error = rev_errors_dict.get(error_str, None)
+        error_hash = rev_errors_dict.get(error_str, None)
 
-        if existing_error is None:
-            errors_dict[f"error_{n_errors}"] = error_str
-
-        error_hash = rev_errors_dict.get(error_str)
+        if error_hash is None:
+            error_hash = f"error_{n_errors}"
+            errors_dict[error_hash] = error_str
 
         return errors_dict, error_hash
 
@@ -56,6 +66,27 @@ class SQL(ToolCollection):
     def __init__(self, ent_dict):
         super().__init__(ent_dict)
 
+        # (class, attribute path): (parent getter, leaf attribute), for UPDATE
+        self.setter_cache = {}
+
+        # profile every statement, not only EXPLAIN ANALYZE, e.g for benchmarks
+        self.profile_queries = False
+        self.last_query_profile = None
+
+        # serialized SELECT results, least recently used first
+        # (statement, design generation, index generation): result json
+        self.use_query_cache = True
+        self.query_cache = collections.OrderedDict()
+        self.query_cache_stats = {"hits": 0, "misses": 0}
+        # incremented when the object index is rebuilt
+        self.index_generation = 0
+
+        # object type: columnar.NumericColumns, for the generations in column_snapshot_key
+        self.use_numeric_columns = True
+        self.column_snapshots = {}
+        self.column_snapshot_key = None
+
+        self.EXPLAIN_PATTERN = re.compile(r"(?i)^\s*EXPLAIN(?P<analyze>\s+ANALYZE)?\s+")
 
         self.SQL_PATTERN = re.compile(
             r"(?i)^\s*"
@@ -184,6 +215,29 @@ class SQL(ToolCollection):
             r"\s*$"
         )
 
+        # table alias, keywords are not aliases
+        alias = r"(?!(?:INNER|LEFT|JOIN|ON|WHERE|ORDER|LIMIT|OFFSET)\b)\w+"
+
+        self.JOIN_CLAUSE_PATTERN = re.compile(
+            r"(?i)(?:(?P<joinKind>INNER|LEFT)\s+)?JOIN\s+(?P<joinType>\w+)"
+            r"(?:\s+(?:AS\s+)?(?P<joinAlias>" + alias + r"))?"
+            r"\s+ON\s+(?P<onLeft>[\w\.]+)\s*=\s*(?P<onRight>[\w\.]+)"
+        )
+
+        # SELECT with one or more JOIN clauses, WHERE is parsed with parse_where_conditions
+        self.SQL_JOIN_PATTERN = re.compile(
+            r"(?i)^\s*SELECT\s+(?P<attributes>[\w\s,\.]+?)\s+"
+            r"FROM\s+(?P<objectType>\w+)"
+            r"(?:\s+(?:AS\s+)?(?P<alias>" + alias + r"))?"
+            r"(?P<joins>(?:\s+(?:(?:INNER|LEFT)\s+)?JOIN\s+\w+(?:\s+(?:AS\s+)?" + alias + r")?"
+            r"\s+ON\s+[\w\.]+\s*=\s*[\w\.]+)+)"
+            r"(?:\s+WHERE\s+(?P<where>.+?))?"
+            r"(?:\s+ORDER\s+BY\s+(?P<orderAttr>[\w\.]+)(?:\s+(?P<orderDir>ASC|DESC))?)?"
+            r"(?:\s+LIMIT\s+(?P<limit>\d+))?"
+            r"(?:\s+OFFSET\s+(?P<offset>\d+))?"
+            r"\s*$"
+        )
+
         self.obj_mapping = {
             "Component": {
                 "Sketch": "sketches",
@@ -219,193 +273,11 @@ class SQL(ToolCollection):
           }
         }
         """
-        all_arg_objects = set()
-
         try:
             if not class_names or not isinstance(class_names, list):
                 return json.dumps({"error": "class_names must be a non-empty list of strings"})
 
-            def import_class_from_path(path: str):
-                """
-                Attempt to import something like 'adsk.fusion.Sketch'.
-                Returns (cls, None) if successful, or (None, errorString) if failed.
-                """
-                tokens = path.split(".")
-                if len(tokens) < 2:
-                    return None, f"Invalid class path: '{path}'."
-                mod_str = ".".join(tokens[:-1])
-                cls_str = tokens[-1]
-                try:
-                    mod = importlib.import_module(mod_str)
-                except ModuleNotFoundError:
-                    return None, f"Could not import module '{mod_str}'."
-                cls = getattr(mod, cls_str, None)
-                if cls is None:
-                    return None, f"Class '{cls_str}' not found in '{mod_str}'."
-                return cls, None
-
-            exclude_list = [
-                "cast", "classType", "__init__", "__del__", "thisown",
-                "revisionId", "dataComponent", "decals", "activeSheetMetalRule",
-                "allAsBuiltJoints", "allJointOrigins", "allJoints", "allOccurrences",
-                "allTangentRelationships", "attributes", "canvases", "findBRepUsingRay",
-                "internalCommand", "createThumbnail","allOccurrencesByComponent",
-                "occurrencesByComponent", "configurationRow", "configuredDataFile",
-                "switchConfiguration", "setAsBallJointMotion", "setAsCylindricalJointMotion",
-                "setAsPinSlotJointMotion","setAsPlanarJointMotion", "setAsRevoluteJointMotion",
-                "setAsRigidJointMotion", "createForAssemblyContext" , "meshManager", "findByTempId",
-                "convert", "createSpunProfile", "createSpunProfileInput", "partNumber",
-                "createFlatPattern", "saveCopyAs", "replace", "setAsSliderJointMotion",
-                "importSVG", "include", "redefine" , "projectCutEdges", "project", "projectToSurface",
-                "moveToComponent", "isComputeDeferred", "intersectWithSketchPlane", "isValid", "trim",
-                "lumps","copyTo", "createBRepEdgeProfile", "documentReference", "getPhysicalProperties",
-                "setCenterlineState", "findBRepUsingPoint", "createOpenProfile"
-
-
-            ]  # skip internal
-
-            def describe_method(py_callable):
-                """
-                Attempt to parse signature with inspect.signature,
-                then return { params: [...], doc: '' }.
-                """
-                # Attempt signature
-                try:
-                    sig = inspect.signature(py_callable)
-                except ValueError:
-                    sig = None
-
-                params_info = []
-                if sig:
-                    for param_name, param in sig.parameters.items():
-                        if param_name == "self":
-                            continue
-
-                        default_val = None if param.default is param.empty else param.default
-                        annotation_str = None if param.annotation is param.empty else str(param.annotation)
-                        if isinstance(annotation_str, str):
-                            annotation_str = annotation_str.replace("\n", " ")
-
-                        all_arg_objects.add(annotation_str)
-
-                        params_info.append(f"{param_name}:{annotation_str}")
-
-                doc_str = inspect.getdoc(py_callable) or ""
-
-
-                return params_info
-
-            def gather_class_info(cls):
-                """
-                Gather info on methods (callables) and attributes (non-callable) from the class.
-                Returns a dict with 'methods' and 'attributes', including 'expectedObjectType' for attributes if possible.
-                """
-                cls_info = {
-                    "methods": {},
-                    "attributes": {}
-                }
-
-                # 1) Gather methods
-                #   isfunction => pure Python function
-                methods_found = inspect.getmembers(cls, predicate=inspect.isfunction)
-                #   ismethoddescriptor => some C++ extension or property
-                descriptors = inspect.getmembers(cls, predicate=inspect.ismethoddescriptor)
-
-                combined_method_members = dict(methods_found)
-                for name, desc in descriptors:
-                    if name not in combined_method_members:
-                        combined_method_members[name] = desc
-
-                for name, func_obj in combined_method_members.items():
-                    if name[0] == "_" or name in exclude_list:
-                        continue
-                    cls_info["methods"][name] = describe_method(func_obj)
-
-                # 2) Gather all members, separate out attributes
-                #   We'll skip private, skip known methods
-                all_members = inspect.getmembers(cls)
-                known_methods = set(combined_method_members.keys())
-
-                for name, member_obj in all_members:
-                    if name[0] == "_" or name in exclude_list:
-                        continue
-                    if name in known_methods:
-                        continue  # we've described it as a method
-
-                    # If not callable => treat as attribute
-                    if not callable(member_obj):
-
-                        attr_data = None
-
-                        # Attempt to see if this is a property descriptor
-                        # If so, we might be able to get a return annotation from fget
-                        if inspect.isdatadescriptor(member_obj):
-                            # Some descriptors may have .fget
-                            fget = getattr(member_obj, 'fget', None)
-                            if fget and callable(fget):
-                                try:
-                                    fget_sig = inspect.signature(fget)
-                                    # If there's a return annotation
-                                    if fget_sig.return_annotation is not inspect.Signature.empty:
-
-                                        if ":" in fget_sig.return_annotation:
-                                            object_type_str = fget_sig.return_annotation.split(":")[-1].strip(">").strip()
-                                        else:
-                                            object_type_str = fget_sig.return_annotation
-
-
-                                        #attr_data["objectType"] = object_type_str
-
-                                        all_arg_objects.add(object_type_str)
-                                        attr_data = object_type_str
-
-                                except ValueError:
-                                    pass
-
-                        # If we still don't have expectedObjectType, fallback to type
-                        if not attr_data:
-                            attr_data = member_obj.__class__.__name__
-
-                        cls_info["attributes"][name] = attr_data
-
-                return cls_info
-
-            results = {}
-
-            for class_name in class_names:
-                # If there's a dot, assume it's a full path (like adsk.fusion.Sketch).
-                # Otherwise, try adsk.fusion.class_name, then adsk.core.class_name
-                if "." in class_name:
-                    cls, err = import_class_from_path(class_name)
-                    if err:
-                        results[class_name] = {"error": err}
-                        continue
-                    results[class_name] = gather_class_info(cls)
-                else:
-                    # Try adsk.fusion.class_name
-                    fusion_path = f"adsk.fusion.{class_name}"
-                    cls, err = import_class_from_path(fusion_path)
-                    if not err and cls:
-                        data = gather_class_info(cls)
-                        #data["resolvedPath"] = fusion_path
-                        results[class_name] = data
-                        continue
-
-                    # Then try adsk.core.class_name
-                    core_path = f"adsk.core.{class_name}"
-                    cls2, err2 = import_class_from_path(core_path)
-                    if not err2 and cls2:
-                        data2 = gather_class_info(cls2)
-                        #data2["resolvedPath"] = core_path
-                        results[class_name] = data2
-                        continue
-
-                    # If both fail, store an error
-                    results[class_name] = {"error": f"Could not find class '{class_name}' in adsk.fusion or adsk.core."}
-
-
-
-            return results
+            return class_introspector().describe_many(class_names, detail=False)
 
         except Exception as e:
             return json.dumps({"Error": str(e)})
@@ -546,15 +418,18 @@ class SQL(ToolCollection):
 
         print(self.obj_mapping)
         self.object_dict = self.document_objects()
+        self.index_generation += 1
 
     def get_object_dict(self):
         if self.reload_object_index == True:
             self.object_dict = self.document_objects()
+            self.index_generation += 1
             print(f"object dict reloaded")
 
         return self.object_dict
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def get_available_classes(self):
         """
         {
@@ -690,7 +565,7 @@ class SQL(ToolCollection):
         value = None
         if in_list is not None:
             # parse the in_list e.g. "10, 'foo', true"
-            value = parse_in_list(in_list)
+            value = self.parse_in_list(in_list)
         elif str_val is not None:
             value = str_val
         elif num_val is not None:
@@ -742,7 +617,7 @@ class SQL(ToolCollection):
             out.append(it)
         return out
 
-    def match_object_against_conditions(self, obj, conditions):
+    def match_object_against_conditions(self, obj, conditions, get_attr=None):
         """
             Checks whether 'obj' satisfies the list of 'conditions', each of which is
             a dict with:
@@ -755,8 +630,11 @@ class SQL(ToolCollection):
 
             The function returns True if 'obj' meets the entire set of conditions
             when chained by AND/OR logic in the specified order, or False otherwise.
+            get_attr: attribute getter, default get_sub_attr
 
         """
+        get_attr = get_attr or self.get_sub_attr
+
         def condition_matches(obj, cond):
             """
                 E.g. cond might be:
@@ -771,7 +649,7 @@ class SQL(ToolCollection):
             attr_name = cond["attrName"]
 
             # get object atribute for comparison
-            attr_val, errors = self.get_sub_attr(obj, attr_name)
+            attr_val, errors = get_attr(obj, attr_name)
 
             #print(f"operator: {operator},  val: {value},  attr_name: {attr_name}, attr_val: {attr_val}")
 
@@ -845,7 +723,7 @@ class SQL(ToolCollection):
 
             attr_name = cond["attrName"]
 
-            val, errors = self.get_sub_attr(obj, attr_name)
+            val, errors = get_attr(obj, attr_name)
             if errors != None:
                 return None, errors
 
@@ -870,100 +748,569 @@ class SQL(ToolCollection):
 
         return overall_result, None
 
-    def apply_assignments(self, obj, assignments):
-        """Set values  """
-        updated_something = False
+    # per object details returned by UPDATE statements
+    MAX_UPDATE_DETAILS = 10
+
+    BOOL_MAP = {
+        "true": True,
+        "false": False,
+        "1": True,
+        "0": False
+    }
+
+    def _compiled_setter(self, obj, attr_path: str) -> tuple:
+        """
+        (parent getter, leaf attribute name) for an attribute path, compiled
+        once per class and path
+        """
+        key = (obj.__class__, attr_path)
+        setter = self.setter_cache.get(key)
+        if setter is None:
+            parent_path, _, leaf = attr_path.rpartition(".")
+            parent_getter = operator.attrgetter(parent_path) if parent_path else (lambda o: o)
+            setter = (parent_getter, leaf)
+            self.setter_cache[key] = setter
+        return setter
+
+    def _coerce_assignment(self, new_val, current_val):
+        """convert the SET value to the type of the current attribute value"""
+        if isinstance(current_val, bool):
+
+            # convert str "true" "false" to bool
+            if isinstance(new_val, str):
+                new_val = self.BOOL_MAP.get(new_val.lower(), new_val)
+
+            # convert 0, 1 to bool
+            if isinstance(new_val, int) and new_val in (0, 1):
+                new_val = bool(new_val)
+
+        elif isinstance(new_val, str):
+            hash_obj = self.ent_dict.get(new_val, None)
+            if hash_obj != None:
+                new_val = hash_obj
+
+        return new_val
+
+    def apply_assignments(self, objs, assignments, errors_dict: dict, undo_log: list = None, get_attr=None) -> dict:
+        """
+        Set values on all objects, previous values are appended to undo_log if passed.
+        get_attr: attribute getter for error descriptions, default get_sub_attr.
+        Setters are compiled once per class and attribute path, values are
+        coerced once per assignment and current value type. Design compute is
+        deferred until all objects are updated.
+        """
+        get_attr = get_attr or self.get_sub_attr
+        updated_count = 0
+        sample_details = {}
+
+        # (assignment index, current value type): coerced value
+        coerced = {}
+
+        design = adsk.fusion.Design.cast(self.app.activeProduct)
+        defer_compute = design is not None and hasattr(design, "isComputeDeferred") and len(objs) > 1
+        if defer_compute:
+            was_deferred = design.isComputeDeferred
+            design.isComputeDeferred = True
+
+        try:
+            for obj in objs:
+                updated_something = False
+                details = {}
+
+                for index, assign in enumerate(assignments):
+                    attr_name = assign["attrName"]
+                    parent_getter, leaf = self._compiled_setter(obj, attr_name)
+
+                    try:
+                        parent = parent_getter(obj)
+                        current_val = getattr(parent, leaf)
+                    except AttributeError:
+                        # descriptive error with available attributes
+                        current_val, errors = get_attr(obj, attr_name)
+                        errors_dict, error_hash = self.get_error_hash(errors_dict, errors)
+                        details[attr_name] = error_hash
+                        continue
+
+                    key = (index, type(current_val))
+                    if key not in coerced:
+                        coerced[key] = self._coerce_assignment(assign["value"], current_val)
+                    new_val = coerced[key]
 
-        BOOL_MAP = {
-            "true": True,
-            "false": False,
-            "1": True,
-            "0": False
+                    if undo_log is not None:
+                        undo_log.append((obj, attr_name, current_val))
+                    setattr(parent, leaf, new_val)
+                    details[attr_name] = f"new_val: {new_val}"
+                    updated_something = True
+
+                if updated_something:
+                    updated_count += 1
+                if len(sample_details) < self.MAX_UPDATE_DETAILS:
+                    sample_details[self.set_obj_hash(obj)] = details
+
+        finally:
+            if defer_compute:
+                design.isComputeDeferred = was_deferred
+
+        return {
+            "updatedCount": updated_count,
+            "sampleDetails": sample_details,
         }
 
-        details = {}
-        for assign in assignments:
-            attr_name = assign["attrName"]
-            new_val = assign["value"]
+    # quoted string, '' inside is an escaped quote, group 1 is the closing quote
+    SQL_STRING_PATTERN = re.compile(r"'[^']*(?:''[^']*)*('?)")
+
+    # @prev or @N outside quoted strings
+    SQL_REF_PATTERN = re.compile(r"'[^']*'|@(prev|\d+)\b", re.IGNORECASE)
+
+    def _split_sql_statements(self, query_str: str) -> list:
+        """split on ';' outside quoted strings, empty statements are dropped"""
+        statements = re.findall(r"(?:[^;']|'[^']*')+", query_str)
+        return [st.strip() for st in statements if st.strip()]
+
+    def _unterminated_string(self, query_str: str):
+        """
+        start of a quoted string with no closing quote, None if every quote is
+        closed. An odd quote count always leaves one string open
+        """
+        if query_str.count("'") % 2 == 0:
+            return None
+        for m in self.SQL_STRING_PATTERN.finditer(query_str):
+            if not m.group(1):
+                return m.start()
+        return query_str.rfind("'")
+
+    def _substitute_sql_refs(self, statement: str, matched: list) -> tuple:
+        """
+        replace @prev / @N with a quoted list of the entity tokens matched by
+        an earlier statement, for use in IN (...) conditions
+        """
+        errors = []
+
+        def replace(m):
+            ref = m.group(1)
+            if ref is None:
+                return m.group(0)
+
+            index = len(matched) if ref.lower() == "prev" else int(ref)
+            if index < 1 or index > len(matched):
+                errors.append(f"Error: '@{ref}' does not reference an earlier statement, statement {len(matched) + 1} can reference @1 to @{len(matched)}")
+                return m.group(0)
+
+            tokens = [self.set_obj_hash(o) for o in matched[index - 1]]
+            # empty string matches no token, IN stays valid SQL
+            return ", ".join(f"'{t}'" for t in tokens) or "''"
+
+        statement = self.SQL_REF_PATTERN.sub(replace, statement)
+        return statement, (errors[0] if errors else None)
+
+    def _rollback_sql_updates(self, undo_log: list) -> int:
+        """restore attribute values recorded by apply_assignments, newest first"""
+        n_restored = 0
+        for obj, attr_name, old_val in reversed(undo_log):
+            try:
+                self.set_sub_attr(obj, attr_name, old_val)
+                n_restored += 1
+            except Exception as e:
+                print(f"Error: rollback {attr_name}: {e}")
+        return n_restored
 
-            # get current val check errors
-            current_val, errors = self.get_sub_attr(obj, attr_name)
-            # use current val typ to validate
-            current_type = type(current_val)
+    # query cache limits
+    MAX_CACHED_QUERIES = 64
+    MAX_CACHED_RESULT_CHARS = 1000000
 
-            if isinstance(current_val, bool):
+    def _query_cache_key(self, statement: str):
+        """
+        cache key for a SELECT statement, whitespace outside quoted strings is
+        normalized. None for statements that are not cached
+        """
+        if not self.use_query_cache or self.profile_queries:
+            return None
+        if not re.match(r"(?i)^\s*SELECT\b", statement):
+            return None
+
+        normalized = " ".join(
+            part if part.startswith("'") else " ".join(part.split())
+            for part in re.split(r"('[^']*')", statement.strip())
+        )
+        return (normalized, *self._design_key(), ToolCollection.design_generation, self.index_generation)
 
-                # convert str "true" "false" to bool
-                if isinstance(new_val, str):
-                    # check if lower-cased value is in BOOL_MAP
-                    val_lower = new_val.lower()
-                    if val_lower in BOOL_MAP:
-                        new_val = BOOL_MAP[val_lower]  # a Python bool
+    def _design_key(self) -> tuple:
+        """
+        active document identity and timeline marker position, switching
+        documents or moving the marker doesn't change the design generation
+        """
+        design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+        if not design:
+            return (None, None)
 
-                # convert 0, 1 to bool
-                if isinstance(new_val, int):
-                    if new_val == 0:
-                        new_val = False
-                    elif new_val == 1:
-                        new_val = True
+        document = getattr(design, "parentDocument", None)
+        document_id = None
+        if document is not None:
+            document_id = getattr(document, "creationId", None) or document.name
 
+        # direct modeling designs have no timeline
+        try:
+            marker_position = design.timeline.markerPosition
+        except Exception:
+            marker_position = None
+
+        return (document_id, marker_position)
+
+    def _cache_query_result(self, cache_key: tuple, result_json: str):
+        if len(result_json) > self.MAX_CACHED_RESULT_CHARS:
+            return
+        # generations only increase, entries from earlier ones or another
+        # document are rarely hit again
+        if self.query_cache and next(reversed(self.query_cache))[1:] != cache_key[1:]:
+            self.query_cache.clear()
+        self.query_cache[cache_key] = result_json
+        while len(self.query_cache) > self.MAX_CACHED_QUERIES:
+            self.query_cache.popitem(last=False)
+
+    def _run_sql_batch(self, statements: list, transaction: bool) -> dict:
+        """
+        run statements in order, timeline items created by the batch are
+        grouped so the batch can be rolled back from the timeline
+        """
+        design = adsk.fusion.Design.cast(self.app.activeProduct)
+        timeline = design.timeline if design else None
+        timeline_start = timeline.count if timeline else 0
 
-            elif isinstance(new_val, str):
-                hash_obj = self.ent_dict.get(new_val, None)
-                if hash_obj != None:
-                    new_val = hash_obj
+        undo_log = [] if transaction else None
 
+        # matched objects per statement, for @prev / @N
+        matched = []
+        results = []
+        failed_index = None
 
+        for index, statement in enumerate(statements):
+            sub_statement, errors = self._substitute_sql_refs(statement, matched)
             if errors:
-                details[attr_name] = f"{errors}"
+                result, objs = errors, []
             else:
-                success, errors = self.set_sub_attr(obj, attr_name, new_val )
-                details[attr_name] = f"new_val: {new_val}"
-                updated_something = True
+                result, objs = self._run_sql_statement(sub_statement, undo_log)
 
-        return {
-            "updated": updated_something,
-            "details": details
+            if isinstance(result, str):
+                result = {"error": result}
+
+            matched.append(objs)
+            results.append({"statement": statement, **result})
+
+            if transaction and "error" in result:
+                failed_index = index
+                break
+
+        return_dict = {
+            "statementCount": len(statements),
+            "executedCount": len(results),
+            "results": results,
         }
 
-    @ToolCollection.tool_call
-    def run_sql_query(self, query_str: str = "SELECT name,entityToken FROM Occurrence WHERE name LIKE 'screw'") -> str:
+        if failed_index is not None:
+            return_dict["failedStatement"] = failed_index + 1
+            return_dict["rolledBack"] = True
+            return_dict["restoredCount"] = self._rollback_sql_updates(undo_log)
+
+        elif timeline is not None and timeline.count - timeline_start > 1:
+            try:
+                group = timeline.timelineGroups.add(timeline_start, timeline.count - 1)
+                group.name = "SQL batch"
+                return_dict["timelineGroup"] = group.name
+            except Exception as e:
+                print(f"Error: timeline group: {e}")
+
+        return return_dict
+
+    def _join_key(self, row, attr_path: str, token_memo: dict, get_attr):
         """
-            {
-              "name": "run_sql_query",
-              "description": "Executes a naive, SQL-like query on the current Fusion 360 design. Supports standard SQL syntax: SELECT, UPDATE, SET, FROM, WHERE, LIKE, IN, AND, OR, ORDER BY, ASC, DESC, LIMIT, OFFSET, for the following object: [Occurrence, Component, BRepBody, Sketch, Joint, JointOrigin, SketchLine]. Supports . syntax to access sub attributes.Examples:\
-            SELECT name,entityToken FROM Component\
-            Return the name an entityTokens for all components in the design\
-            SELECT appearance.name,entityToken FROM Occurrence WHERE appearance.name LIKE '%Aluminum%'\
-            returns the name of the appearance object for all Occurrence objects whose appearance name contains the string 'Aluminum'",
-              "parameters": {
-                "type": "object",
-                "properties": {
-                  "query_str": {
-                    "type": "string",
-                    "description": "A simplified SQL-like query, e.g. SELECT name, entityToken FROM Occurrence WHERE name LIKE 'screw'"
-                  }
-                },
-                "required": ["query_string"],
-                "returns": {
-                  "type": "string",
-                  "description": "JSON array with the requested attributes of matching objects or an error message"
-                }
-              }
-            }
+        hashable join key, Fusion objects are compared by entity token.
+        attr_path starts with a table alias, the alias alone is the object itself
         """
+        if "." in attr_path:
+            val, errors = get_attr(row, attr_path)
+            if errors:
+                return None
+        else:
+            val = getattr(row, attr_path, None)
 
-        try:
+        if val is None:
+            return None
+        if hasattr(val, "objectType"):
+            # many rows share the same parent object. Fusion returns a new
+            # wrapper on every access, so memo on the entityToken, not id()
+            entity_token = getattr(val, "entityToken", None)
+            if not isinstance(entity_token, str):
+                return self.set_obj_hash(val)
+            memo_key = (val.__class__.__name__, entity_token)
+            token = token_memo.get(memo_key)
+            if token is None:
+                token = self.set_obj_hash(val)
+                token_memo[memo_key] = token
+            return token
+        if isinstance(val, list):
+            return tuple(val)
+        return val
+
+    def _run_sql_join(self, match, profile, explain_only: bool, get_attr) -> tuple:
+        """
+        SELECT ... FROM A a JOIN B b ON a.path = b.path, executed as hash joins:
+        each joined table is indexed by its ON key once, rows probe the index.
+        Rows are namespaces with one attribute per table alias.
+        """
+        doc_objs = self.get_object_dict()
+        errors_dict = {}
+
+        object_type = match.group("objectType")
+        base_alias = match.group("alias") or object_type
+
+        tables = {base_alias: object_type}
+        joins = []
+        for join_match in self.JOIN_CLAUSE_PATTERN.finditer(match.group("joins")):
+            join_type = join_match.group("joinType")
+            join_alias = join_match.group("joinAlias") or join_type
+            if join_alias in tables:
+                return f"Error: table alias '{join_alias}' is used more than once, give each table a unique alias", []
+
+            on_left, on_right = join_match.group("onLeft"), join_match.group("onRight")
+            # one side of ON references the joined table, the other an earlier table
+            if on_right.split(".")[0] == join_alias:
+                probe_path, build_path = on_left, on_right
+            elif on_left.split(".")[0] == join_alias:
+                probe_path, build_path = on_right, on_left
+            else:
+                return f"Error: ON condition '{on_left} = {on_right}' does not reference '{join_alias}'", []
+
+            if probe_path.split(".")[0] not in tables:
+                return f"Error: ON condition '{on_left} = {on_right}' references unknown table '{probe_path.split('.')[0]}', tables: {list(tables.keys())}", []
+
+            tables[join_alias] = join_type
+            joins.append({
+                "kind": (join_match.group("joinKind") or "INNER").upper(),
+                "objectType": join_type,
+                "alias": join_alias,
+                "probePath": probe_path,
+                "buildPath": build_path,
+            })
+
+        for table_type in tables.values():
+            if doc_objs.get(table_type, None) is None:
+                return f"Error: '{table_type}' is not a valid object type, valid objects are: {list(doc_objs.keys())} ", []
+
+        def qualify(attr_path):
+            # paths without a table alias refer to the FROM table
+            if attr_path.split(".")[0] in tables:
+                return attr_path
+            return f"{base_alias}.{attr_path}"
+
+        conditions = self.parse_where_conditions(match.group("where"))
+        for cond in conditions:
+            cond["attrName"] = qualify(cond["attrName"])
+
+        # with only AND conditions, single table conditions filter the FROM
+        # and INNER JOIN tables before joining
+        pushed = {}
+        if all(cond.get("logicOpBefore") in (None, "AND") for cond in conditions):
+            inner_aliases = {base_alias} | {j["alias"] for j in joins if j["kind"] == "INNER"}
+            remaining = []
+            for cond in conditions:
+                cond_alias = cond["attrName"].split(".")[0]
+                if cond_alias in inner_aliases:
+                    pushed.setdefault(cond_alias, []).append(cond)
+                else:
+                    remaining.append(cond)
+            conditions = remaining
+
+        profile.plan = {
+            "statementType": "SELECT",
+            "objectType": object_type,
+            "alias": base_alias,
+            "access": "scan",
+            "joins": [
+                {"method": "hash join", "kind": j["kind"], "objectType": j["objectType"], "alias": j["alias"], "build": j["buildPath"], "probe": j["probePath"]}
+                for j in joins
+            ],
+            "pushedConditions": {alias: [f"{c['attrName']} {c['operator']} {c['value']}" for c in conds] for alias, conds in pushed.items()},
+            "conditions": [f"{c['logicOpBefore'] or ''} {c['attrName']} {c['operator']} {c['value']}".strip() for c in conditions],
+            "orderBy": f"{match.group('orderAttr')} {match.group('orderDir') or 'ASC'}" if match.group("orderAttr") else None,
+            "limit": int(match.group("limit")) if match.group("limit") else None,
+            "offset": int(match.group("offset")) if match.group("offset") else None,
+        }
+        if explain_only:
+            return {"statementType": "EXPLAIN", "plan": profile.plan}, []
+
+        def table_objects(alias, table_type):
+            objs = doc_objs[table_type]
+            table_conditions = pushed.get(alias)
+            if not table_conditions:
+                return list(objs)
+
+            nonlocal errors_dict
+            stage = profile.start_stage(f"filter {alias}", rowsIn=objs.count)
+            filtered = []
+            for o in objs:
+                obj_match, errors = self.match_object_against_conditions(types.SimpleNamespace(**{alias: o}), table_conditions, get_attr)
+                if errors != None:
+                    errors_dict, error_hash = self.get_error_hash(errors_dict, errors)
+                    continue
+                if obj_match == True:
+                    filtered.append(o)
+            profile.end_stage(stage, rowsOut=len(filtered))
+            return filtered
+
+        token_memo = {}
+        stage = profile.start_stage("enumerate", access="scan")
+        base_objs = table_objects(base_alias, object_type)
+        rows = [types.SimpleNamespace(**{base_alias: o}) for o in base_objs]
+        profile.end_stage(stage, rows=len(rows))
+
+        for join in joins:
+            # build
+            index = {}
+            join_alias = join["alias"]
+            build_objs = table_objects(join_alias, join["objectType"])
+            stage = profile.start_stage(f"hash join {join_alias}", buildRows=len(build_objs), probeRows=len(rows))
+            for o in build_objs:
+                key = self._join_key(types.SimpleNamespace(**{join_alias: o}), join["buildPath"], token_memo, get_attr)
+                if key is not None:
+                    index.setdefault(key, []).append(o)
+
+            # probe
+            joined_rows = []
+            for row in rows:
+                key = self._join_key(row, join["probePath"], token_memo, get_attr)
+                matches = index.get(key, []) if key is not None else []
+                for o in matches:
+                    joined_rows.append(types.SimpleNamespace(**vars(row), **{join_alias: o}))
+                if not matches and join["kind"] == "LEFT":
+                    joined_rows.append(types.SimpleNamespace(**vars(row), **{join_alias: None}))
+            rows = joined_rows
+            profile.end_stage(stage, rowsOut=len(rows))
+
+        stage = profile.start_stage("filter", rowsIn=len(rows))
+        filtered_rows = []
+        for row in rows:
+            row_match, errors = self.match_object_against_conditions(row, conditions, get_attr)
+            if errors != None:
+                # e.g attribute of a LEFT JOIN table without a match
+                errors_dict, error_hash = self.get_error_hash(errors_dict, errors)
+                continue
+            if row_match == True:
+                filtered_rows.append(row)
+        profile.end_stage(stage, rowsOut=len(filtered_rows))
+
+        order_attr = match.group("orderAttr")
+        if order_attr:
+            stage = profile.start_stage("sort", rowsIn=len(filtered_rows))
+            order_attr = qualify(order_attr)
+            sortable = []
+            for row in filtered_rows:
+                sort_val, errors = get_attr(row, order_attr)
+                if errors or sort_val is None:
+                    continue
+                sortable.append((sort_val, row))
+            reverse = (match.group("orderDir") or "").upper() == "DESC"
+            filtered_rows = [row for _, row in sorted(sortable, key=lambda item: item[0], reverse=reverse)]
+            profile.end_stage(stage)
+
+        offset_val = int(match.group("offset")) if match.group("offset") else 0
+        filtered_rows = filtered_rows[offset_val:]
+        if match.group("limit"):
+            filtered_rows = filtered_rows[:int(match.group("limit"))]
+
+        attribute_list = [a.strip() for a in match.group("attributes").split(",")]
+        stage = profile.start_stage("project", rowsIn=len(filtered_rows), columns=len(attribute_list))
+        results = []
+        for row in filtered_rows:
+            row_data = {}
+            for attr in attribute_list:
+                attr_path = qualify(attr)
+                # LEFT JOIN table without a match
+                if getattr(row, attr_path.split(".")[0]) is None:
+                    row_data[attr] = None
+                    continue
+
+                val, errors = get_attr(row, attr_path)
+                if errors:
+                    errors_dict, val = self.get_error_hash(errors_dict, errors)
+                if hasattr(val, "objectType") or callable(val):
+                    val = str(val)
+                row_data[attr] = val
+            results.append(row_data)
+        profile.end_stage(stage)
+
+        return_dict = {
+            "statementType": "SELECT",
+            "objectType": object_type,
+            "joins": [{"kind": j["kind"], "objectType": j["objectType"], "alias": j["alias"]} for j in joins],
+            "count": len(results),
+            "results": results,
+        }
+        if len(errors_dict) != 0:
+            return_dict["errors"] = errors_dict
+
+        # objects of the FROM table, for @prev
+        matched = list({id(getattr(row, base_alias)): getattr(row, base_alias) for row in filtered_rows}.values())
+
+        return return_dict, matched
+
+    def _numeric_columns(self, object_type: str, all_objs):
+        """float column snapshot for an object type, dropped when the design or index changes"""
+        key = (ToolCollection.design_generation, self.index_generation)
+        if key != self.column_snapshot_key:
+            self.column_snapshots = {}
+            self.column_snapshot_key = key
+
+        # a changed object list that the generation counters missed, e.g after a reload
+        columns = self.column_snapshots.get(object_type)
+        if columns is None or not columns.matches(all_objs):
+            columns = columnar.NumericColumns(list(all_objs), all_objs)
+            self.column_snapshots[object_type] = columns
+        return columns
+
+    def _run_sql_statement(self, query_str: str, undo_log: list = None) -> tuple:
+        """
+        run a single SELECT/UPDATE statement, returns (result dict or error
+        string, matched objects). EXPLAIN returns the plan without running the
+        statement, EXPLAIN ANALYZE adds the profile to the result.
+        """
+        analyze = False
+        explain_only = False
+        explain_match = self.EXPLAIN_PATTERN.match(query_str or "")
+        if explain_match:
+            analyze = explain_match.group("analyze") is not None
+            explain_only = not analyze
+            query_str = query_str[explain_match.end():]
 
+        profile = tracing.QueryProfile(enabled=analyze or self.profile_queries)
+        # attribute reads timed per path while profiling
+        get_attr = profile.timed(self.get_sub_attr)
 
+        result, objs = self._execute_sql_statement(query_str, undo_log, profile, explain_only, get_attr)
 
+        if profile.enabled:
+            self.last_query_profile = profile
+
+        if analyze and isinstance(result, dict):
+            stage = profile.start_stage("serialize")
+            n_chars = len(json.dumps(result))
+            profile.end_stage(stage, chars=n_chars)
+            result["profile"] = profile.summary()
+
+        return result, objs
+
+    def _execute_sql_statement(self, query_str: str, undo_log: list, profile, explain_only: bool, get_attr) -> tuple:
+        try:
             if not query_str or not isinstance(query_str, str):
-                return json.dumps({"error": "query_str must be a non-empty string"})
+                return {"error": "query_str must be a non-empty string"}, []
+
+            join_match = self.SQL_JOIN_PATTERN.match(query_str.strip())
+            if join_match:
+                return self._run_sql_join(join_match, profile, explain_only, get_attr)
 
             # 1) Match against the big pattern
             match = self.SQL_PATTERN.match(query_str.strip())
             if not match:
-                return json.dumps({"error": "Invalid or unsupported SQL query"})
+                return {"error": "Invalid or unsupported SQL query"}, []
 
             # Distinguish SELECT vs. UPDATE
             # SELECT target object
@@ -993,7 +1340,25 @@ class SQL(ToolCollection):
             # parse conditions in update_where_str => a list of condition dict
             conditions = self.parse_where_conditions(where_str)
 
+            # numeric WHERE and ORDER BY evaluated on float columns
+            use_columns = self.use_numeric_columns
+            vector_where = use_columns and bool(conditions) and all(columnar.is_numeric_condition(c) for c in conditions)
+
+            profile.plan = {
+                "statementType": statement_type,
+                "objectType": object_type,
+                "access": "scan",
+                "numericColumns": [c["attrName"] for c in conditions] if vector_where else [],
+                "conditions": [f"{c['logicOpBefore'] or ''} {c['attrName']} {c['operator']} {c['value']}".strip() for c in conditions],
+                "orderBy": f"{order_attr} {order_dir or 'ASC'}" if order_attr else None,
+                "limit": limit_val,
+                "offset": offset_val,
+            }
+            if explain_only:
+                return {"statementType": "EXPLAIN", "plan": profile.plan}, []
+
             # gather objects of type update_object_type
+            stage = profile.start_stage("enumerate", access="scan")
 
             # TODO object dict created in __init__, needs to update during runtime
             #doc_objs = self.document_objects()
@@ -1009,23 +1374,61 @@ class SQL(ToolCollection):
             errors_dict = {}
 
             if all_objs is None:
-                return f"Error: '{object_type}' is not a valid object type, valid objects are: {list(doc_objs.keys())} "
+                return f"Error: '{object_type}' is not a valid object type, valid objects are: {list(doc_objs.keys())} ", []
             # handle no objects
             if all_objs.count == 0:
-                return f"Error: No '{object_type}' objects in the current design"
+                return f"Error: No '{object_type}' objects in the current design", []
+
+            candidates = all_objs
+            n_candidates = all_objs.count
+            profile.end_stage(stage, rows=n_candidates)
 
             # check ORDER BY attribute is valid
             if order_attr != None:
-                _, errors = self.get_sub_attr(all_objs.item(0), order_attr)
+                _, errors = get_attr(all_objs.item(0), order_attr)
                 # if ORDER BY fields fails return objects un-ordered
                 if errors:
                     error_dict, error_hash = self.get_error_hash(errors_dict, errors)
                     order_attr = None
 
+            where_mask = None
+            sort_column = None
+            if use_columns:
+                stage = profile.start_stage("columns")
+                columns = self._numeric_columns(object_type, all_objs)
+                if vector_where:
+                    where_mask = columns.where_mask(conditions, get_attr)
+                if order_attr != None:
+                    # a full column read is only worth it when every row may be sorted
+                    if where_mask is not None or not conditions:
+                        sort_column = columns.column(order_attr, get_attr)
+                    else:
+                        sort_column = columns.captured(order_attr)
+                profile.end_stage(stage, vectorWhere=where_mask is not None, sortColumn=sort_column is not None)
+
             # filter objects them
+            stage = profile.start_stage("filter", rowsIn=n_candidates)
             filtered_objs = []
-            for index, o in enumerate(all_objs):
-                match, errors = self.match_object_against_conditions(o, conditions)
+            presorted = False
+            windowed = False
+            if where_mask is not None:
+                indexes = columnar.selected_indexes(where_mask)
+                if order_attr != None and sort_column is None:
+                    # ORDER BY attribute is not numeric, sort values are read row by row below
+                    candidates = [columns.objs[i] for i in indexes]
+                else:
+                    if sort_column is not None:
+                        indexes = columnar.sort_indexes(indexes, sort_column, reverse=order_dir == "DESC")
+                        presorted = True
+                    # only rows inside OFFSET/LIMIT are materialized
+                    start = offset_val or 0
+                    indexes = indexes[start:start + limit_val] if limit_val else indexes[start:]
+                    windowed = True
+                    filtered_objs = [{"obj": columns.objs[i]} for i in indexes]
+                    candidates = []
+
+            for index, o in enumerate(candidates):
+                match, errors = self.match_object_against_conditions(o, conditions, get_attr)
 
                 # TODO an object attribute whose usual type is another fusion object may be None
                 # should return a succinct error
@@ -1039,9 +1442,12 @@ class SQL(ToolCollection):
                     obj_dict = {
                         'obj': o,
                     }
-                    if order_attr != None:
+                    if sort_column is not None:
+                        obj_dict["sort_val"] = sort_column[index]
+
+                    elif order_attr != None:
 
-                        sort_val, errors = self.get_sub_attr(o, order_attr)
+                        sort_val, errors = get_attr(o, order_attr)
 
                         # if no value for order by field leave blank
                         if sort_val is None:
@@ -1051,9 +1457,11 @@ class SQL(ToolCollection):
 
                     filtered_objs.append(obj_dict)
 
+            profile.end_stage(stage, rowsOut=len(filtered_objs))
 
             # sort
-            if order_attr != None:
+            if order_attr != None and not presorted:
+                stage = profile.start_stage("sort", rowsIn=len(filtered_objs))
                 reverse = False
 
                 if order_dir == "DESC":
@@ -1064,17 +1472,18 @@ class SQL(ToolCollection):
                 #print(order_attr)
                 #print(filtered_objs)
                 filtered_objs = sorted(filtered_objs, key=lambda item: item["sort_val"], reverse=reverse)
+                profile.end_stage(stage)
 
             # convert back to list of objects
             filtered_objs = [i["obj"] for i in filtered_objs]
 
             # apply offset/limit
-            if offset_val:
+            if offset_val and not windowed:
                 if offset_val < len(filtered_objs):
                     filtered_objs = filtered_objs[offset_val:]
                 else:
                     filtered_objs = []
-            if limit_val and limit_val < len(filtered_objs):
+            if limit_val and not windowed and limit_val < len(filtered_objs):
                 filtered_objs = filtered_objs[:limit_val]
 
 
@@ -1086,23 +1495,22 @@ class SQL(ToolCollection):
                 assignments = self.parse_set_clause(set_clause_str)
 
                 if "error" in assignments:
-                    error_dict, error_hash = self.get_error_hash(errors_dict, assignments)
-                    #return json.dumps({"error": f"Error in SET clause: {assignments['error']}"})
+                    return {"error": f"Error in SET clause: {assignments['error']}"}, []
 
                 # 6) apply assignments
-                updated_count = 0
-                assignment_results = {}
-                for obj in filtered_objs:
-                    # we apply the set of assignments
-                    update_result = self.apply_assignments(obj, assignments)
-                    if update_result["updated"]:
-                        updated_count += 1
-                    assignment_results[self.set_obj_hash(obj)] = update_result["details"]
+                stage = profile.start_stage("update", rowsIn=len(filtered_objs))
+                update_result = self.apply_assignments(filtered_objs, assignments, errors_dict, undo_log, get_attr)
+                profile.end_stage(stage, rowsOut=update_result["updatedCount"])
+                if update_result["updatedCount"]:
+                    ToolCollection.design_generation += 1
 
                 return_dict.update( {
                     "foundCount": len(filtered_objs),
-                    "updatedCount": updated_count,
+                    "updatedCount": update_result["updatedCount"],
                 })
+                if len(filtered_objs) > self.MAX_UPDATE_DETAILS:
+                    return_dict["detailsShown"] = self.MAX_UPDATE_DETAILS
+                return_dict["details"] = update_result["sampleDetails"]
 
 
             else:
@@ -1116,7 +1524,7 @@ class SQL(ToolCollection):
                         break
                         #return json.dumps(return_dict)
 
-                    val, errors = self.get_sub_attr(filtered_objs[0], attr_name)
+                    val, errors = get_attr(filtered_objs[0], attr_name)
                     if errors != None:
 
                         error_dict, error_hash = self.get_error_hash(errors_dict, errors)
@@ -1127,12 +1535,13 @@ class SQL(ToolCollection):
 
                 # build result
                 # for each object, we gather the requested attributes
+                stage = profile.start_stage("project", rowsIn=len(filtered_objs), columns=len(attribute_list))
                 results = []
                 for index, obj in enumerate(filtered_objs):
                     row_data = {}
                     for attr in attribute_list:
 
-                        val, errors = self.get_sub_attr(obj, attr)
+                        val, errors = get_attr(obj, attr)
                         if errors:
                             error_dict, error_hash = self.get_error_hash(errors_dict, errors)
                             val = error_hash
@@ -1147,6 +1556,8 @@ class SQL(ToolCollection):
 
                     results.append(row_data)
 
+                profile.end_stage(stage)
+
                 return_dict.update({
                     "count": len(results),
                     "results": results
@@ -1156,8 +1567,88 @@ class SQL(ToolCollection):
             if len(errors_dict) != 0:
                 return_dict["errors"] = errors_dict
 
-            return json.dumps(return_dict)
+            return return_dict, filtered_objs
+
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc(), []
+
+
+
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def run_sql_query(self, query_str: str = "SELECT name,entityToken FROM Occurrence WHERE name LIKE 'screw'", transaction: bool = False) -> str:
+        """
+            {
+              "name": "run_sql_query",
+              "description": "Executes a naive, SQL-like query on the current Fusion 360 design. Supports standard SQL syntax: SELECT, UPDATE, SET, FROM, WHERE, LIKE, IN, AND, OR, ORDER BY, ASC, DESC, LIMIT, OFFSET, for the following object: [Occurrence, Component, BRepBody, Sketch, Joint, JointOrigin, SketchLine]. Supports . syntax to access sub attributes.Examples:\
+            SELECT name,entityToken FROM Component\
+            Return the name an entityTokens for all components in the design\
+            SELECT appearance.name,entityToken FROM Occurrence WHERE appearance.name LIKE '%Aluminum%'\
+            returns the name of the appearance object for all Occurrence objects whose appearance name contains the string 'Aluminum'\
+            Several statements separated by ';' run in one call, later statements can reference the objects matched by an earlier statement with @prev (previous statement) or @N (statement N, starting at 1), e.g:\
+            SELECT name,entityToken FROM Occurrence WHERE name LIKE '%bolt%'; UPDATE Occurrence SET isLightBulbOn=false WHERE entityToken IN (@prev)\
+            SELECT statements can JOIN object types ([INNER|LEFT] JOIN <type> <alias> ON <alias.attribute> = <alias.attribute>), an alias alone is the object itself, columns are prefixed with the table alias, e.g:\
+            SELECT b.name,b.entityToken,o.name FROM BRepBody b JOIN Occurrence o ON b.assemblyContext = o WHERE o.component.name LIKE '%gear%' AND o.appearance.name LIKE '%Steel%'\
+            Prefix a statement with EXPLAIN to get its plan without running it, or EXPLAIN ANALYZE to run it and include rows and time per stage and the slowest attribute paths.",
+              "parameters": {
+                "type": "object",
+                "properties": {
+                  "query_str": {
+                    "type": "string",
+                    "description": "A simplified SQL-like query, e.g. SELECT name, entityToken FROM Occurrence WHERE name LIKE 'screw'. Multiple statements are separated by ';'"
+                  },
+                  "transaction": {
+                    "type": "boolean",
+                    "description": "Only used with multiple statements. When true, the batch stops at the first failed statement and attribute values set by earlier UPDATE statements are restored."
+                  }
+                },
+                "required": ["query_string"],
+                "returns": {
+                  "type": "string",
+                  "description": "JSON array with the requested attributes of matching objects or an error message. For multiple statements, a results list with one entry per statement"
+                }
+              }
+            }
+        """
+
+        try:
+            if not query_str or not isinstance(query_str, str):
+                return json.dumps({"error": "query_str must be a non-empty string"})
+
+            # split would cut the statement inside the open string
+            quote_start = self._unterminated_string(query_str)
+            if quote_start is not None:
+                return json.dumps({"error": f"unterminated string literal starting at character {quote_start}: {query_str[quote_start:quote_start + 40]}"})
+
+            statements = self._split_sql_statements(query_str)
 
+            if len(statements) > 1:
+                return json.dumps(self._run_sql_batch(statements, transaction))
+
+            statement = statements[0] if statements else query_str
+
+            # identical SELECT with no design or index change since, no Fusion calls
+            cache_key = self._query_cache_key(statement)
+            if cache_key is not None:
+                cached = self.query_cache.get(cache_key)
+                if cached is not None:
+                    self.query_cache.move_to_end(cache_key)
+                    self.query_cache_stats["hits"] += 1
+                    return cached
+                self.query_cache_stats["misses"] += 1
+
+            result, _ = self._run_sql_statement(statement)
+            if isinstance(result, str):
+                return result
+
+            result_json = json.dumps(result)
+            # the object index may have been reloaded while running
+            cache_key = self._query_cache_key(statement)
+            if cache_key is not None and "error" not in result:
+                self._cache_query_result(cache_key, result_json)
+
+            return result_json
 
         except:
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
@@ -1169,6 +1660,7 @@ class GetStateData(ToolCollection):
     """
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def get_fusion_classes_detail(self, class_names: list = ["Sketch"]) -> str:
         """
         {
@@ -1195,169 +1687,7 @@ class GetStateData(ToolCollection):
             if not class_names or not isinstance(class_names, list):
                 return json.dumps({"error": "class_names must be a non-empty list of strings"})
 
-            def import_class_from_path(path: str):
-                """
-                Attempt to import something like 'adsk.fusion.Sketch'.
-                Returns (cls, None) if successful, or (None, errorString) if failed.
-                """
-                tokens = path.split(".")
-                if len(tokens) < 2:
-                    return None, f"Invalid class path: '{path}'."
-                mod_str = ".".join(tokens[:-1])
-                cls_str = tokens[-1]
-                try:
-                    mod = importlib.import_module(mod_str)
-                except ModuleNotFoundError:
-                    return None, f"Could not import module '{mod_str}'."
-                cls = getattr(mod, cls_str, None)
-                if cls is None:
-                    return None, f"Class '{cls_str}' not found in '{mod_str}'."
-                return cls, None
-
-            exclude_list = ["cast", "classType", "__init__", "__del__"]  # skip internal
-
-            def describe_method(py_callable):
-                """
-                Attempt to parse signature with inspect.signature,
-                then return { params: [...], doc: '' }.
-                """
-                # Attempt signature
-                try:
-                    sig = inspect.signature(py_callable)
-                except ValueError:
-                    sig = None
-
-                params_info = []
-                if sig:
-                    for param_name, param in sig.parameters.items():
-                        if param_name == "self":
-                            continue
-
-                        default_val = None if param.default is param.empty else param.default
-                        annotation_str = None if param.annotation is param.empty else str(param.annotation)
-                        if isinstance(annotation_str, str):
-                            annotation_str = annotation_str.replace("\n", " ")
-
-                        params_info.append({
-                            "name": param_name,
-                            "default": default_val,
-                            "paramType": annotation_str
-                        })
-
-                doc_str = inspect.getdoc(py_callable) or ""
-
-
-                return {
-                    "params": params_info,
-                    "doc": doc_str.replace("\n", " ")
-                }
-
-            def gather_class_info(cls):
-                """
-                Gather info on methods (callables) and attributes (non-callable) from the class.
-                Returns a dict with 'methods' and 'attributes', including 'expectedObjectType' for attributes if possible.
-                """
-                cls_info = {
-                    "methods": {},
-                    "attributes": {}
-                }
-
-                # 1) Gather methods
-                #   isfunction => pure Python function
-                methods_found = inspect.getmembers(cls, predicate=inspect.isfunction)
-                #   ismethoddescriptor => some C++ extension or property
-                descriptors = inspect.getmembers(cls, predicate=inspect.ismethoddescriptor)
-
-                combined_method_members = dict(methods_found)
-                for name, desc in descriptors:
-                    if name not in combined_method_members:
-                        combined_method_members[name] = desc
-
-                for name, func_obj in combined_method_members.items():
-                    if name[0] == "_" or name in exclude_list:
-                        continue
-                    cls_info["methods"][name] = describe_method(func_obj)
-
-                # 2) Gather all members, separate out attributes
-                #   We'll skip private, skip known methods
-                all_members = inspect.getmembers(cls)
-                known_methods = set(combined_method_members.keys())
-
-                for name, member_obj in all_members:
-                    if name[0] == "_" or name in exclude_list:
-                        continue
-                    if name in known_methods:
-                        continue  # we've described it as a method
-
-                    # If not callable => treat as attribute
-                    if not callable(member_obj):
-                        attr_data = {
-                            "doc": inspect.getdoc(member_obj).replace("\n", " ") or "",
-                            "objectType": None  # We'll fill this below
-                        }
-
-                        # Attempt to see if this is a property descriptor
-                        # If so, we might be able to get a return annotation from fget
-                        if inspect.isdatadescriptor(member_obj):
-                            # Some descriptors may have .fget
-                            fget = getattr(member_obj, 'fget', None)
-                            if fget and callable(fget):
-                                try:
-                                    fget_sig = inspect.signature(fget)
-                                    # If there's a return annotation
-                                    if fget_sig.return_annotation is not inspect.Signature.empty:
-
-                                        if ":" in fget_sig.return_annotation:
-                                            object_type_str = fget_sig.return_annotation.split(":")[-1].strip(">").strip()
-                                        else:
-                                            object_type_str = fget_sig.return_annotation
-
-
-                                        attr_data["objectType"] = object_type_str
-                                except ValueError:
-                                    pass
-
-                        # If we still don't have expectedObjectType, fallback to type
-                        if not attr_data["objectType"]:
-                            attr_data["objectType"] = member_obj.__class__.__name__
-
-                        cls_info["attributes"][name] = attr_data
-
-                return cls_info
-
-            results = {}
-
-            for class_name in class_names:
-                # If there's a dot, assume it's a full path (like adsk.fusion.Sketch).
-                # Otherwise, try adsk.fusion.class_name, then adsk.core.class_name
-                if "." in class_name:
-                    cls, err = import_class_from_path(class_name)
-                    if err:
-                        results[class_name] = {"error": err}
-                        continue
-                    results[class_name] = gather_class_info(cls)
-                else:
-                    # Try adsk.fusion.class_name
-                    fusion_path = f"adsk.fusion.{class_name}"
-                    cls, err = import_class_from_path(fusion_path)
-                    if not err and cls:
-                        data = gather_class_info(cls)
-                        data["resolvedPath"] = fusion_path
-                        results[class_name] = data
-                        continue
-
-                    # Then try adsk.core.class_name
-                    core_path = f"adsk.core.{class_name}"
-                    cls2, err2 = import_class_from_path(core_path)
-                    if not err2 and cls2:
-                        data2 = gather_class_info(cls2)
-                        data2["resolvedPath"] = core_path
-                        results[class_name] = data2
-                        continue
-
-                    # If both fail, store an error
-                    results[class_name] = {"error": f"Could not find class '{class_name}' in adsk.fusion or adsk.core."}
-
+            results = class_introspector().describe_many(class_names, detail=True)
             return json.dumps(results)
 
         except Exception as e:
@@ -1365,19 +1695,37 @@ class GetStateData(ToolCollection):
 
 
     @ToolCollection.tool_call
-    def list_document_structure(self) -> str:
+    @ToolCollection.read_only
+    def list_document_structure(self, max_depth: int = -1, root_entity_token: str = "", include: list = ["bodies", "sketches", "joints", "jointOrigins"], compact: bool = True) -> str:
         """
         {
             "name": "list_document_structure",
-            "description": "Recursively searches the entire Fusion 360 design, returning a JSON structure of occurrences, bodies, sketches, joints, and joint origins in the document. Each object includes its name and entity token (if available).",
+            "description": "Recursively searches the Fusion 360 design, returning a JSON structure of occurrences, bodies, sketches, joints, and joint origins in the document. Each object includes its name and entity token (if available). In compact form, the bodies/sketches/joints/joint origins of each component are listed once in a components table keyed by componentToken, and occurrences reference their component by componentToken. For large assemblies, limit the output with max_depth, root_entity_token and include.",
             "parameters": {
                 "type": "object",
                 "properties": {
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Number of occurrence levels to list, top level occurrences are level 1. Occurrences at the last level include a childCount instead of children. -1 lists all levels."
+                    },
+                    "root_entity_token": {
+                        "type": "string",
+                        "description": "Optional entity token of an occurrence or component, only the structure below this object is returned. Empty string returns the whole design."
+                    },
+                    "include": {
+                        "type": "array",
+                        "items": { "type": "string", "enum": ["bodies", "sketches", "joints", "jointOrigins"] },
+                        "description": "Object kinds listed for each occurrence, occurrences are always listed."
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "true lists each component's contents once in a 'components' table, false repeats the contents in every occurrence."
+                    }
                 },
                 "required": [],
                 "returns": {
                     "type": "string",
-                    "description": "A JSON representation of the entire document's structure, including entity tokens if available."
+                    "description": "A JSON representation of the document's structure, including entity tokens if available."
                 }
 
             }
@@ -1396,138 +1744,172 @@ class GetStateData(ToolCollection):
             design = adsk.fusion.Design.cast(product)
             root_comp = design.rootComponent
 
-            # Helper function to retrieve an entity token (or None if not found)
-            def get_token(obj) -> str:
-                return self.set_obj_hash(obj)  # or your equivalent method
-
-
-            def gather_occurrence_structure(occ: adsk.fusion.Occurrence, level=0) -> dict:
-                """
-                Recursively gather info about a single occurrence, including
-                all bodies, sketches, joints, joint origins, and child occurrences.
-                """
-                comp = occ.component
-
-                # 1) Bodies
-                bodies_info = []
-                for b in comp.bRepBodies:
-                    bodies_info.append({
-                        "name": b.name,
-                        "token": get_token(b)
-                    })
-
-                # 2) Sketches
-                sketches_info = []
-                for sk in comp.sketches:
-                    sketches_info.append({
-                        "name": sk.name,
-                        "token": get_token(sk)
-                    })
-
-                # 3) Joints
-                # Joints can appear in various places (often root). We'll assume comp.joints are relevant here.
-                joints_info = []
-                for j in comp.joints:
-                    # j.name is often blank, so you may store j.occurrenceOne / j.occurrenceTwo, etc.
-                    joints_info.append({
-                        "name": j.name,
-                        "token": get_token(j)
-                    })
-
-                # 4) Joint Origins
-                joint_origins_info = []
-                for jo in comp.jointOrigins:
-                    joint_origins_info.append({
-                        "name": jo.name,
-                        "token": get_token(jo)
-                    })
-
-                # 5) Child occurrences
-                children_info = []
-                for child_occ in occ.childOccurrences:
-                    children_info.append(gather_occurrence_structure(child_occ, level-1))
-
-
-                # Build this occurrence's node in the tree
-                return_dict =  {
-                    "occurrenceName": occ.name,
-                    "occurrenceToken": get_token(occ),
-                    #"componentName": comp.name,
-                    "componentToken": get_token(comp),
-                    "bodies": bodies_info,
-                    "sketches": sketches_info,
-                    "joints": joints_info,
-                    "jointOrigins": joint_origins_info,
-                    "children": children_info
-                }
-
+            invalid_kinds = [k for k in include if k not in self.STRUCTURE_KINDS]
+            if len(invalid_kinds) != 0:
+                return f"Error: include has invalid values {invalid_kinds}, valid values are {list(self.STRUCTURE_KINDS.keys())}"
 
-                exclude_list = []
-                for k,v in return_dict.items():
+            max_depth = int(max_depth)
 
-                    if len(v) == 0:
-                        exclude_list.append(k)
+            if root_entity_token:
+                root_obj = self.get_hash_obj(root_entity_token)
+                if root_obj is None:
+                    return f"Error: no object found for entity token '{root_entity_token}'"
 
+                if isinstance(root_obj, adsk.fusion.Occurrence):
+                    pieces = self._iter_occurrence_root(root_obj, max_depth, include, compact)
+                elif isinstance(root_obj, adsk.fusion.Component):
+                    pieces = self._iter_component_structure(root_obj, max_depth, include, compact)
+                else:
+                    return f"Error: root_entity_token must reference an Occurrence or Component, not {root_obj.__class__.__name__}"
+            else:
+                pieces = self._iter_component_structure(root_comp, max_depth, include, compact)
 
-                for k in exclude_list:
-                    return_dict.pop(k)
-
-                return return_dict
+            # written incrementally, sent to the server in chunks
+            return json_stream.ToolResultStream(pieces)
 
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
+    # list_document_structure object kinds, key: component collection attribute
+    STRUCTURE_KINDS = {
+        "bodies": "bRepBodies",
+        "sketches": "sketches",
+        "joints": "joints",
+        "jointOrigins": "jointOrigins",
+    }
 
-            # Gather top-level occurrences from the root component
-            occurrences_info = []
-            for occ in root_comp.occurrences:
-                occurrences_info.append(gather_occurrence_structure(occ, 0))
+    def _iter_component_structure(self, comp, max_depth: int, include: list, compact: bool):
+        """
+        JSON fragments for a component and its occurrence tree
+        """
+        root_keys = {
+            "bodies": "rootBodies",
+            "sketches": "rootSketches",
+            "joints": "rootJoints",
+            "jointOrigins": "rootJointOrigins",
+        }
 
-            # Additionally, gather bodies/sketches/joints/joint origins directly in root (if any)
-            root_bodies = []
-            for b in root_comp.bRepBodies:
-                root_bodies.append({
-                    "name": b.name,
-                    "entityToken": get_token(b)
-                })
+        yield '{"rootComponentName": ' + json.dumps(comp.name)
+        yield ', "rootComponentToken": ' + json.dumps(self.set_obj_hash(comp))
 
-            root_sketches = []
-            for sk in root_comp.sketches:
-                root_sketches.append({
-                    "name": sk.name,
-                    "entityToken": get_token(sk)
-                })
+        # bodies/sketches/joints/joint origins directly in the component
+        for kind, attr_name in self.STRUCTURE_KINDS.items():
+            if kind not in include:
+                continue
+            items = [
+                {"name": ent.name, "entityToken": self.set_obj_hash(ent)}
+                for ent in getattr(comp, attr_name)
+            ]
+            yield f', "{root_keys[kind]}": ' + json.dumps(items)
+
+        # component contents by component token, built once per call
+        component_memo = {}
+
+        occurrences = comp.occurrences
+        if max_depth == 0:
+            yield f', "occurrenceCount": {occurrences.count}'
+        else:
+            yield ', "occurrences": '
+            yield from json_stream.json_array(
+                self._iter_occurrence_structure(occ, 1, max_depth, include, component_memo, compact)
+                for occ in occurrences
+            )
+
+        if compact == True:
+            yield from self._iter_component_table(component_memo)
+
+        yield "}"
+
+    def _iter_occurrence_root(self, occ, max_depth: int, include: list, compact: bool):
+        """JSON fragments for a subtree starting at an occurrence"""
+        component_memo = {}
+
+        yield '{"occurrences": '
+        yield from json_stream.json_array([
+            self._iter_occurrence_structure(occ, 1, max_depth, include, component_memo, compact)
+        ])
+        if compact == True:
+            yield from self._iter_component_table(component_memo)
+        yield "}"
+
+    def _iter_component_table(self, component_memo: dict):
+        """components table for the compact form, one entry per referenced component"""
+        yield ', "components": {'
+        sep = ""
+        for comp_token, (comp_name, contents) in component_memo.items():
+            entry = f'{sep}{json.dumps(comp_token)}: {{"componentName": {json.dumps(comp_name)}'
+            for kind, items_json in contents:
+                entry += f', "{kind}": {items_json}'
+            yield entry + "}"
+            sep = ", "
+        yield "}"
+
+    def _component_contents(self, comp, comp_token: str, include: list, component_memo: dict) -> list:
+        """
+        (kind, JSON list) pairs for the non empty kinds in a component, the
+        component collections are enumerated once per call, occurrences that
+        share a component reuse the result
+        """
+        memo_entry = component_memo.get(comp_token)
+        if memo_entry is not None:
+            return memo_entry[1]
+
+        # Joints can appear in various places (often root). We'll assume comp.joints are relevant here.
+        contents = []
+        for kind, attr_name in self.STRUCTURE_KINDS.items():
+            if kind not in include:
+                continue
+            items = [
+                {"name": ent.name, "token": self.set_obj_hash(ent)}
+                for ent in getattr(comp, attr_name)
+            ]
+            if items:
+                contents.append((kind, json.dumps(items)))
 
-            root_joints = []
-            for j in root_comp.joints:
-                root_joints.append({
-                    "name": j.name,
-                    "entityToken": get_token(j)
-                })
+        component_memo[comp_token] = (comp.name, contents)
+        return contents
 
-            root_joint_origins = []
-            for jo in root_comp.jointOrigins:
-                root_joint_origins.append({
-                    "name": jo.name,
-                    "entityToken": get_token(jo)
-                })
+    def _iter_occurrence_structure(self, occ, depth: int, max_depth: int, include: list, component_memo: dict, compact: bool):
+        """
+        JSON fragments for a single occurrence, including bodies, sketches,
+        joints, joint origins, and child occurrences down to max_depth.
+        Empty values are left out.
+        """
+        comp = occ.component
+        comp_token = self.set_obj_hash(comp)
 
-            # Build a top-level structure representing the entire design
-            design_tree = {
-                "rootComponentName": root_comp.name,
-                "rootComponentToken": get_token(root_comp),
-                "rootBodies": root_bodies,
-                "rootSketches": root_sketches,
-                "rootJoints": root_joints,
-                "rootJointOrigins": root_joint_origins,
-                "occurrences": occurrences_info
-            }
+        contents = self._component_contents(comp, comp_token, include, component_memo)
 
-            return json.dumps(design_tree)
+        sep = "{"
+        for key, val in (("occurrenceName", occ.name), ("occurrenceToken", self.set_obj_hash(occ)), ("componentToken", comp_token)):
+            if not val:
+                continue
+            yield f'{sep}"{key}": ' + json.dumps(val)
+            sep = ", "
+
+        # compact form lists contents in the components table
+        if compact == False:
+            for kind, items_json in contents:
+                yield f'{sep}"{kind}": {items_json}'
+                sep = ", "
+
+        children = occ.childOccurrences
+        if children.count != 0:
+            if max_depth < 0 or depth < max_depth:
+                yield f'{sep}"children": '
+                yield from json_stream.json_array(
+                    self._iter_occurrence_structure(child_occ, depth + 1, max_depth, include, component_memo, compact)
+                    for child_occ in children
+                )
+            else:
+                yield f'{sep}"childCount": {children.count}'
+            sep = ", "
 
-        except:
-            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+        yield "}" if sep == ", " else "{}"
 
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def get_root_component_name(self):
         """
         {
@@ -1587,7 +1969,7 @@ class SetStateData(ToolCollection):
     @ToolCollection.tool_call
     def call_entity_methods(self, calls_list: list = [
                    { "entityToken": "", "method_path": "", "arguments": [] }
-    ]) -> str:
+    ], response_profile: str = "") -> str:
         """
         {
           "name": "call_entity_methods",
@@ -1614,6 +1996,11 @@ class SetStateData(ToolCollection):
                   },
                   "required": ["entityToken", "method_path", "arguments"]
                 }
+              },
+              "response_profile": {
+                "type": "string",
+                "enum": ["", "minimal", "standard", "verbose"],
+                "description": "Detail of the new object list: minimal (entityToken and objectType), standard (plus name, area, length) or verbose (plus construction axes and planes of new components). Empty string uses the default, new components then list their construction planes and axes."
               }
             },
             "required": ["calls_list"],
@@ -1708,7 +2095,7 @@ class SetStateData(ToolCollection):
                     if any([ isinstance(method_ret_val, attrType) for attrType in [str, int, float, bool]] ) == False:
 
                         new_obj_type = method_ret_val.__class__.__name__
-                        new_objects += self.object_creation_response(method_ret_val)
+                        new_objects += self.object_creation_response(method_ret_val, response_profile)
 
 
                         if hasattr(method_ret_val, "item") == True:
@@ -1722,7 +2109,7 @@ class SetStateData(ToolCollection):
                             new_entity_token = self.set_obj_hash(method_ret_val)
 
                             new_component = method_ret_val.component
-                            new_objects += self.object_creation_response(new_component)
+                            new_objects += self.object_creation_response(new_component, response_profile or "component")
 
                             new_comp_token = self.set_obj_hash(new_component)
                             ret_val = f"Success: method '{method_name}' returned new '{new_obj_type}' object with entityToken '{new_entity_token}' and new 'component' with entityToken '{new_comp_token}'"
@@ -19,6 +19,9 @@ import functools
 
 #from ... import config
 from ...lib import fusion360utils as futil
+from .. import json_stream
+from .. import name_index
+from .. import transient_array
 
 
 def print(string):
@@ -37,6 +40,26 @@ class ToolCollection:
     log_results = True
     log_errors = True
 
+    # incremented when the design may have changed, e.g by a tool call that
+    # is not read only or a command run from the Fusion UI. Cached query
+    # results are only valid for the generation they were created in
+    design_generation = 0
+
+    # components and occurrences by name, shared by all tool collections
+    names = name_index.NameIndex()
+
+    # open modeling batch, see CreateObjects.begin_batch. Compute is
+    # deferred until commit_batch, modeling tool calls are counted here
+    batch = None
+
+    def read_only(func):
+        """
+        marks a tool call that doesn't change the design,
+        apply below tool_call
+        """
+        func.__read_only__ = True
+        return func
+
     def tool_call(func):
         """
         Wraps fusion interface calls
@@ -53,6 +76,15 @@ class ToolCollection:
 
             results = func(self, *args, **kwds)
 
+            if not getattr(func, "__read_only__", False):
+                ToolCollection.design_generation += 1
+                if ToolCollection.batch is not None:
+                    ToolCollection.batch["toolCalls"] += 1
+
+            # written while sending, not validated or logged here
+            if isinstance(results, json_stream.ToolResultStream):
+                return results
+
             if isinstance(results, str):
                 try:
                     json.loads(results)
@@ -74,6 +106,38 @@ class ToolCollection:
         self.methods = self._get_methods()
         self.ent_dict = ent_dict
 
+    def _find_by_name(self, kind: str, name: str) -> tuple:
+        """
+        (object, None) or (None, error string) from the shared name index,
+        rebuilt when the design generation changed or on a miss after
+        components or occurrences were added in the current tool call.
+        """
+        if not isinstance(name, str) or not name:
+            return None, f"Error: {kind} name must be a non-empty string"
+
+        design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
+        if not design:
+            return None, "Error: No active Fusion 360 design found."
+
+        index = ToolCollection.names
+        if not index.is_current(design, ToolCollection.design_generation):
+            index.build(design, ToolCollection.design_generation)
+
+        obj, errors = index.resolve(kind, name)
+        if obj is None and index.counts != index.design_counts(design):
+            index.build(design, ToolCollection.design_generation)
+            obj, errors = index.resolve(kind, name)
+
+        return obj, errors
+
+    def _find_component_by_name(self, name: str) -> tuple:
+        """component by name, see _find_by_name"""
+        return self._find_by_name("component", name)
+
+    def _find_occurrence_by_name(self, name: str) -> tuple:
+        """occurrence by name or full path, e.g 'assembly:1+bolt:1', see _find_by_name"""
+        return self._find_by_name("occurrence", name)
+
     def log_print(self, output):
         print(output)
 
@@ -87,6 +151,51 @@ class ToolCollection:
         setattr(ToolCollection, setting_name, setting_val)
         print(f"fusion: {setting_name}:  {current_val} => {setting_val}")
 
+    @classmethod
+    def finish_batch(cls, group: bool = True) -> dict:
+        """
+        close the open modeling batch, the timeline features added during the
+        batch are grouped and isComputeDeferred is restored, which recomputes
+        the design. Returns None when no batch is open. Also called when a run
+        ends, the server connection drops or the modules are reloaded
+        """
+        batch = ToolCollection.batch
+        if batch is None:
+            return None
+        ToolCollection.batch = None
+
+        design = batch["design"]
+        results = {
+            "batch": batch["name"],
+            "toolCalls": batch["toolCalls"],
+            "seconds": round(time.time() - batch["started"], 3),
+        }
+
+        # document closed while the batch was open, nothing to restore
+        if not getattr(design, "isValid", True):
+            results["error"] = "batch design is no longer valid, compute was not restored"
+            return results
+
+        try:
+            start = batch["timelineStart"]
+            end = design.timeline.markerPosition - 1
+            results["timelineObjects"] = max(end - start + 1, 0)
+
+            if group and end >= start and design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+                try:
+                    timeline_group = design.timeline.timelineGroups.add(start, end)
+                    timeline_group.name = batch["name"]
+                    results["timelineGroup"] = timeline_group.name
+                except Exception as e:
+                    results["timelineGroupError"] = f"Error creating timeline group: {e}"
+        finally:
+            # turning deferral off recomputes the design
+            compute_start = time.perf_counter()
+            design.isComputeDeferred = batch["wasDeferred"]
+            results["computeSeconds"] = round(time.perf_counter() - compute_start, 3)
+
+        return results
+
     def print_results(self, results):
 
         if isinstance(results, str):
@@ -323,13 +432,15 @@ class ToolCollection:
 
 
     # TODO handle all operation responses
-    def object_creation_response(self, response_obj) -> str:
-        """
-        converts fusion object to json
-        """
-
-        attr_list = [
-            #"entityToken",
+    # attributes returned for new objects by object_creation_response.
+    # minimal: entityToken and objectType only, standard: plus primitive
+    # values, verbose: plus a token and name for object valued attributes.
+    # component: new components, the construction planes and axes new
+    # sketches and features are placed on
+    RESPONSE_PROFILES = {
+        "minimal": [],
+        "standard": ["name", "area", "length"],
+        "verbose": [
             "name",
             "area",
             "length",
@@ -339,13 +450,47 @@ class ToolCollection:
             "xYConstructionPlane",
             "xZConstructionPlane",
             "yZConstructionPlane",
-            #"timelineObject",
-
-        ]
-
-        sub_attr_list = [
+        ],
+        "component": [
             "name",
-        ]
+            "xYConstructionPlane",
+            "xZConstructionPlane",
+            "yZConstructionPlane",
+            "xConstructionAxis",
+            "yConstructionAxis",
+            "zConstructionAxis",
+        ],
+    }
+
+    # default profile for creation tools, can be changed from the settings
+    response_profile = "standard"
+
+    # (profile, class name): attributes of the profile the class has
+    _response_attrs = {}
+
+    def _response_attr_list(self, profile: str, obj) -> list:
+        """profile attributes available on obj's class, checked once per class"""
+        key = (profile, obj.__class__.__name__)
+        attrs = ToolCollection._response_attrs.get(key)
+        if attrs is None:
+            attrs = []
+            for attr in self.RESPONSE_PROFILES[profile]:
+                try:
+                    if hasattr(obj, attr):
+                        attrs.append(attr)
+                except Exception:
+                    continue
+            ToolCollection._response_attrs[key] = attrs
+        return attrs
+
+    def object_creation_response(self, response_obj, profile: str = None) -> list:
+        """
+        converts fusion object to json, one dict per new object with the
+        attributes of the response profile
+        """
+        profile = profile or ToolCollection.response_profile
+        if profile not in self.RESPONSE_PROFILES:
+            profile = "standard"
 
         # some responses will be iterable
         response_object_list = []
@@ -356,52 +501,45 @@ class ToolCollection:
 
         # object arrays
         elif hasattr(response_obj, "item") == True:
-            #print(f"response_obj: {response_obj}")
             for ent in response_obj:
-            #    print(f" ent: {ent}")
-
                 response_object_list.append(ent)
         else:
             response_object_list.append(response_obj)
 
+        primitive_types = (str, int, float, bool)
 
         results = []
         for obj in response_object_list:
-            ent_dict = {}
-            entity_token = self.set_obj_hash(obj)
-            ent_dict["entityToken"] = entity_token
-            ent_dict["objectType"] = obj.__class__.__name__
-
-            for attr in attr_list:
-                val, errors = self.get_sub_attr(obj, attr)
-                if val == None:
-                    continue
-
-                # TODO find better way to check if fusion object
-                elif any([ isinstance(val, attrType) for attrType in [str, int, float, bool]] ) == True:
-                    ent_dict[attr] = val
-
-                else:
-
-                    val_dict = {}
-                    val_dict["entityToken"] = self.set_obj_hash(val)
-                    val_dict["objectType"] = obj.__class__.__name__
+            ent_dict = {
+                "entityToken": self.set_obj_hash(obj),
+                "objectType": obj.__class__.__name__,
+            }
 
-                    for sub_attr in sub_attr_list:
-                        sub_val, sub_errors = self.get_sub_attr(val, sub_attr)
-                        if sub_val:
-                            val_dict[sub_attr] = sub_val
+            for attr in self._response_attr_list(profile, obj):
+                try:
+                    val = getattr(obj, attr)
+                except Exception:
+                    continue
 
-                    val = val_dict
+                if val is None:
+                    continue
 
-                if val:
+                if isinstance(val, primitive_types):
                     ent_dict[attr] = val
 
+                # object valued attributes, only listed in verbose and component
+                else:
+                    val_dict = {
+                        "entityToken": self.set_obj_hash(val),
+                        "objectType": val.__class__.__name__,
+                    }
+                    sub_name = getattr(val, "name", None)
+                    if sub_name:
+                        val_dict["name"] = sub_name
+                    ent_dict[attr] = val_dict
 
             results.append(ent_dict)
 
-
-
         return results
 
 
@@ -501,12 +639,31 @@ class ToolCollection:
         return hash_val
 
 
+    # item of a transient array or object collection, e.g "aB3xZ[12]"
+    ARRAY_ITEM_PATTERN = re.compile(r"^(?P<token>\w+)\[(?P<index>-?\d+)\]$")
+
     def get_hash_obj(self, hash_val):
         """
         adds a fusion360 to the hash:object dict
         """
-
-        return self.ent_dict.get(hash_val)
+        obj = self.ent_dict.get(hash_val)
+
+        # adsk object for one item of a transient array, created on access
+        if obj is None and isinstance(hash_val, str) and hash_val.endswith("]"):
+            match = self.ARRAY_ITEM_PATTERN.match(hash_val)
+            if match:
+                array_obj = self.ent_dict.get(match.group("token"))
+                index = int(match.group("index"))
+                if isinstance(array_obj, transient_array.TransientArray):
+                    obj = array_obj.item(index)
+                # item of a body set or other ObjectCollection
+                elif isinstance(array_obj, adsk.core.ObjectCollection):
+                    if index < 0:
+                        index += array_obj.count
+                    if 0 <= index < array_obj.count:
+                        obj = array_obj.item(index)
+
+        return obj
 
 
 
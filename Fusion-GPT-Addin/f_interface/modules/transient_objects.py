@@ -22,6 +22,7 @@ from ... import config
 from ...lib import fusion360utils as futil
 
 from .shared import ToolCollection
+from .. import transient_array
 
 def print(string):
     """redefine print for fusion env"""
@@ -32,12 +33,38 @@ print(f"RELOADED: {__name__.split("%2F")[-1]}")
 
 class TransientObjects(ToolCollection):
 
+    def _create_transient_array(self, kind: str, rows: list, arg_name: str) -> str:
+        """one token for all rows instead of one hashed adsk object per row"""
+        try:
+            width = transient_array.KINDS[kind][0]
+            if not rows or not isinstance(rows, list):
+                return f"Error: {arg_name} must be a non-empty list of {width}-number arrays."
+
+            app = adsk.core.Application.get()
+            if not app:
+                return "Error: Fusion 360 is not running."
+
+            product = app.activeProduct
+            if not product or not isinstance(product, adsk.fusion.Design):
+                return "Error: No active Fusion 360 design found."
+
+            transient, errors = transient_array.TransientArray.from_rows(kind, rows)
+            if errors:
+                return errors
+
+            array_token = self.set_obj_hash(transient)
+            return json.dumps(transient.summary(array_token))
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_point3d_list(self, coords_list: list = [[.5, .5, 0], [1,2,0]]) -> str:
         """
         {
           "name": "create_point3d_list",
-          "description": "Creates a set of adsk.core.Point3D objects in memory from the specified list of [x, y, z] coordinates. Returns a JSON mapping each index to the newly created reference token (or name).",
+          "description": "Creates a transient array of adsk.core.Point3D from the specified list of [x, y, z] coordinates, packed in memory under a single token. Point3D objects are only created when a tool uses them.",
           "parameters": {
             "type": "object",
             "properties": {
@@ -55,51 +82,15 @@ class TransientObjects(ToolCollection):
             "required": ["coords_list"],
             "returns": {
               "type": "string",
-              "description": "A JSON object mapping each index in coords_list to the reference token for the newly created Point3D."
+              "description": "JSON object with the arrayToken, objectType, count and the first and last items. Item i is referenced as '<arrayToken>[i]' wherever an entity token is accepted, the arrayToken itself can be passed to tools that take many objects."
             }
           }
         }
         """
-
-        try:
-            if not coords_list or not isinstance(coords_list, list):
-                return "Error: coords_list must be a non-empty list of [x, y, z] items."
-
-            app = adsk.core.Application.get()
-            if not app:
-                return "Error: Fusion 360 is not running."
-
-            product = app.activeProduct
-            if not product or not isinstance(product, adsk.fusion.Design):
-                return "Error: No active Fusion 360 design found."
-
-            # If you don't already have a dict for storing references, create one.
-            # We'll store the references as self._point_dict: Dict[str, adsk.core.Point3D]
-            if not hasattr(self, "_point_dict"):
-                self._point_dict = {}
-
-            results = {}
-            for i, coords in enumerate(coords_list):
-                if not isinstance(coords, list) or len(coords) != 3:
-                    results[str(i)] = "Error: invalid [x, y, z] triple."
-                    continue
-
-                x, y, z = coords
-                # Create the Point3D object
-                p3d = adsk.core.Point3D.create(x, y, z)
-
-                #p3d_name = f"Point3D__{i}_{x}_{y}_{z}"
-                p3d_entity_token = self.set_obj_hash(p3d)
-
-                # Return the token for the user
-                results[p3d_entity_token] = f"Success: Created new 'Point3D' with token '{p3d_entity_token}' at {coords}"
-
-            return json.dumps(results)
-
-        except:
-            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+        return self._create_transient_array("Point3D", coords_list, "coords_list")
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_matrix3d_list(self, matrix_list: list = [[
             1.0, 0.0, 0.0, 0.0,
             0.0, 1.0, 0.0, 0.0,
@@ -108,7 +99,7 @@ class TransientObjects(ToolCollection):
         """
         {
           "name": "create_matrix3d_list",
-          "description": "Creates a set of adsk.core.Matrix3D objects from an array of 16-float arrays (row-major). Returns a JSON mapping each new matrix's entity token to a success message.",
+          "description": "Creates a transient array of adsk.core.Matrix3D from an array of 16-float arrays (row-major), packed in memory under a single token. Matrix3D objects are only created when a tool uses them.",
           "parameters": {
             "type": "object",
             "properties": {
@@ -126,50 +117,15 @@ class TransientObjects(ToolCollection):
             "required": ["matrix_list"],
             "returns": {
               "type": "string",
-              "description": "A JSON object mapping each new Matrix3D's token to a success or error message."
+              "description": "JSON object with the arrayToken, objectType, count and the first and last items. Item i is referenced as '<arrayToken>[i]' wherever an entity token is accepted, the arrayToken itself can be passed to tools that take many objects."
             }
           }
         }
         """
-
-        try:
-            if not matrix_list or not isinstance(matrix_list, list):
-                return "Error: matrix_list must be a non-empty list of 16-float arrays."
-
-            app = adsk.core.Application.get()
-            if not app:
-                return "Error: Fusion 360 is not running."
-
-            product = app.activeProduct
-            if not product or not isinstance(product, adsk.fusion.Design):
-                return "Error: No active Fusion 360 design found."
-
-            results = {}
-
-            for i, mat_vals in enumerate(matrix_list):
-                # Validate input shape
-                if not isinstance(mat_vals, list) or len(mat_vals) != 16:
-                    results[f"Index_{i}"] = "Error: must provide exactly 16 floats for Matrix3D."
-                    continue
-
-                try:
-                    m3d = adsk.core.Matrix3D.create()
-                    m3d.setWithArray(mat_vals)
-
-                    # Generate a name for referencing
-                    #mat_name = f"Matrix3D_{i}_{mat_vals}_{random.random()}"
-
-                    mat_token = self.set_obj_hash(m3d)
-
-                    results[mat_token] = f"Success: Created new 'Matrix3D' with token '{mat_token}' at {mat_vals}."
-                except Exception as e:
-                    results[f"Index_{i}"] = f"Error: {str(e)}"
-
-            return json.dumps(results)
-        except:
-            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+        return self._create_transient_array("Matrix3D", matrix_list, "matrix_list")
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_point2d_list(self, coords_list: list = None) -> str:
         """
         {
@@ -232,6 +188,7 @@ class TransientObjects(ToolCollection):
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_matrix2d_list(self, matrix_list: list = None) -> str:
         """
         {
@@ -294,11 +251,12 @@ class TransientObjects(ToolCollection):
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_vector3d_list(self, coords_list: list = [[1, 0, 0], [0, 1, 0]]) -> str:
         """
         {
           "name": "create_vector3d_list",
-          "description": "Creates a set of adsk.core.Vector3D objects from the specified list of [x, y, z] coordinates. Returns a JSON mapping each index to the newly created reference token (or name).",
+          "description": "Creates a transient array of adsk.core.Vector3D from the specified list of [x, y, z] coordinates, packed in memory under a single token. Vector3D objects are only created when a tool uses them.",
           "parameters": {
             "type": "object",
             "properties": {
@@ -316,50 +274,312 @@ class TransientObjects(ToolCollection):
             "required": ["coords_list"],
             "returns": {
               "type": "string",
-              "description": "A JSON object mapping each index in coords_list to the reference token for the newly created Vector3D."
+              "description": "JSON object with the arrayToken, objectType, count and the first and last items. Item i is referenced as '<arrayToken>[i]' wherever an entity token is accepted, the arrayToken itself can be passed to tools that take many objects."
             }
           }
         }
         """
+        return self._create_transient_array("Vector3D", coords_list, "coords_list")
+
+    def _transient_array_arg(self, array_token: str, kinds: tuple = ("Point3D", "Vector3D", "Matrix3D")) -> tuple:
+        """(TransientArray, None) or (None, error string)"""
+        transient = self.get_hash_obj(array_token)
+        if not isinstance(transient, transient_array.TransientArray):
+            return None, f"Error: '{array_token}' is not a transient array token, create one with create_point3d_list, create_vector3d_list or create_matrix3d_list."
+        if transient.kind not in kinds:
+            return None, f"Error: array '{array_token}' holds {transient.kind}, expected one of {list(kinds)}."
+        return transient, None
+
+    def _numbers_arg(self, arg_name: str, value, length: int) -> str:
+        """error string when value is not a list of length numbers, else None"""
+        if not isinstance(value, list) or len(value) != length or not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in value
+        ):
+            return f"Error: {arg_name} must be an array of {length} numbers, got {value}"
+        return None
+
+    def _new_transient_array(self, transient) -> str:
+        array_token = self.set_obj_hash(transient)
+        return json.dumps(transient.summary(array_token))
 
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def transform_transient_array(self, array_token: str = "", matrix: list = [], matrix_token: str = "") -> str:
+        """
+        {
+          "name": "transform_transient_array",
+          "description": "Applies a 4x4 transform to every item of a transient Point3D, Vector3D or Matrix3D array and returns a new array token. Points get the full transform, vectors only rotation/scale, matrices are multiplied on the left. Use this to move, rotate or mirror point sets without re-sending coordinates.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "array_token": {
+                "type": "string",
+                "description": "Token of the transient array to transform."
+              },
+              "matrix": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "16 numbers, row-major 4x4 transform. Translations are in cm. Leave empty when matrix_token is given."
+              },
+              "matrix_token": {
+                "type": "string",
+                "description": "Token of a Matrix3D, e.g an item of a transient Matrix3D array '<arrayToken>[0]'. Used when matrix is empty."
+              }
+            },
+            "required": ["array_token"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the new arrayToken, objectType, count and the first and last items."
+            }
+          }
+        }
+        """
         try:
-            if not coords_list or not isinstance(coords_list, list):
-                return "Error: coords_list must be a non-empty list of [x, y, z] items."
+            transient, errors = self._transient_array_arg(array_token)
+            if errors:
+                return errors
+
+            if matrix:
+                errors = self._numbers_arg("matrix", matrix, 16)
+                if errors:
+                    return errors
+            elif matrix_token:
+                matrix_obj = self.get_hash_obj(matrix_token)
+                if not isinstance(matrix_obj, adsk.core.Matrix3D):
+                    return f"Error: '{matrix_token}' is not a Matrix3D token."
+                matrix = list(matrix_obj.asArray())
+            else:
+                return "Error: provide a matrix or a matrix_token."
+
+            result = transient_array.TransientArray(transient.kind, transient_array.transformed(transient, matrix))
+            return self._new_transient_array(result)
 
-            app = adsk.core.Application.get()
-            if not app:
-                return "Error: Fusion 360 is not running."
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
-            product = app.activeProduct
-            if not product or not isinstance(product, adsk.fusion.Design):
-                return "Error: No active Fusion 360 design found."
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def linear_pattern_transient_array(self, array_token: str = "", step: list = [1, 0, 0], count: int = 2) -> str:
+        """
+        {
+          "name": "linear_pattern_transient_array",
+          "description": "Copies every item of a transient array count times, each copy translated by step from the previous one (the first copy is the original). Returns a new array token, items are ordered copy by copy.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "array_token": {
+                "type": "string",
+                "description": "Token of the transient Point3D, Vector3D or Matrix3D array to pattern."
+              },
+              "step": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] offset between copies in cm."
+              },
+              "count": {
+                "type": "integer",
+                "description": "Number of copies, including the original."
+              }
+            },
+            "required": ["array_token", "step", "count"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the new arrayToken, objectType, count and the first and last items."
+            }
+          }
+        }
+        """
+        try:
+            transient, errors = self._transient_array_arg(array_token)
+            if errors:
+                return errors
+            errors = self._numbers_arg("step", step, 3)
+            if errors:
+                return errors
+            if not isinstance(count, int) or count < 1:
+                return "Error: count must be a positive integer."
+            if len(transient) * count > transient_array.MAX_ITEMS:
+                return f"Error: the pattern would have {len(transient) * count} items, the limit is {transient_array.MAX_ITEMS}."
+
+            matrices = [transient_array.translation_matrix([v * k for v in step]) for k in range(count)]
+            return self._new_transient_array(transient_array.patterned(transient, matrices))
 
-            # If you don't already have a dict for storing references, create one.
-            # We'll store the references as self._vector_dict: Dict[str, adsk.core.Vector3D]
-            if not hasattr(self, "_vector_dict"):
-                self._vector_dict = {}
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
-            results = {}
-            for i, coords in enumerate(coords_list):
-                if not isinstance(coords, list) or len(coords) != 3:
-                    results[str(i)] = "Error: invalid [x, y, z] triple."
-                    continue
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def circular_pattern_transient_array(self,
+                                         array_token: str = "",
+                                         axis_point: list = [0, 0, 0],
+                                         axis_direction: list = [0, 0, 1],
+                                         count: int = 4,
+                                         total_angle_deg: float = 360) -> str:
+        """
+        {
+          "name": "circular_pattern_transient_array",
+          "description": "Copies every item of a transient array count times around an axis (the first copy is the original). With a 360 degree total angle the copies are spaced evenly around the full circle, otherwise the first and last copies are total_angle_deg apart. Returns a new array token, items are ordered copy by copy.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "array_token": {
+                "type": "string",
+                "description": "Token of the transient Point3D, Vector3D or Matrix3D array to pattern."
+              },
+              "axis_point": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] point on the axis in cm."
+              },
+              "axis_direction": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] direction of the axis, right hand rule."
+              },
+              "count": {
+                "type": "integer",
+                "description": "Number of copies, including the original."
+              },
+              "total_angle_deg": {
+                "type": "number",
+                "description": "Angle covered by the pattern in degrees."
+              }
+            },
+            "required": ["array_token", "axis_point", "axis_direction", "count"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the new arrayToken, objectType, count and the first and last items."
+            }
+          }
+        }
+        """
+        try:
+            transient, errors = self._transient_array_arg(array_token)
+            if errors:
+                return errors
+            for arg_name, value in (("axis_point", axis_point), ("axis_direction", axis_direction)):
+                errors = self._numbers_arg(arg_name, value, 3)
+                if errors:
+                    return errors
+            if not any(axis_direction):
+                return "Error: axis_direction must not be a zero vector."
+            if not isinstance(count, int) or count < 1:
+                return "Error: count must be a positive integer."
+            if len(transient) * count > transient_array.MAX_ITEMS:
+                return f"Error: the pattern would have {len(transient) * count} items, the limit is {transient_array.MAX_ITEMS}."
+
+            full_circle = abs(abs(total_angle_deg) - 360) < 1e-9
+            divisions = count if full_circle else max(count - 1, 1)
+            step = math.radians(total_angle_deg) / divisions
+
+            matrices = [transient_array.rotation_matrix(axis_point, axis_direction, step * k) for k in range(count)]
+            return self._new_transient_array(transient_array.patterned(transient, matrices))
+
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
-                x, y, z = coords
-                # Create the Vector3D object
-                vec3d = adsk.core.Vector3D.create(x, y, z)
-                #vec3d_name = f"Vector3D_{i}_{x}_{y}_{z}_{random.random()}"
-                vec3d_token = self.set_obj_hash(vec3d)
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def create_point_grid(self, origin: list = [0, 0, 0], counts: list = [10, 10, 1], spacing: list = [1, 1, 1]) -> str:
+        """
+        {
+          "name": "create_point_grid",
+          "description": "Creates a transient Point3D array on a regular 3D grid and returns its token. Items are ordered with the x index varying slowest and z fastest. Use a count of 1 for flat grids.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "origin": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] of the first grid point in cm."
+              },
+              "counts": {
+                "type": "array",
+                "items": { "type": "integer" },
+                "description": "[nx, ny, nz] number of points along each axis."
+              },
+              "spacing": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[dx, dy, dz] distance between points along each axis in cm."
+              }
+            },
+            "required": ["counts", "spacing"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the new arrayToken, objectType, count and the first and last items."
+            }
+          }
+        }
+        """
+        try:
+            for arg_name, value in (("origin", origin), ("spacing", spacing)):
+                errors = self._numbers_arg(arg_name, value, 3)
+                if errors:
+                    return errors
+            if not isinstance(counts, list) or len(counts) != 3 or not all(isinstance(n, int) and n >= 1 for n in counts):
+                return f"Error: counts must be an array of 3 positive integers, got {counts}"
+            if math.prod(counts) > transient_array.MAX_ITEMS:
+                return f"Error: the grid would have {math.prod(counts)} points, the limit is {transient_array.MAX_ITEMS}."
 
-                # Store a success message for the new reference token
-                results[vec3d_token] = f"Success: Created new Vector3D with token '{vec3d_token}' at {coords}"
+            return self._new_transient_array(transient_array.grid(origin, counts, spacing))
 
-            return json.dumps(results)
+        except:
+            return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
+
+    @ToolCollection.tool_call
+    @ToolCollection.read_only
+    def filter_transient_array_by_box(self, array_token: str = "", min_point: list = [0, 0, 0], max_point: list = [1, 1, 1], inside: bool = True) -> str:
+        """
+        {
+          "name": "filter_transient_array_by_box",
+          "description": "Keeps the items of a transient Point3D or Vector3D array that are inside (or outside) an axis aligned box, bounds included. Returns a new array token, items keep their order.",
+          "parameters": {
+            "type": "object",
+            "properties": {
+              "array_token": {
+                "type": "string",
+                "description": "Token of the transient Point3D or Vector3D array to filter."
+              },
+              "min_point": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] minimum corner of the box in cm."
+              },
+              "max_point": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] maximum corner of the box in cm."
+              },
+              "inside": {
+                "type": "boolean",
+                "description": "true keeps items inside the box, false keeps items outside."
+              }
+            },
+            "required": ["array_token", "min_point", "max_point"],
+            "returns": {
+              "type": "string",
+              "description": "JSON object with the new arrayToken, objectType, count and the first and last items."
+            }
+          }
+        }
+        """
+        try:
+            transient, errors = self._transient_array_arg(array_token, ("Point3D", "Vector3D"))
+            if errors:
+                return errors
+            for arg_name, value in (("min_point", min_point), ("max_point", max_point)):
+                errors = self._numbers_arg(arg_name, value, 3)
+                if errors:
+                    return errors
+
+            return self._new_transient_array(transient_array.in_box(transient, min_point, max_point, inside))
 
         except:
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def create_object_collection(self, entity_token_list: list = []) -> str:
         """
         {
@@ -402,6 +622,13 @@ class TransientObjects(ToolCollection):
                     items[token] = f"Error: No object found for token '{token}'."
                     continue
 
+                # every item of a transient array
+                if isinstance(obj, transient_array.TransientArray):
+                    for item in obj.items():
+                        obj_collection.add(item)
+                    items[token] = f"Success: {len(obj)} '{obj.kind}' items of array '{token}' added to collection."
+                    continue
+
                 # Add to the collection
                 try:
                     obj_collection.add(obj)
@@ -14,11 +14,13 @@ import functools
 import base64
 import re
 import importlib
+import math
 from ... import config
 from ...lib import fusion360utils as futil
 
 # send info to html palette
 from .shared import ToolCollection
+from .. import geometry_index
 
 def print(string):
     """redefine print for fusion env"""
@@ -76,6 +78,7 @@ class Utilities(ToolCollection):
 class ImportExport(ToolCollection):
 
     @ToolCollection.tool_call
+    @ToolCollection.read_only
     def list_step_files_in_directory(self) -> str:
         """
         {
@@ -292,167 +295,253 @@ class ImportExport(ToolCollection):
 
 class Joints(ToolCollection):
 
+    # list_joint_origin_references geometry_types: row geometryType
+    REFERENCE_TYPES = {
+        "faces": "face",
+        "edges": "Edge",
+        "vertices": "vertex",
+        "sketch_points": "sketchPoint",
+    }
+
+    def __init__(self, ent_dict):
+        super().__init__(ent_dict)
+
+        # component id: geometry_index.ReferenceTable, rebuilt when a body or sketch revision changes
+        self.reference_tables = {}
+
+    def _component_revision(self, comp) -> tuple:
+        bodies = tuple((body.entityToken, body.revisionId) for body in comp.bRepBodies)
+        sketches = tuple((sketch.entityToken, sketch.revisionId) for sketch in comp.sketches)
+        return bodies, sketches
+
+    def _reference_table(self, comp) -> geometry_index.ReferenceTable:
+        """faces, edges, vertices and sketch points of a component that can host a Joint Origin"""
+        comp_key = self.get_comp_str(comp)
+        revision = self._component_revision(comp)
+
+        table = self.reference_tables.get(comp_key)
+        if table is not None and table.revision == revision:
+            return table
+
+        table = geometry_index.ReferenceTable(revision)
+
+        # A helper to get the bounding box center in [x, y, z].
+        def bounding_box_center(bbox: adsk.core.BoundingBox3D):
+            x = 0.5 * (bbox.minPoint.x + bbox.maxPoint.x)
+            y = 0.5 * (bbox.minPoint.y + bbox.maxPoint.y)
+            z = 0.5 * (bbox.minPoint.z + bbox.maxPoint.z)
+            return [x, y, z]
+
+        for bodyIndex, body in enumerate(comp.bRepBodies):
+
+            # 1) faces (using bounding box center)
+            for faceIndex, face in enumerate(body.faces):
+                bbox = face.boundingBox
+                loc = bounding_box_center(bbox) if bbox else [0, 0, 0]
+
+                faceGeo = face.geometry
+                normal = faceGeo.normal.asArray() if isinstance(faceGeo, adsk.core.Plane) else None
+
+                table.add({
+                    "referenceId": f"face|body{bodyIndex}|face{faceIndex}",
+                    "geometryType": "face",
+                    "faceType": faceGeo.objectType,
+                    "number_of_edges": face.edges.count,
+                    "area": face.area,
+                    "bodyName": body.name,
+                    "faceIndex": faceIndex,
+                    "location": loc
+                }, loc, normal=normal)
+
+            # 2) edges (circle/arc center, line start point)
+            for edgeIndex, edge in enumerate(body.edges):
+                edgeGeo = edge.geometry
+                radius = None
+                normal = None
+                if isinstance(edgeGeo, adsk.core.Circle3D):
+                    geoType = "Circle3D"
+                elif isinstance(edgeGeo, adsk.core.Arc3D):
+                    geoType = "Arc3D"
+                elif isinstance(edgeGeo, adsk.core.Line3D):
+                    geoType = "Line3D"
+                else:
+                    continue
+
+                if geoType == "Line3D":
+                    loc = edgeGeo.startPoint.asArray()
+                else:
+                    loc = edgeGeo.center.asArray()
+                    radius = edgeGeo.radius
+                    normal = edgeGeo.normal.asArray()
+
+                edgeDict = {
+                    "referenceId": f"edge|body{bodyIndex}|edge{edgeIndex}",
+                    "geometryType": "Edge",
+                    "edgeType": geoType,
+                    "bodyName": body.name,
+                    "edgeIndex": edgeIndex,
+                    "location": loc
+                }
+                if radius is not None:
+                    edgeDict["radius"] = radius
+
+                table.add(edgeDict, loc, radius=radius, normal=normal)
+
+            # 3) vertices
+            for vertIndex, vertex in enumerate(body.vertices):
+                loc = vertex.geometry.asArray()
+                table.add({
+                    "referenceId": f"vertex|body{bodyIndex}|vertex{vertIndex}",
+                    "geometryType": "vertex",
+                    "bodyName": body.name,
+                    "vertexIndex": vertIndex,
+                    "location": loc
+                }, loc)
+
+        # 4) sketch points (3D geometry of the point)
+        for sketchIndex, sketch in enumerate(comp.sketches):
+            for pointIndex, skPoint in enumerate(sketch.sketchPoints):
+                geo = skPoint.worldGeometry  # a Point3D in global coords
+                loc = [geo.x, geo.y, geo.z]
+                table.add({
+                    "referenceId": f"sketchPoint|sketch{sketchIndex}|point{pointIndex}",
+                    "geometryType": "sketchPoint",
+                    "sketchName": sketch.name,
+                    "sketchPointIndex": pointIndex,
+                    "location": loc
+                }, loc)
+
+        self.reference_tables[comp_key] = table
+        return table
+
     @ToolCollection.tool_call
-    def list_joint_origin_references(self, component_name: str = "comp1") -> str:
+    @ToolCollection.read_only
+    def list_joint_origin_references(self,
+                                     component_name: str = "comp1",
+                                     geometry_types: list = ["edges"],
+                                     edge_types: list = ["Circle3D"],
+                                     near_point: list = [],
+                                     max_distance: float = -1,
+                                     radius: float = -1,
+                                     radius_tolerance: float = 0.001,
+                                     normal: list = [],
+                                     normal_tolerance_deg: float = 1.0,
+                                     limit: int = 50,
+                                     offset: int = 0) -> str:
         """
         {
           "name": "list_joint_origin_references",
-          "description": "Finds potential reference geometry (faces, edges, vertices, sketch points) in the specified component that can host a Joint Origin. Returns a JSON array, each item includes geometry type, name or index, a referenceId, and approximate X/Y/Z coordinates.",
+          "description": "Finds reference geometry (faces, edges, vertices, sketch points) in the specified component that can host a Joint Origin, one page at a time. Each item includes the geometry type, name or index, a referenceId, and X/Y/Z coordinates. Filter by radius (circular edges), normal direction (planar faces, circle axes) and/or rank by distance to a point instead of listing everything. Lengths are in cm.",
           "parameters": {
             "type": "object",
             "properties": {
               "component_name": {
                 "type": "string",
                 "description": "Name of the Fusion 360 component whose geometry references will be listed."
+              },
+              "geometry_types": {
+                "type": "array",
+                "items": { "type": "string", "enum": ["faces", "edges", "vertices", "sketch_points"] },
+                "description": "Reference types to include."
+              },
+              "edge_types": {
+                "type": "array",
+                "items": { "type": "string", "enum": ["Circle3D", "Arc3D", "Line3D"] },
+                "description": "Edge geometry types to include, empty array for all."
+              },
+              "near_point": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] in cm. When set, results are ordered by distance to this point and include a distance field. Empty array to list in design order."
+              },
+              "max_distance": {
+                "type": "number",
+                "description": "Maximum distance from near_point in cm, -1 for no limit."
+              },
+              "radius": {
+                "type": "number",
+                "description": "Only circles and arcs with this radius in cm, -1 for any."
+              },
+              "radius_tolerance": {
+                "type": "number",
+                "description": "Allowed radius difference in cm."
+              },
+              "normal": {
+                "type": "array",
+                "items": { "type": "number" },
+                "description": "[x, y, z] direction. Only planar faces with this normal and circles/arcs with this axis, either sense. Empty array for any."
+              },
+              "normal_tolerance_deg": {
+                "type": "number",
+                "description": "Allowed angle between the normal and the given direction, in degrees."
+              },
+              "limit": {
+                "type": "integer",
+                "description": "Maximum number of references returned."
+              },
+              "offset": {
+                "type": "integer",
+                "description": "Number of matching references to skip, for the next page."
               }
             },
             "required": ["component_name"],
             "returns": {
               "type": "string",
-              "description": "A JSON array of references. Each entry might look like { 'referenceId': 'face|body0|face3', 'geometryType': 'face', 'location': [x, y, z], ... }"
+              "description": "JSON object with a references array, e.g { 'referenceId': 'face|body0|face3', 'geometryType': 'face', 'location': [x, y, z], ... }, and hasMore. totalMatches is included when near_point is not set."
             }
           }
         }
         """
 
         try:
-            app = adsk.core.Application.get()
-            if not app:
-                return "Error: Fusion 360 is not running."
+            unknown = [t for t in geometry_types if t not in self.REFERENCE_TYPES]
+            if unknown:
+                return f"Error: unknown geometry_types {unknown}, valid types are: {list(self.REFERENCE_TYPES.keys())}"
 
-            product = app.activeProduct
-            if not product or not isinstance(product, adsk.fusion.Design):
-                return "Error: No active Fusion 360 design found."
+            for arg_name, vector in (("near_point", near_point), ("normal", normal)):
+                if vector and (len(vector) != 3 or not all(isinstance(v, (int, float)) for v in vector)):
+                    return f"Error: {arg_name} must be an array of 3 numbers, got {vector}"
+            if normal and geometry_index.unit_vector(normal) is None:
+                return "Error: normal must not be a zero vector"
 
-            design = adsk.fusion.Design.cast(product)
+            if limit < 0 or offset < 0:
+                return "Error: limit and offset must not be negative"
 
             # Find the target component by name
-            targetComponent = None
-            for comp in design.allComponents:
-                if comp.name == component_name:
-                    targetComponent = comp
-                    break
+            targetComponent, errors = self._find_component_by_name(component_name)
             if not targetComponent:
-                return f"Error: Component '{component_name}' not found."
-
-            references_list = {
-                "faces": [],
-                "edges": [],
-                "vertices": [],
-                "sketch_points": [],
+                return errors
 
+            table = self._reference_table(targetComponent)
+
+            accept = table.row_filter(
+                geometry_types={self.REFERENCE_TYPES[t] for t in geometry_types},
+                edge_types=set(edge_types),
+                radius=radius if radius >= 0 else None,
+                radius_tolerance=radius_tolerance,
+                normal=normal or None,
+                normal_tolerance_deg=normal_tolerance_deg,
+            )
+
+            rows, has_more, total = table.query(
+                accept,
+                near_point=near_point or None,
+                max_distance=max_distance if max_distance >= 0 else math.inf,
+                offset=offset,
+                limit=limit,
+            )
+
+            results = {
+                "componentName": targetComponent.name,
+                "offset": offset,
+                "returned": len(rows),
+                "hasMore": has_more,
             }
+            if total is not None:
+                results["totalMatches"] = total
+            results["references"] = rows
 
-            # A helper to get the bounding box center in [x, y, z].
-            def bounding_box_center(bbox: adsk.core.BoundingBox3D):
-                x = 0.5 * (bbox.minPoint.x + bbox.maxPoint.x)
-                y = 0.5 * (bbox.minPoint.y + bbox.maxPoint.y)
-                z = 0.5 * (bbox.minPoint.z + bbox.maxPoint.z)
-                return [x, y, z]
-
-
-            # 1) Collect faces (using bounding box center)
-            for bodyIndex, body in enumerate(targetComponent.bRepBodies):
-                for faceIndex, face in enumerate(body.faces):
-                    refId = f"face|body{bodyIndex}|face{faceIndex}"
-                    bbox = face.boundingBox
-                    loc = bounding_box_center(bbox) if bbox else [0, 0, 0]
-
-                    face_type = face.geometry.objectType
-                    #face_type = face.geometry.surfaceType
-                    #print(dir(face.geometry))
-                    print(f"{faceIndex}: {face_type}")
-
-                    references_list["faces"].append({
-                        "referenceId": refId,
-                        "geometryType": "face",
-                        "faceType": face_type,
-                        "number_of_edges": face.edges.count,
-                        "area": face.area,
-                        "bodyName": body.name,
-                        "faceIndex": faceIndex,
-                        "location": loc
-                    })
-
-            # 2) Collect edges (using bounding box center)
-            for bodyIndex, body in enumerate(targetComponent.bRepBodies):
-                for edgeIndex, edge in enumerate(body.edges):
-                    refId = f"edge|body{bodyIndex}|edge{edgeIndex}"
-
-                    geoType = ""
-                    edgeGeo = edge.geometry
-                    if isinstance(edgeGeo, adsk.core.Circle3D):
-                        geoType = "Circle3D"
-                        loc = edge.geometry.center.asArray()
-                    elif isinstance(edgeGeo, adsk.core.Line3D):
-                        geoType = "Line3D"
-                        loc = edge.geometry.startPoint.asArray()
-                    elif isinstance(edgeGeo, adsk.core.Arc3D):
-                        geoType = "Arc3D"
-                        loc = edge.geometry.center.asArray()
-                    else:
-                        #print(edge.geometry)
-                        loc = None
-
-                    if geoType != "Circle3D":
-                        continue
-
-                    edgeDict = {
-                        "referenceId": refId,
-                        "geometryType": f"Edge",
-                        "edgeType": geoType,
-                        "bodyName": body.name,
-                        "edgeIndex": edgeIndex,
-                        "location": loc
-                    }
-
-                    if geoType == "Circle3D":
-                        edgeDict["radius"] = edge.geometry.radius 
-
-                    references_list["edges"].append(edgeDict)
-
-
-            # 3) Collect vertices (bounding box center = actual vertex coords)
-            for bodyIndex, body in enumerate(targetComponent.bRepBodies):
-                for vertIndex, vertex in enumerate(body.vertices):
-                    refId = f"vertex|body{bodyIndex}|vertex{vertIndex}"
-
-                    if isinstance(vertex, adsk.fusion.BRepVertex):
-                        loc = vertex.geometry.asArray()
-                    else:
-                        loc = None
-
-                    #loc = bounding_box_center(bbox) if bbox else [0, 0, 0]
-                    references_list["vertices"].append({
-                        "referenceId": refId,
-                        "geometryType": "vertex",
-                        "bodyName": body.name,
-                        "vertexIndex": vertIndex,
-                        "location": loc
-                    })
-
-            # 4) Collect sketch points (use the 3D geometry of the point)
-            for sketchIndex, sketch in enumerate(targetComponent.sketches):
-                for pointIndex, skPoint in enumerate(sketch.sketchPoints):
-                    refId = f"sketchPoint|sketch{sketchIndex}|point{pointIndex}"
-                    geo = skPoint.worldGeometry  # a Point3D in global coords
-
-                    loc = [geo.x, geo.y, geo.z]
-
-                    references_list["sketch_points"].append({
-                        "referenceId": refId,
-                        "geometryType": "sketchPoint",
-                        "sketchName": sketch.name,
-                        "sketchPointIndex": pointIndex,
-                        "location": loc
-                    })
-
-
-            references_list.pop("vertices")
-            #references_list.pop("edges")
-            references_list.pop("sketch_points")
-            references_list.pop("faces")
-            return json.dumps(references_list)
+            return json.dumps(results)
 
         except:
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
@@ -667,7 +756,7 @@ class Joints(ToolCollection):
         """
         {
           "name": "create_joints_between_origins",
-          "description": "Creates new joints between pairs of existing jointOrigins. Each request specifies the path (or reference) to two JointOrigins and a joint type.",
+          "description": "Creates new joints between pairs of existing jointOrigins. Each request specifies the path (or reference) to two JointOrigins and a joint type. All requests are validated first, then the joints are created in one batch with design compute deferred until the end.",
           "parameters": {
             "type": "object",
             "properties": {
@@ -677,13 +766,14 @@ class Joints(ToolCollection):
                 "items": {
                   "type": "object",
                   "properties": {
-                    "occurrence_1_name": { "type": "string", "description": "Name of the first occurrence" },
+                    "occurrence_1_name": { "type": "string", "description": "Name of the first occurrence, or its full path (e.g assembly:1+bolt:1) when the name is not unique" },
                     "joint_origin_1": { "type": "string", "description": "Name of the first joint origin." },
-                    "occurrence_2_name": { "type": "string", "description": "Name of the second occurrence" },
+                    "occurrence_2_name": { "type": "string", "description": "Name of the second occurrence, or its full path (e.g assembly:1+bolt:1) when the name is not unique" },
                     "joint_origin_2": { "type": "string", "description": "Name of the second joint origin." },
                     "jointType": {
                       "type": "string",
-                      "description": "The type of joint: 'RigidJointType', 'RevoluteJointType', etc."
+                      "enum": ["RigidJointType", "RevoluteJointType", "SliderJointType", "CylindricalJointType", "PinSlotJointType", "PlanarJointType", "BallJointType"],
+                      "description": "The type of joint. Rotation, slide and planar normal directions use the joint origin Z axis, the second direction of pin slot and ball joints uses its X axis."
                     }
                   },
                   "required": ["occurrence_1_name", "joint_origin_1", "occurrence_2_name", "joint_origin_2", "jointType"]
@@ -693,7 +783,7 @@ class Joints(ToolCollection):
             "required": ["joint_requests"],
             "returns": {
               "type": "string",
-              "description": "A summary of created joints or errors encountered."
+              "description": "JSON object with created and failed counts and one status per request in request order: {index, joint, jointType, entityToken} or {index, error}."
             }
           }
         }
@@ -714,90 +804,102 @@ class Joints(ToolCollection):
             design = adsk.fusion.Design.cast(product)
             root_comp = design.rootComponent
 
-            # A mapping from string to the Fusion 360 JointTypes enumerations
-            joint_type_map = {
-                "RigidJointType": adsk.fusion.JointTypes.RigidJointType,
-                "RevoluteJointType": adsk.fusion.JointTypes.RevoluteJointType,
-                "SliderJointType": adsk.fusion.JointTypes.SliderJointType,
-                "CylindricalJointType": adsk.fusion.JointTypes.CylindricalJointType,
-                "PinSlotJointType": adsk.fusion.JointTypes.PinSlotJointType,
-                "PlanarJointType": adsk.fusion.JointTypes.PlanarJointType,
-                "BallJointType": adsk.fusion.JointTypes.BallJointType
+            # jointType: JointInput motion, rotation/slide/normal along the
+            # joint origin Z axis, second direction along X
+            z_axis = adsk.fusion.JointDirections.ZAxisJointDirection
+            x_axis = adsk.fusion.JointDirections.XAxisJointDirection
+            joint_motions = {
+                "RigidJointType": lambda j_input: j_input.setAsRigidJointMotion(),
+                "RevoluteJointType": lambda j_input: j_input.setAsRevoluteJointMotion(z_axis),
+                "SliderJointType": lambda j_input: j_input.setAsSliderJointMotion(z_axis),
+                "CylindricalJointType": lambda j_input: j_input.setAsCylindricalJointMotion(z_axis),
+                "PinSlotJointType": lambda j_input: j_input.setAsPinSlotJointMotion(z_axis, x_axis),
+                "PlanarJointType": lambda j_input: j_input.setAsPlanarJointMotion(z_axis),
+                "BallJointType": lambda j_input: j_input.setAsBallJointMotion(z_axis, x_axis),
             }
 
-            results = []
-
-            # A helper to find a joint origin by name or path (assuming unique naming)
-            def find_joint_origin_by_name(occ, name_str):
-                # Search in all components
-                for j_origin in occ.component.jointOrigins:
-                    print(j_origin.name)
-                    if j_origin.name == name_str:
-                        return j_origin
+            # per request status, in request order
+            results = [None] * len(joint_requests)
 
-                return None
+            # component id: {joint origin name: joint origin}, built once per component
+            origin_maps = {}
 
+            def find_joint_origin_by_name(occ, name_str):
+                comp_key = self.get_comp_str(occ.component)
+                origins = origin_maps.get(comp_key)
+                if origins is None:
+                    origins = {}
+                    for j_origin in occ.component.jointOrigins:
+                        origins.setdefault(j_origin.name, j_origin)
+                    origin_maps[comp_key] = origins
+                return origins.get(name_str)
+
+            # validate the whole batch before creating any joint
+            valid = []
+            for index, request in enumerate(joint_requests):
+                if not isinstance(request, dict):
+                    results[index] = {"index": index, "error": f"Error: request must be an object, got {request}"}
+                    continue
 
-            for request in joint_requests:
-                #print(request)
                 occ_1_name = request.get("occurrence_1_name")
                 j1_name = request.get("joint_origin_1")
                 occ_2_name = request.get("occurrence_2_name")
                 j2_name = request.get("joint_origin_2")
-
                 j_type_str = request.get("jointType")
 
-                occ1, errors, = self._find_occurrence_by_name(occ_1_name)
-                if not occ1:
-                    results.append(errors)
-                    continue
-                occ2, errors, = self._find_occurrence_by_name(occ_2_name)
-                if not occ2:
-                    results.append(errors)
+                if not (j1_name and j2_name and j_type_str):
+                    results[index] = {"index": index, "error": f"Error: Missing fields in {request}"}
                     continue
 
-
-                if not (j1_name and j2_name and j_type_str):
-                    results.append(f"Error: Missing fields in {request}")
+                if j_type_str not in joint_motions:
+                    results[index] = {"index": index, "error": f"Error: Unknown jointType '{j_type_str}', valid: {list(joint_motions.keys())}"}
                     continue
 
-                # Map the jointType string
-                if j_type_str not in joint_type_map:
-                    results.append(f"Error: Unknown jointType '{j_type_str}' in {request}")
+                occ1, errors = self._find_occurrence_by_name(occ_1_name)
+                if not occ1:
+                    results[index] = {"index": index, "error": errors}
+                    continue
+                occ2, errors = self._find_occurrence_by_name(occ_2_name)
+                if not occ2:
+                    results[index] = {"index": index, "error": errors}
                     continue
-                the_joint_type = joint_type_map[j_type_str]
 
-                # Find the joint origins by their name or path
                 joint_origin_1 = find_joint_origin_by_name(occ1, j1_name)
                 joint_origin_2 = find_joint_origin_by_name(occ2, j2_name)
-
-                if not joint_origin_1 or not joint_origin_2:
-                    results.append(f"Error: Could not find one or both JointOrigins '{j1_name}', '{j2_name}'.")
+                missing = [n for n, jo in ((j1_name, joint_origin_1), (j2_name, joint_origin_2)) if jo is None]
+                if missing:
+                    results[index] = {"index": index, "error": f"Error: Could not find JointOrigins {missing}."}
                     continue
 
-                # Create a JointInput
-                #joint_origin_1 = joint_origin_1.occurrenceForGeometry(occ1)
-                #joint_origin_2 = joint_origin_2.occurrenceForGeometry(occ2)
-
-                joints_collection = root_comp.joints
-                j_input = joints_collection.createInput(
-                    joint_origin_1, joint_origin_2
-                )
-
-                # TODO need to handle all joint types here
-                #j_input.setAsStandardJoint(the_joint_type)
-                j_input.setAsRigidJointMotion()
-
-                # Add the joint
-                try:
-                    new_joint = joints_collection.add(j_input)
-                    results.append(
-                        f"Joint of type '{j_type_str}' created between '{j1_name}' and '{j2_name}'."
-                    )
-                except Exception as e:
-                    results.append(f"Error creating joint between '{j1_name}' and '{j2_name}': {str(e)}")
-
-            return "\n".join(results)
+                valid.append((index, joint_origin_1, joint_origin_2, j_type_str))
+
+            # compute once after all joints are added
+            joints_collection = root_comp.joints
+            defer_compute = hasattr(design, "isComputeDeferred") and len(valid) > 1
+            if defer_compute:
+                was_deferred = design.isComputeDeferred
+                design.isComputeDeferred = True
+
+            try:
+                for index, joint_origin_1, joint_origin_2, j_type_str in valid:
+                    try:
+                        j_input = joints_collection.createInput(joint_origin_1, joint_origin_2)
+                        joint_motions[j_type_str](j_input)
+
+                        new_joint = joints_collection.add(j_input)
+                        results[index] = {"index": index, "joint": new_joint.name, "jointType": j_type_str, "entityToken": self.set_obj_hash(new_joint)}
+                    except Exception as e:
+                        results[index] = {"index": index, "error": f"Error creating joint: {str(e)}"}
+            finally:
+                if defer_compute:
+                    design.isComputeDeferred = was_deferred
+
+            n_created = len([r for r in results if "error" not in r])
+            return json.dumps({
+                "created": n_created,
+                "failed": len(results) - n_created,
+                "results": results,
+            })
 
         except:
             return "Error: An unexpected exception occurred:\n" + traceback.format_exc()
@@ -0,0 +1,97 @@
+# name_index
+import difflib
+
+
+# suggestions returned when a name is not found
+MAX_SUGGESTIONS = 5
+
+
+class NameIndex:
+    """
+    Components and occurrences by name, and occurrences by full path
+    (e.g "assembly:1+bolt:1"). Built in one pass over the design and rebuilt
+    when the design generation changes, so repeated lookups in a tool call
+    are dict reads instead of scans of allComponents/allOccurrences.
+    """
+
+    def __init__(self):
+        # kind: {name: [objects]}, kinds are "component" and "occurrence"
+        self.by_name = {}
+        self.by_path = {}
+        # lower case name: names, for case insensitive and prefix matches
+        self.folded = {}
+        self.design = None
+        self.generation = None
+        # collection sizes when built, a changed count means the index is stale
+        self.counts = None
+        self.n_builds = 0
+
+    def build(self, design, generation: int):
+        self.by_name = {"component": {}, "occurrence": {}}
+        self.by_path = {}
+        self.folded = {"component": {}, "occurrence": {}}
+
+        for comp in design.allComponents:
+            self._add("component", comp.name, comp)
+
+        for occ in design.rootComponent.allOccurrences:
+            self._add("occurrence", occ.name, occ)
+            self.by_path[occ.fullPathName] = occ
+
+        self.design = design
+        self.generation = generation
+        self.counts = self.design_counts(design)
+        self.n_builds += 1
+
+    def design_counts(self, design) -> tuple:
+        return (design.allComponents.count, design.rootComponent.allOccurrences.count)
+
+    def is_current(self, design, generation: int) -> bool:
+        return self.generation == generation and self.design == design
+
+    def _add(self, kind: str, name: str, obj):
+        names = self.by_name[kind]
+        if name not in names:
+            names[name] = []
+            self.folded[kind].setdefault(name.lower(), []).append(name)
+        names[name].append(obj)
+
+    def exact(self, kind: str, name: str) -> list:
+        """valid objects with exactly this name or full path"""
+        objs = self.by_name[kind].get(name, [])
+        if not objs and kind == "occurrence" and name in self.by_path:
+            objs = [self.by_path[name]]
+        return [o for o in objs if getattr(o, "isValid", True)]
+
+    def fuzzy(self, kind: str, name: str) -> list:
+        """
+        names ranked by match quality: case insensitive match, then
+        prefix matches, then close matches from difflib
+        """
+        folded = self.folded[kind]
+        key = name.lower()
+
+        ranked = list(folded.get(key, []))
+        ranked += sorted(n for k, names in folded.items() if k.startswith(key) and k != key for n in names)
+        for close in difflib.get_close_matches(key, folded.keys(), n=MAX_SUGGESTIONS, cutoff=0.6):
+            ranked += folded[close]
+
+        return list(dict.fromkeys(ranked))
+
+    def resolve(self, kind: str, name: str) -> tuple:
+        """
+        (object, None) for an exact name or full path match, otherwise
+        (None, error string with ranked suggestions)
+        """
+        objs = self.exact(kind, name)
+        if len(objs) == 1:
+            return objs[0], None
+
+        if len(objs) > 1:
+            paths = [getattr(o, "fullPathName", o.name) for o in objs][:MAX_SUGGESTIONS]
+            return None, f"Error: {len(objs)} {kind}s are named '{name}', use the full path, e.g: {paths}"
+
+        ranked = self.fuzzy(kind, name)
+        if ranked:
+            return None, f"Error: no {kind} named '{name}', closest matches: {ranked[:MAX_SUGGESTIONS]}"
+        return None, f"Error: no {kind} named '{name}' in the current design"
@@ -0,0 +1,148 @@
+# session_recording
+import os
+import json
+import time
+
+
+# first line of every recording
+RECORDING_FORMAT = "fusion-gpt-session"
+RECORDING_VERSION = 1
+
+
+class SessionRecorder:
+    """
+    Append only JSON lines recording of the messages passed over the
+    multiprocess connection. One record per line:
+        {"type": "user"|"send"|"recv", "t": seconds since start, "data": raw message str}
+    Each line is flushed when written, so a crashed session is still readable.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.start_ts = time.monotonic()
+        self.n_records = 0
+
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        self.file = open(path, "a", encoding="utf-8")
+
+        header = {
+            "type": "header",
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._write(header)
+
+    def _write(self, record: dict):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def record(self, record_type: str, data: str):
+        """record_type: user, send or recv. data is stored as sent, not re-encoded"""
+        if self.file.closed:
+            return
+        self._write({
+            "type": record_type,
+            "t": round(time.monotonic() - self.start_ts, 6),
+            "data": data,
+        })
+        self.n_records += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class SessionRecording:
+    """
+    Loaded recording, records split into user messages and server responses.
+    recv_waits[i] is the recorded time between the previous event and the i-th recv,
+    used by MockServer to replay at recorded speed.
+    """
+
+    def __init__(self, records: list, path: str = None):
+        self.path = path
+        self.records = records
+
+        self.user_messages = []
+        self.recv_messages = []
+        self.recv_waits = []
+
+        prev_t = 0.0
+        for rec in records:
+            t = rec.get("t", prev_t)
+            if rec["type"] == "user":
+                self.user_messages.append(rec["data"])
+            elif rec["type"] == "recv":
+                self.recv_messages.append(rec["data"])
+                self.recv_waits.append(max(t - prev_t, 0.0))
+            prev_t = t
+
+    @property
+    def duration(self) -> float:
+        if not self.records:
+            return 0.0
+        return self.records[-1].get("t", 0.0)
+
+    def turns(self) -> list:
+        """
+        records grouped by user message, each turn starts with a "user" record
+        """
+        turns = []
+        for rec in self.records:
+            if rec["type"] == "user":
+                turns.append([rec])
+            elif turns:
+                turns[-1].append(rec)
+        return turns
+
+
+def load_recording(path: str) -> SessionRecording:
+    """read a JSON lines recording, ignores a truncated last line"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # partial write at end of file
+                break
+
+            if rec.get("type") == "header":
+                if rec.get("format") != RECORDING_FORMAT:
+                    raise ValueError(f"{path} is not a session recording")
+                continue
+
+            records.append(rec)
+
+    return SessionRecording(records, path)
+
+
+def write_recording(path: str, records: list):
+    """write a complete recording, records without timing get t=0"""
+    recorder = SessionRecorder(path)
+    try:
+        for rec in records:
+            recorder._write({"type": rec["type"], "t": rec.get("t", 0.0), "data": rec["data"]})
+    finally:
+        recorder.close()
+
+
+def latest_recording(recordings_dir: str) -> str:
+    """most recently modified recording in the directory, or None"""
+    if not os.path.isdir(recordings_dir):
+        return None
+    paths = [
+        os.path.join(recordings_dir, f)
+        for f in os.listdir(recordings_dir)
+        if f.endswith(".jsonl")
+    ]
+    if not paths:
+        return None
+    return max(paths, key=os.path.getmtime)
@@ -0,0 +1,282 @@
+# tracing
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from ..lib import fusion360utils as futil
+
+
+def print(string):
+    """redefine print for fusion env"""
+    futil.log(str(string))
+
+print(f"RELOADED: {__name__.split("%2F")[-1]}")
+
+
+# key used to pass trace data in messages sent over the multiprocess connection
+TRACE_META_KEY = "trace"
+
+# chrome trace process ids, one lane per process
+PROCESS_IDS = {
+    "fusion": 1,
+    "connection": 2,
+}
+
+
+class Tracer:
+    """
+    Records timed spans for a single prompt run (turn).
+    Timestamps come from time.monotonic(), which is system wide, so spans
+    recorded in connection.py can be placed on the same timeline.
+    """
+
+    def __init__(self, process_name: str = "fusion"):
+        self.process_name = process_name
+        self.trace_id = None
+        self.label = ""
+        self.start_ts = None
+        self.spans = []
+
+    @property
+    def active(self) -> bool:
+        return self.trace_id is not None
+
+    def start_trace(self, label: str = ""):
+        """start a new trace, clears existing spans"""
+        self.start_ts = time.monotonic()
+        self.trace_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{int(self.start_ts * 1000) % 100000}"
+        self.label = label
+        self.spans = []
+        return self.trace_id
+
+    def context(self) -> dict:
+        """trace context sent to connection.py with the user message"""
+        if not self.active:
+            return None
+        return {"trace_id": self.trace_id}
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """time the enclosed block, no op when no trace is active"""
+        if not self.active:
+            yield
+            return
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.monotonic(), args)
+
+    def add_span(self, name: str, start: float, end: float, args: dict = None, process: str = None):
+        if not self.active:
+            return
+
+        self.spans.append({
+            "name": name,
+            "ts": start,
+            "dur": max(end - start, 0.0),
+            "proc": process or self.process_name,
+            "tid": threading.get_ident(),
+            "args": args or {},
+        })
+
+    def add_remote_spans(self, spans: list):
+        """spans received in message metadata from connection.py"""
+        if not self.active or not spans:
+            return
+
+        for span in spans:
+            if not isinstance(span, dict):
+                continue
+            try:
+                start = float(span["ts"])
+                end = start + float(span.get("dur", 0.0))
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.add_span(span.get("name", "unknown"), start, end, span.get("args"), span.get("proc", "connection"))
+
+    def chrome_trace(self) -> dict:
+        """
+        Chrome trace event format, open in chrome://tracing or ui.perfetto.dev
+        """
+        events = []
+        for proc_name, pid in PROCESS_IDS.items():
+            events.append({
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": proc_name},
+            })
+
+        for span in self.spans:
+            events.append({
+                "name": span["name"],
+                "cat": span["proc"],
+                "ph": "X",
+                "ts": round((span["ts"] - self.start_ts) * 1e6, 1),
+                "dur": round(span["dur"] * 1e6, 1),
+                "pid": PROCESS_IDS.get(span["proc"], len(PROCESS_IDS) + 1),
+                "tid": span["tid"] if span["proc"] == self.process_name else 0,
+                "args": span["args"],
+            })
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": self.trace_id,
+                "label": self.label,
+            },
+        }
+
+    def summary(self) -> list:
+        """
+        per span name totals, sorted by total time
+        """
+        if not self.spans:
+            return []
+
+        first = min(s["ts"] for s in self.spans)
+        last = max(s["ts"] + s["dur"] for s in self.spans)
+        wall = max(last - first, 1e-9)
+
+        rows = {}
+        for span in self.spans:
+            key = (span["proc"], span["name"])
+            row = rows.setdefault(key, {
+                "process": span["proc"],
+                "name": span["name"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+            })
+            dur_ms = span["dur"] * 1000
+            row["count"] += 1
+            row["total_ms"] += dur_ms
+            row["max_ms"] = max(row["max_ms"], dur_ms)
+
+        results = []
+        for row in rows.values():
+            row["mean_ms"] = round(row["total_ms"] / row["count"], 3)
+            row["pct_wall"] = round(100 * row["total_ms"] / (wall * 1000), 1)
+            row["total_ms"] = round(row["total_ms"], 3)
+            row["max_ms"] = round(row["max_ms"], 3)
+            results.append(row)
+
+        return sorted(results, key=lambda r: r["total_ms"], reverse=True)
+
+    def end_trace(self, trace_dir: str = None) -> dict:
+        """
+        stop the active trace, write the timeline file, return summary
+        """
+        if not self.active:
+            return None
+
+        trace_path = None
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+            trace_path = os.path.join(trace_dir, f"trace_{self.trace_id}.json")
+            with open(trace_path, "w") as f:
+                json.dump(self.chrome_trace(), f)
+
+        results = {
+            "trace_id": self.trace_id,
+            "trace_path": trace_path,
+            "n_spans": len(self.spans),
+            "rows": self.summary(),
+        }
+
+        self.trace_id = None
+        return results
+
+
+class QueryProfile:
+    """
+    Plan, per stage timings and row counts, and per attribute path access
+    times for one run_sql_query statement. Disabled profiles record nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.plan = {}
+        self.stages = []
+        # attribute path: [calls, seconds]
+        self.paths = {}
+
+    def start_stage(self, name: str, **counters) -> dict:
+        if not self.enabled:
+            return None
+        return {"stage": name, **counters, "_start": time.perf_counter()}
+
+    def end_stage(self, stage: dict, **counters):
+        if stage is None:
+            return
+        stage["ms"] = round((time.perf_counter() - stage.pop("_start")) * 1000, 3)
+        stage.update(counters)
+        self.stages.append(stage)
+
+    def add_path_time(self, attr_path: str, seconds: float):
+        path = self.paths.setdefault(attr_path, [0, 0.0])
+        path[0] += 1
+        path[1] += seconds
+
+    def timed(self, get_value):
+        """
+        get_value(obj, attr_path) wrapped to record the time per attribute
+        path, get_value itself when the profile is disabled
+        """
+        if not self.enabled:
+            return get_value
+
+        def timed_get_value(obj, attr_path):
+            start = time.perf_counter()
+            try:
+                return get_value(obj, attr_path)
+            finally:
+                self.add_path_time(attr_path, time.perf_counter() - start)
+
+        return timed_get_value
+
+    def slowest_paths(self, n: int = 5) -> list:
+        paths = sorted(self.paths.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {"path": attr_path, "calls": calls, "ms": round(seconds * 1000, 3)}
+            for attr_path, (calls, seconds) in paths[:n]
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "plan": self.plan,
+            "stages": self.stages,
+            "total_ms": round(sum(s["ms"] for s in self.stages), 3),
+            "slowestPaths": self.slowest_paths(),
+        }
+
+
+def rebase_spans(spans: list, end: float = None) -> list:
+    """
+    shift recorded spans so the last one ends at 'end' (default now),
+    used when replaying recorded messages so remote spans line up with replay time
+    """
+    if not spans:
+        return spans
+
+    if end is None:
+        end = time.monotonic()
+
+    try:
+        last = max(float(s["ts"]) + float(s.get("dur", 0.0)) for s in spans)
+    except (KeyError, TypeError, ValueError):
+        return spans
+
+    offset = end - last
+    rebased = []
+    for span in spans:
+        span = dict(span)
+        span["ts"] = float(span["ts"]) + offset
+        rebased.append(span)
+
+    return rebased
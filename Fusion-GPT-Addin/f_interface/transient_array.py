@@ -0,0 +1,237 @@
+# transient_array
+import math
+from array import array
+
+import adsk.core
+
+# numpy is optional, Fusion's bundled Python does not include it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# items in an array built by a pattern or grid
+MAX_ITEMS = 1000000
+
+
+def _point3d(row):
+    return adsk.core.Point3D.create(*row)
+
+
+def _vector3d(row):
+    return adsk.core.Vector3D.create(*row)
+
+
+def _matrix3d(row):
+    matrix = adsk.core.Matrix3D.create()
+    matrix.setWithArray(list(row))
+    return matrix
+
+
+# object type: (values per item, factory building the adsk object from a row)
+KINDS = {
+    "Point3D": (3, _point3d),
+    "Vector3D": (3, _vector3d),
+    "Matrix3D": (16, _matrix3d),
+}
+
+
+class TransientArray:
+    """
+    Points, vectors or matrices packed row after row in one array('d').
+    A single token refers to the whole array, adsk objects are only created
+    when a consuming tool reads an item. Item i is addressed as "<token>[i]".
+    """
+
+    def __init__(self, kind: str, values: array = None):
+        self.kind = kind
+        self.width, self._factory = KINDS[kind]
+        self.values = values if values is not None else array("d")
+
+    @classmethod
+    def from_rows(cls, kind: str, rows: list) -> tuple:
+        """
+        (TransientArray, None) or (None, error string). Any invalid row
+        fails the whole array so item indexes always match row indexes
+        """
+        transient = cls(kind)
+        width = transient.width
+
+        for index, row in enumerate(rows):
+            if not isinstance(row, (list, tuple)) or len(row) != width:
+                return None, f"Error: item {index} must be an array of {width} numbers, got {row}"
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in row):
+                return None, f"Error: item {index} has a non numeric value: {row}"
+            transient.values.extend(row)
+
+        return transient, None
+
+    def __len__(self):
+        return len(self.values) // self.width
+
+    def row(self, index: int) -> tuple:
+        start = index * self.width
+        return tuple(self.values[start:start + self.width])
+
+    def rows(self):
+        width = self.width
+        values = self.values
+        for start in range(0, len(values), width):
+            yield values[start:start + width]
+
+    def item(self, index: int):
+        """adsk object for item index, negative indexes count from the end, None when out of range"""
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            return None
+        return self._factory(self.row(index))
+
+    def items(self):
+        """adsk objects for every item, created one at a time"""
+        for row in self.rows():
+            yield self._factory(row)
+
+    def summary(self, token: str) -> dict:
+        """tool response for a new array, the first and last rows instead of every item"""
+        count = len(self)
+        result = {
+            "arrayToken": token,
+            "objectType": self.kind,
+            "count": count,
+            "itemToken": f"{token}[i]",
+        }
+        if count:
+            result["first"] = list(self.row(0))
+            result["last"] = list(self.row(count - 1))
+        return result
+
+
+def identity_matrix() -> list:
+    return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+def translation_matrix(vector: list) -> list:
+    matrix = identity_matrix()
+    matrix[3], matrix[7], matrix[11] = vector
+    return matrix
+
+
+def rotation_matrix(axis_point: list, axis_direction: list, angle: float) -> list:
+    """rotation by angle (radians) about the axis through axis_point, row major 4x4"""
+    length = math.sqrt(sum(v * v for v in axis_direction))
+    x, y, z = (v / length for v in axis_direction)
+    c = math.cos(angle)
+    s = math.sin(angle)
+    t = 1 - c
+    r = [
+        t * x * x + c, t * x * y - s * z, t * x * z + s * y,
+        t * x * y + s * z, t * y * y + c, t * y * z - s * x,
+        t * x * z - s * y, t * y * z + s * x, t * z * z + c,
+    ]
+    # p' = R (p - a) + a
+    px, py, pz = axis_point
+    offset = [
+        p - (r[i * 3] * px + r[i * 3 + 1] * py + r[i * 3 + 2] * pz)
+        for i, p in enumerate((px, py, pz))
+    ]
+    return [
+        r[0], r[1], r[2], offset[0],
+        r[3], r[4], r[5], offset[1],
+        r[6], r[7], r[8], offset[2],
+        0.0, 0.0, 0.0, 1.0,
+    ]
+
+
+def transformed(transient: TransientArray, matrix: list) -> array:
+    """
+    values of every item transformed by a row major 4x4 matrix: points get
+    the full transform, vectors the rotation/scale part and matrices are
+    multiplied on the left (matrix * item), like Matrix3D.transformBy
+    """
+    values = transient.values
+    if not values:
+        return array("d")
+
+    if np is not None:
+        m = np.asarray(matrix, dtype=np.float64).reshape(4, 4)
+        items = np.frombuffer(values, dtype=np.float64).reshape(-1, transient.width)
+        if transient.kind == "Point3D":
+            out = items @ m[:3, :3].T + m[:3, 3]
+        elif transient.kind == "Vector3D":
+            out = items @ m[:3, :3].T
+        else:
+            out = np.matmul(m, items.reshape(-1, 4, 4)).reshape(-1, 16)
+        return array("d", out.tobytes())
+
+    m = matrix
+    out = array("d")
+    if transient.kind in ("Point3D", "Vector3D"):
+        w = 1.0 if transient.kind == "Point3D" else 0.0
+        for x, y, z in transient.rows():
+            out.extend((
+                m[0] * x + m[1] * y + m[2] * z + m[3] * w,
+                m[4] * x + m[5] * y + m[6] * z + m[7] * w,
+                m[8] * x + m[9] * y + m[10] * z + m[11] * w,
+            ))
+    else:
+        for b in transient.rows():
+            out.extend(
+                sum(m[r * 4 + k] * b[k * 4 + c] for k in range(4))
+                for r in range(4) for c in range(4)
+            )
+    return out
+
+
+def patterned(transient: TransientArray, matrices: list) -> TransientArray:
+    """every item transformed by each matrix, one copy of the array per matrix in order"""
+    result = TransientArray(transient.kind)
+    for matrix in matrices:
+        result.values.extend(transformed(transient, matrix))
+    return result
+
+
+def grid(origin: list, counts: list, spacing: list) -> TransientArray:
+    """Point3D grid, the x index varies slowest and z fastest"""
+    nx, ny, nz = counts
+    ox, oy, oz = origin
+    sx, sy, sz = spacing
+    result = TransientArray("Point3D")
+
+    if np is not None:
+        ix, iy, iz = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing="ij")
+        points = np.stack([ox + ix.ravel() * sx, oy + iy.ravel() * sy, oz + iz.ravel() * sz], axis=1)
+        result.values = array("d", points.astype(np.float64).tobytes())
+        return result
+
+    values = result.values
+    for i in range(nx):
+        x = ox + i * sx
+        for j in range(ny):
+            y = oy + j * sy
+            for k in range(nz):
+                values.extend((x, y, oz + k * sz))
+    return result
+
+
+def in_box(transient: TransientArray, min_point: list, max_point: list, inside: bool = True) -> TransientArray:
+    """points or vectors inside (or outside) an axis aligned box, bounds included"""
+    result = TransientArray(transient.kind)
+    if not transient.values:
+        return result
+
+    if np is not None:
+        items = np.frombuffer(transient.values, dtype=np.float64).reshape(-1, 3)
+        mask = np.all((items >= min_point) & (items <= max_point), axis=1)
+        if not inside:
+            mask = ~mask
+        result.values = array("d", items[mask].tobytes())
+        return result
+
+    (x0, y0, z0), (x1, y1, z1) = min_point, max_point
+    for x, y, z in transient.rows():
+        if (x0 <= x <= x1 and y0 <= y <= y1 and z0 <= z <= z1) == inside:
+            result.values.extend((x, y, z))
+    return result
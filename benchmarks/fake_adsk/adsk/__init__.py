@@ -0,0 +1,10 @@
+"""
+Fake adsk package used by the offline benchmarks, shadows the Fusion 360
+adsk package when benchmarks/fake_adsk is first on sys.path.
+"""
+from . import core, fusion, cam
+
+
+def doEvents():
+    """no event loop to service"""
+    return True
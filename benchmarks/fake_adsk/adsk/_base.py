@@ -0,0 +1,93 @@
+"""
+shared base classes for the fake adsk modules
+"""
+
+
+class _PlaceholderMeta(type):
+    """
+    enum style class attributes that are not defined explicitly,
+    e.g adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
+    resolve to a stable string
+    """
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return f"{cls.__name__}.{name}"
+
+
+class Base(metaclass=_PlaceholderMeta):
+    """
+    base for all fake API objects
+    """
+    _namespace = "core"
+
+    isValid = True
+
+    @classmethod
+    def cast(cls, obj):
+        return obj if isinstance(obj, cls) else None
+
+    @classmethod
+    def classType(cls):
+        return f"adsk::{cls._namespace}::{cls.__name__}"
+
+    @property
+    def objectType(self):
+        return self.classType()
+
+
+class Collection(Base):
+    """
+    Fusion style collection, supports count, item(), itemByName() and iteration
+    """
+
+    def __init__(self, items=None):
+        self._items = list(items) if items else []
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def item(self, index):
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+
+    def itemByName(self, name):
+        for obj in self._items:
+            if getattr(obj, "name", None) == name:
+                return obj
+        return None
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def _append(self, obj):
+        """fake only, used by the synthetic design builder"""
+        self._items.append(obj)
+        return obj
+
+
+def placeholder_factory(namespace):
+    """
+    module level __getattr__, any class not defined in the fake module
+    resolves to an empty placeholder class so imports and isinstance checks work
+    """
+    placeholders = {}
+
+    def __getattr__(name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        cls = placeholders.get(name)
+        if cls is None:
+            cls = type(name, (Base,), {"_namespace": namespace})
+            placeholders[name] = cls
+        return cls
+
+    return __getattr__
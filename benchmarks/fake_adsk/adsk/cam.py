@@ -0,0 +1,6 @@
+"""
+Pure Python stand in for adsk.cam, placeholder classes only
+"""
+from ._base import placeholder_factory
+
+__getattr__ = placeholder_factory("cam")
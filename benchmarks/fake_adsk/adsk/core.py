@@ -0,0 +1,444 @@
+"""
+Pure Python stand in for adsk.core, covers the parts of the API used by
+the add-in modules. Objects hold plain values, no geometry is computed
+beyond simple vector math.
+"""
+import math
+
+from ._base import Base, Collection, placeholder_factory
+
+__getattr__ = placeholder_factory("core")
+
+
+class LogLevels(Base):
+    InfoLogLevel = 0
+    WarningLogLevel = 1
+    ErrorLogLevel = 2
+
+
+class LogTypes(Base):
+    ConsoleLogType = 0
+    FileLogType = 1
+
+
+class Event(Base):
+    def add(self, handler):
+        return True
+
+    def remove(self, handler):
+        return True
+
+
+class ObjectCollection(Collection):
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    @staticmethod
+    def createWithArray(array):
+        return ObjectCollection(array)
+
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    def clear(self):
+        self._items = []
+        return True
+
+    def contains(self, item):
+        return item in self._items
+
+    def find(self, item, startIndex=0):
+        try:
+            return self._items.index(item, startIndex)
+        except ValueError:
+            return -1
+
+    def removeByIndex(self, index):
+        if 0 <= index < len(self._items):
+            self._items.pop(index)
+            return True
+        return False
+
+    def removeByItem(self, item):
+        if item in self._items:
+            self._items.remove(item)
+            return True
+        return False
+
+
+class Point3D(Base):
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Point3D(x, y, z)
+
+    def copy(self):
+        return Point3D(self.x, self.y, self.z)
+
+    def asArray(self):
+        return [self.x, self.y, self.z]
+
+    def distanceTo(self, point):
+        return math.dist(self.asArray(), point.asArray())
+
+    def isEqualTo(self, point):
+        return self.asArray() == point.asArray()
+
+    def vectorTo(self, point):
+        return Vector3D(point.x - self.x, point.y - self.y, point.z - self.z)
+
+    def translateBy(self, vector):
+        self.x += vector.x
+        self.y += vector.y
+        self.z += vector.z
+        return True
+
+    def transformBy(self, matrix):
+        m = matrix._data
+        x, y, z = self.x, self.y, self.z
+        self.x = m[0] * x + m[1] * y + m[2] * z + m[3]
+        self.y = m[4] * x + m[5] * y + m[6] * z + m[7]
+        self.z = m[8] * x + m[9] * y + m[10] * z + m[11]
+        return True
+
+
+class Point2D(Base):
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def create(x=0.0, y=0.0):
+        return Point2D(x, y)
+
+    def copy(self):
+        return Point2D(self.x, self.y)
+
+    def asArray(self):
+        return [self.x, self.y]
+
+
+class Vector3D(Base):
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def create(x=0.0, y=0.0, z=0.0):
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self):
+        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+
+    def copy(self):
+        return Vector3D(self.x, self.y, self.z)
+
+    def asArray(self):
+        return [self.x, self.y, self.z]
+
+    def asPoint(self):
+        return Point3D(self.x, self.y, self.z)
+
+    def normalize(self):
+        length = self.length
+        if length == 0:
+            return False
+        self.x /= length
+        self.y /= length
+        self.z /= length
+        return True
+
+    def scaleBy(self, scale):
+        self.x *= scale
+        self.y *= scale
+        self.z *= scale
+        return True
+
+    def add(self, vector):
+        self.x += vector.x
+        self.y += vector.y
+        self.z += vector.z
+        return True
+
+    def dotProduct(self, vector):
+        return self.x * vector.x + self.y * vector.y + self.z * vector.z
+
+    def crossProduct(self, vector):
+        return Vector3D(
+            self.y * vector.z - self.z * vector.y,
+            self.z * vector.x - self.x * vector.z,
+            self.x * vector.y - self.y * vector.x,
+        )
+
+    def angleTo(self, vector):
+        denom = self.length * vector.length
+        if denom == 0:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, self.dotProduct(vector) / denom)))
+
+
+class Matrix3D(Base):
+    """4x4 row major matrix"""
+
+    def __init__(self):
+        self._data = [
+            1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        ]
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    def copy(self):
+        m = Matrix3D()
+        m._data = list(self._data)
+        return m
+
+    def asArray(self):
+        return list(self._data)
+
+    def setWithArray(self, cells):
+        if len(cells) != 16:
+            return False
+        self._data = [float(c) for c in cells]
+        return True
+
+    def getCell(self, row, column):
+        return self._data[row * 4 + column]
+
+    def setCell(self, row, column, value):
+        self._data[row * 4 + column] = value
+        return True
+
+    @property
+    def translation(self):
+        return Vector3D(self._data[3], self._data[7], self._data[11])
+
+    @translation.setter
+    def translation(self, vector):
+        self._data[3] = vector.x
+        self._data[7] = vector.y
+        self._data[11] = vector.z
+
+    def transformBy(self, matrix):
+        a = matrix._data
+        b = self._data
+        self._data = [
+            sum(a[r * 4 + k] * b[k * 4 + c] for k in range(4))
+            for r in range(4) for c in range(4)
+        ]
+        return True
+
+    def setToIdentity(self):
+        self._data = Matrix3D()._data
+        return True
+
+
+class Matrix2D(Base):
+    """3x3 row major matrix"""
+
+    def __init__(self):
+        self._data = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+
+    @staticmethod
+    def create():
+        return Matrix2D()
+
+    def asArray(self):
+        return list(self._data)
+
+    def setWithArray(self, cells):
+        if len(cells) != 9:
+            return False
+        self._data = [float(c) for c in cells]
+        return True
+
+
+class Line3D(Base):
+
+    def __init__(self, startPoint, endPoint):
+        self.startPoint = startPoint
+        self.endPoint = endPoint
+
+
+class Circle3D(Base):
+
+    def __init__(self, center, normal, radius):
+        self.center = center
+        self.normal = normal
+        self.radius = radius
+
+
+class Arc3D(Circle3D): pass
+
+
+class Plane(Base):
+
+    def __init__(self, origin, normal):
+        self.origin = origin
+        self.normal = normal
+
+
+class Cylinder(Base):
+
+    def __init__(self, origin, axis, radius):
+        self.origin = origin
+        self.axis = axis
+        self.radius = radius
+
+
+class BoundingBox3D(Base):
+
+    def __init__(self, minPoint=None, maxPoint=None):
+        self.minPoint = minPoint or Point3D()
+        self.maxPoint = maxPoint or Point3D()
+
+    @staticmethod
+    def create(minPoint, maxPoint):
+        return BoundingBox3D(minPoint.copy(), maxPoint.copy())
+
+    def contains(self, point):
+        return all(
+            lo <= v <= hi for lo, v, hi in
+            zip(self.minPoint.asArray(), point.asArray(), self.maxPoint.asArray())
+        )
+
+    def intersects(self, box):
+        return all(
+            a_lo <= b_hi and b_lo <= a_hi for a_lo, a_hi, b_lo, b_hi in
+            zip(self.minPoint.asArray(), self.maxPoint.asArray(), box.minPoint.asArray(), box.maxPoint.asArray())
+        )
+
+    def copy(self):
+        return BoundingBox3D(self.minPoint.copy(), self.maxPoint.copy())
+
+
+class OrientedBoundingBox3D(Base):
+
+    def __init__(self, centerPoint, lengthDirection, widthDirection, length, width, height):
+        self.centerPoint = centerPoint
+        self.lengthDirection = lengthDirection
+        self.widthDirection = widthDirection
+        self.length = length
+        self.width = width
+        self.height = height
+
+    @staticmethod
+    def create(centerPoint, lengthDirection, widthDirection, length, width, height):
+        return OrientedBoundingBox3D(centerPoint.copy(), lengthDirection.copy(), widthDirection.copy(), length, width, height)
+
+class ValueInput(Base):
+
+    def __init__(self, realValue=None, stringValue=None):
+        self.realValue = realValue
+        self.stringValue = stringValue
+
+    @staticmethod
+    def createByReal(value):
+        return ValueInput(realValue=float(value))
+
+    @staticmethod
+    def createByString(value):
+        return ValueInput(stringValue=str(value))
+
+    @staticmethod
+    def createByObject(value):
+        return ValueInput(stringValue=str(value))
+
+
+class Document(Base):
+
+    def __init__(self, name="Untitled", products=None):
+        self.name = name
+        self.products = products or Collection()
+        self.isSaved = True
+
+
+class Palette(Base):
+
+    def __init__(self, palette_id):
+        self.id = palette_id
+        self.isVisible = True
+        self.n_messages = 0
+
+    def sendInfoToHTML(self, action, data):
+        self.n_messages += 1
+        return ""
+
+    def setSize(self, width, height):
+        return True
+
+
+class Palettes(Collection):
+
+    def itemById(self, palette_id):
+        for palette in self._items:
+            if palette.id == palette_id:
+                return palette
+        return self._append(Palette(palette_id))
+
+
+class UserInterface(Base):
+
+    def __init__(self):
+        self.palettes = Palettes()
+
+    def messageBox(self, text, *args):
+        return 0
+
+
+class MaterialLibrary(Base):
+
+    def __init__(self, name, appearances=None, materials=None):
+        self.name = name
+        self.appearances = appearances or Collection()
+        self.materials = materials or Collection()
+
+
+class MaterialLibraries(Collection):
+    pass
+
+
+class Application(Base):
+    """
+    singleton, the synthetic design is set as the active product
+    """
+    _instance = None
+
+    def __init__(self):
+        self.userInterface = UserInterface()
+        self.activeProduct = None
+        self.activeDocument = None
+        self.materialLibraries = MaterialLibraries()
+        self.version = "2.0.00000"
+
+    @staticmethod
+    def get():
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    def log(self, message, level=None, log_type=None):
+        return True
+
+    def _set_design(self, design, material_libraries=None):
+        """fake only, set the active design"""
+        self.activeProduct = design
+        self.activeDocument = design.parentDocument
+        if material_libraries is not None:
+            self.materialLibraries = material_libraries
@@ -0,0 +1,705 @@
+"""
+Pure Python stand in for adsk.fusion, design/component/occurrence/body/sketch
+objects with plain attributes. Build instances with benchmarks/synthetic.py.
+"""
+import math
+import random
+
+from . import core
+from ._base import Base, Collection, placeholder_factory
+
+__getattr__ = placeholder_factory("fusion")
+
+
+class FusionBase(Base):
+    _namespace = "fusion"
+
+
+class FusionCollection(Collection):
+    _namespace = "fusion"
+
+
+# collections
+class Components(FusionCollection): pass
+class Occurrences(FusionCollection): pass
+class OccurrenceList(FusionCollection): pass
+class BRepEdges(FusionCollection): pass
+class BRepFaces(FusionCollection): pass
+class BRepVertices(FusionCollection): pass
+class Sketches(FusionCollection): pass
+class Profiles(FusionCollection): pass
+class SketchCurves(FusionCollection): pass
+class SketchLines(FusionCollection): pass
+class SketchPoints(FusionCollection): pass
+class SketchDimensions(FusionCollection): pass
+class JointOrigins(FusionCollection): pass
+class JointList(FusionCollection): pass
+class JointOriginList(FusionCollection): pass
+class AsBuiltJoints(FusionCollection): pass
+class AsBuiltJointList(FusionCollection): pass
+class RigidGroups(FusionCollection): pass
+class RigidGroupList(FusionCollection): pass
+class ParameterList(FusionCollection): pass
+class UserParameters(FusionCollection): pass
+
+
+class TimelineGroups(FusionCollection):
+
+    def __init__(self, timeline):
+        super().__init__()
+        self._timeline = timeline
+
+    def add(self, startIndex, endIndex):
+        if not 0 <= startIndex <= endIndex < self._timeline.count:
+            raise RuntimeError(f"invalid timeline range {startIndex}-{endIndex}")
+        group = TimelineGroup(f"Group{self.count + 1}", self._timeline._items[startIndex:endIndex + 1])
+        return self._append(group)
+
+
+class Timeline(FusionCollection):
+
+    def __init__(self, items=None):
+        super().__init__(items)
+        self.markerPosition = len(self._items)
+        self.timelineGroups = TimelineGroups(self)
+
+    def _append(self, obj):
+        obj.index = len(self._items)
+        super()._append(obj)
+        self.markerPosition = len(self._items)
+        return obj
+
+
+class TimelineObject(FusionBase):
+
+    def __init__(self, name, entity=None):
+        self.name = name
+        self.entity = entity
+        self.index = 0
+        self.isSuppressed = False
+        self.isRolledBack = False
+        self.isGroup = False
+
+
+class TimelineGroup(FusionBase):
+
+    def __init__(self, name, items):
+        self.name = name
+        self._items = items
+        self.isGroup = True
+        self.isCollapsed = True
+
+    @property
+    def count(self):
+        return len(self._items)
+
+
+class Appearance(FusionBase):
+
+    def __init__(self, name, appearance_id):
+        self.name = name
+        self.id = appearance_id
+
+
+class Material(FusionBase):
+
+    def __init__(self, name, material_id, density=1.0):
+        self.name = name
+        self.id = material_id
+        self.density = density
+
+
+class Parameter(FusionBase):
+
+    def __init__(self, name, value, unit="mm", comment=""):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.comment = comment
+        self.expression = f"{value * 10:g} {unit}"
+        self.isFavorite = False
+
+
+class ModelParameter(Parameter): pass
+class UserParameter(Parameter): pass
+
+
+class ConstructionAxis(FusionBase):
+
+    def __init__(self, name, entity_token, parent_component):
+        self.name = name
+        self.entityToken = entity_token
+        self.component = parent_component
+        self.isVisible = False
+
+
+class ConstructionPlane(FusionBase):
+
+    def __init__(self, name, entity_token, parent_component):
+        self.name = name
+        self.entityToken = entity_token
+        self.component = parent_component
+        self.isLightBulbOn = False
+
+
+def _placement(entity_token):
+    """stable point and axis direction for an entity, seeded by its token"""
+    rng = random.Random(entity_token)
+    point = core.Point3D(*[round(rng.uniform(-10, 10), 3) for _ in range(3)])
+    axis = core.Vector3D(*rng.choice([(1, 0, 0), (0, 1, 0), (0, 0, 1)]))
+    return point, axis
+
+
+class BRepEdge(FusionBase):
+
+    def __init__(self, entity_token, length, body, temp_id):
+        self.entityToken = entity_token
+        self.length = length
+        self.body = body
+        self.tempId = temp_id
+        self.isDegenerate = False
+
+    @property
+    def geometry(self):
+        """every third edge is a circle of the edge's length, the rest are lines"""
+        point, axis = _placement(self.entityToken)
+        if self.tempId % 3 == 0:
+            return core.Circle3D(point, axis, round(self.length / (2 * math.pi), 4))
+        end = point.copy()
+        end.translateBy(core.Vector3D(axis.x * self.length, axis.y * self.length, axis.z * self.length))
+        return core.Line3D(point, end)
+
+
+class BRepFace(FusionBase):
+
+    def __init__(self, entity_token, area, body, temp_id):
+        self.entityToken = entity_token
+        self.area = area
+        self.body = body
+        self.tempId = temp_id
+        self.isParamReversed = False
+        self.edges = BRepEdges()
+
+    @property
+    def geometry(self):
+        """even faces are planar, odd faces cylindrical"""
+        point, axis = _placement(self.entityToken)
+        if self.tempId % 2 == 0:
+            return core.Plane(point, axis)
+        return core.Cylinder(point, axis, round(math.sqrt(self.area), 4))
+
+    @property
+    def boundingBox(self):
+        point, _ = _placement(self.entityToken)
+        size = math.sqrt(self.area) / 2
+        return core.BoundingBox3D(
+            core.Point3D(point.x - size, point.y - size, point.z - size),
+            core.Point3D(point.x + size, point.y + size, point.z + size),
+        )
+
+
+class BRepBody(FusionBase):
+
+    def __init__(self, name, entity_token, parent_component):
+        self.name = name
+        self.entityToken = entity_token
+        self.parentComponent = parent_component
+        self.assemblyContext = None
+        self.edges = BRepEdges()
+        self.faces = BRepFaces()
+        self.vertices = BRepVertices()
+        self.volume = 0.0
+        self.area = 0.0
+        self.isSolid = True
+        self.isVisible = True
+        self.isLightBulbOn = True
+        self.isSelectable = True
+        self.appearance = None
+        self.material = None
+        self.boundingBox = core.BoundingBox3D()
+        self.revisionId = entity_token[:8]
+
+
+
+class BRepBodies(FusionCollection):
+
+    def __init__(self, items=None, component=None):
+        super().__init__(items)
+        # owning component, bodies can only be added to component.bRepBodies
+        self._component = component
+
+    def add(self, body, targetBaseFeature=None):
+        comp = self._component
+        n = self.count + 1
+        new_body = BRepBody(f"Body{n}", f"{comp.entityToken}/body/{n}", comp)
+        new_body.boundingBox = body.boundingBox.copy()
+        self._append(new_body)
+        if targetBaseFeature is not None:
+            targetBaseFeature.bodies._append(new_body)
+        return new_body
+
+
+class TemporaryBody(FusionBase):
+    """temporary bodies are only their bounding box and lump count"""
+
+    def __init__(self, min_point, max_point):
+        self.boundingBox = core.BoundingBox3D(core.Point3D(*min_point), core.Point3D(*max_point))
+        self.lumpCount = 1
+
+
+class TemporaryBRepManager(FusionBase):
+
+    _instance = None
+
+    @staticmethod
+    def get():
+        if TemporaryBRepManager._instance is None:
+            TemporaryBRepManager._instance = TemporaryBRepManager()
+        return TemporaryBRepManager._instance
+
+    def createSphere(self, center, radius):
+        c = center.asArray()
+        return TemporaryBody([v - radius for v in c], [v + radius for v in c])
+
+    def createBox(self, box):
+        c = box.centerPoint.asArray()
+        half = (box.length / 2, box.width / 2, box.height / 2)
+        return TemporaryBody([v - h for v, h in zip(c, half)], [v + h for v, h in zip(c, half)])
+
+    def createCylinderOrCone(self, pointOne, pointOneRadius, pointTwo, pointTwoRadius):
+        radius = max(pointOneRadius, pointTwoRadius)
+        a, b = pointOne.asArray(), pointTwo.asArray()
+        return TemporaryBody([min(u, v) - radius for u, v in zip(a, b)], [max(u, v) + radius for u, v in zip(a, b)])
+
+    def booleanOperation(self, targetBody, toolBody, booleanType):
+        box = targetBody.boundingBox
+        tool_box = toolBody.boundingBox
+        box.minPoint = core.Point3D(*[min(u, v) for u, v in zip(box.minPoint.asArray(), tool_box.minPoint.asArray())])
+        box.maxPoint = core.Point3D(*[max(u, v) for u, v in zip(box.maxPoint.asArray(), tool_box.maxPoint.asArray())])
+        targetBody.lumpCount += toolBody.lumpCount
+        return True
+
+
+class BaseFeature(FusionBase):
+
+    def __init__(self, name, entity_token):
+        self.name = name
+        self.entityToken = entity_token
+        self.bodies = BRepBodies()
+        self.isSuppressed = False
+        self.isEditing = False
+
+    def startEdit(self):
+        self.isEditing = True
+        return True
+
+    def finishEdit(self):
+        self.isEditing = False
+        return True
+
+
+class BaseFeatures(FusionCollection):
+
+    def __init__(self, features):
+        super().__init__()
+        self._features = features
+
+    def add(self):
+        n = self.count + 1
+        feature = BaseFeature(f"Base Feature{n}", f"basefeature/{id(self)}/{n}")
+        self._append(feature)
+        self._features._append(feature)
+        return feature
+
+
+class Path(FusionBase):
+
+    def __init__(self, curves):
+        self._curves = list(curves)
+
+    @property
+    def count(self):
+        return len(self._curves)
+
+
+class PipeFeature(FusionBase):
+
+    def __init__(self, name, entity_token, path, operation, section_size):
+        self.name = name
+        self.entityToken = entity_token
+        self.path = path
+        self.operation = operation
+        self.sectionSize = section_size
+        self.bodies = BRepBodies()
+        self.isSuppressed = False
+
+
+class PipeFeatureInput(FusionBase):
+
+    def __init__(self, path, operation):
+        self.path = path
+        self.operation = operation
+        self.sectionSize = None
+
+
+class PipeFeatures(FusionCollection):
+
+    def __init__(self, features):
+        super().__init__()
+        self._features = features
+
+    def createInput(self, path, operation):
+        return PipeFeatureInput(path, operation)
+
+    def add(self, pipe_input):
+        n = self.count + 1
+        feature = PipeFeature(f"Pipe{n}", f"pipe/{id(self)}/{n}", pipe_input.path, pipe_input.operation, pipe_input.sectionSize)
+        self._append(feature)
+        self._features._append(feature)
+        return feature
+
+
+class OffsetStartDefinition(FusionBase):
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    @staticmethod
+    def create(offset):
+        return OffsetStartDefinition(offset)
+
+
+class ExtrudeFeatureInput(FusionBase):
+
+    def __init__(self, profiles, operation):
+        self.profile = profiles
+        self.operation = operation
+        self.startExtent = None
+        self.taperAngle = None
+        self.distance = None
+
+    def setDistanceExtent(self, isSymmetric, distance):
+        self.distance = distance
+        return True
+
+
+class ExtrudeFeatures(FusionCollection):
+
+    def __init__(self, features):
+        super().__init__()
+        self._features = features
+
+    def createInput(self, profile, operation):
+        return ExtrudeFeatureInput(profile, operation)
+
+    def add(self, extrude_input):
+        """one new body per profile for new body operations"""
+        if extrude_input.distance is None:
+            raise RuntimeError("no extent set")
+        n = self.count + 1
+        bodies = BRepBodies()
+        if extrude_input.operation == "FeatureOperations.NewBodyFeatureOperation":
+            comp = self._features._component
+            for _ in extrude_input.profile:
+                bodies._append(comp.bRepBodies.add(TemporaryBody([0, 0, 0], [1, 1, 1])))
+        feature = ExtrudeFeature(f"Extrude{n}", f"extrude/{id(self)}/{n}", bodies)
+        self._append(feature)
+        self._features._append(feature)
+        return feature
+
+
+class Features(FusionCollection):
+
+    def __init__(self, component=None):
+        super().__init__()
+        self._component = component
+        self.baseFeatures = BaseFeatures(self)
+        self.pipeFeatures = PipeFeatures(self)
+        self.extrudeFeatures = ExtrudeFeatures(self)
+
+    def createPath(self, curves, isChain=True):
+        """curves must be connected end to end in order, like a sweep path"""
+        curves = list(curves) if hasattr(curves, "__iter__") else [curves]
+        ends = None
+        for curve in curves:
+            points = {curve.startSketchPoint, curve.endSketchPoint}
+            if ends is not None and not ends & points:
+                raise RuntimeError("path curves are not connected")
+            ends = points - (ends or set()) or points
+        return Path(curves)
+
+    def _append(self, feature):
+        super()._append(feature)
+        design = getattr(self._component, "parentDesign", None)
+        if design is not None:
+            design.timeline._append(TimelineObject(feature.name, feature))
+        return feature
+
+class SketchPoint(FusionBase):
+
+    def __init__(self, entity_token, geometry, parent_sketch):
+        self.entityToken = entity_token
+        self.geometry = geometry
+        self.worldGeometry = geometry.copy()
+        self.parentSketch = parent_sketch
+
+
+class SketchCurve(FusionBase):
+
+    def __init__(self, entity_token, length, parent_sketch):
+        self.entityToken = entity_token
+        self.length = length
+        self.parentSketch = parent_sketch
+        self.isConstruction = False
+        self.isFixed = False
+
+
+class SketchLine(SketchCurve):
+
+    def __init__(self, entity_token, start_point, end_point, parent_sketch):
+        length = start_point.geometry.distanceTo(end_point.geometry)
+        super().__init__(entity_token, length, parent_sketch)
+        self.startSketchPoint = start_point
+        self.endSketchPoint = end_point
+
+
+class Profile(FusionBase):
+
+    def __init__(self, entity_token, area, parent_sketch):
+        self.entityToken = entity_token
+        self.area = area
+        self.parentSketch = parent_sketch
+        self.profileLoops = Collection()
+
+
+class Sketch(FusionBase):
+
+    def __init__(self, name, entity_token, parent_component):
+        self.name = name
+        self.entityToken = entity_token
+        self.parentComponent = parent_component
+        self.assemblyContext = None
+        self.profiles = Profiles()
+        self.sketchCurves = SketchCurves()
+        self.sketchPoints = SketchPoints()
+        self.sketchDimensions = SketchDimensions()
+        self.revisionId = entity_token[:8]
+        self.isVisible = True
+        self.isLightBulbOn = True
+        self.isComputeDeferred = False
+        self.referencePlane = None
+
+    def sketchToModelSpace(self, sketchCoordinate):
+        """sketches are built on the XY plane, sketch and model space match"""
+        return sketchCoordinate.copy()
+
+
+class Joint(FusionBase):
+
+    def __init__(self, name, entity_token, occurrence_one=None, occurrence_two=None):
+        self.name = name
+        self.entityToken = entity_token
+        self.occurrenceOne = occurrence_one
+        self.occurrenceTwo = occurrence_two
+        self.isSuppressed = False
+        self.isLightBulbOn = True
+
+
+class AsBuiltJoint(Joint): pass
+
+
+class JointInput(FusionBase):
+
+    def __init__(self, geometry_one, geometry_two):
+        self.geometryOrOriginOne = geometry_one
+        self.geometryOrOriginTwo = geometry_two
+        self.jointMotion = None
+
+    def setAsRigidJointMotion(self):
+        self.jointMotion = "RigidJointMotion"
+        return True
+
+    def setAsRevoluteJointMotion(self, rotation_axis, custom_rotation_axis_entity=None):
+        self.jointMotion = "RevoluteJointMotion"
+        return True
+
+    def setAsSliderJointMotion(self, slide_direction, custom_slide_direction_entity=None):
+        self.jointMotion = "SliderJointMotion"
+        return True
+
+    def setAsCylindricalJointMotion(self, rotation_axis, custom_rotation_axis_entity=None):
+        self.jointMotion = "CylindricalJointMotion"
+        return True
+
+    def setAsPinSlotJointMotion(self, rotation_axis, slide_direction, custom_rotation_axis_entity=None, custom_slide_direction_entity=None):
+        self.jointMotion = "PinSlotJointMotion"
+        return True
+
+    def setAsPlanarJointMotion(self, normal_direction, custom_normal_direction_entity=None, custom_primary_slide_direction_entity=None):
+        self.jointMotion = "PlanarJointMotion"
+        return True
+
+    def setAsBallJointMotion(self, pitch_direction, yaw_direction, custom_pitch_direction_entity=None, custom_yaw_direction_entity=None):
+        self.jointMotion = "BallJointMotion"
+        return True
+
+
+class Joints(FusionCollection):
+
+    def createInput(self, geometry_one, geometry_two):
+        return JointInput(geometry_one, geometry_two)
+
+    def add(self, joint_input):
+        n = self.count + 1
+        joint = Joint(f"Joint{n}", f"joint/{id(self)}/{n}",
+                      joint_input.geometryOrOriginOne.assemblyContext,
+                      joint_input.geometryOrOriginTwo.assemblyContext)
+        self._append(joint)
+        return joint
+
+
+class JointOrigin(FusionBase):
+
+    def __init__(self, name, entity_token, parent_component):
+        self.name = name
+        self.entityToken = entity_token
+        self.parentComponent = parent_component
+        self.assemblyContext = None
+        self.isLightBulbOn = True
+
+
+class RigidGroup(FusionBase):
+
+    def __init__(self, name, entity_token, occurrences=None):
+        self.name = name
+        self.entityToken = entity_token
+        self.occurrences = occurrences or OccurrenceList()
+        self.isSuppressed = False
+
+
+class ExtrudeFeature(FusionBase):
+
+    def __init__(self, name, entity_token, bodies=None):
+        self.name = name
+        self.entityToken = entity_token
+        self.bodies = bodies or BRepBodies()
+        self.isSuppressed = False
+
+
+class Component(FusionBase):
+
+    def __init__(self, name, component_id, entity_token, parent_design):
+        self.name = name
+        self.id = component_id
+        self.entityToken = entity_token
+        self.parentDesign = parent_design
+        self.description = ""
+        self.partNumber = name
+        self.material = None
+        self.opacity = 1.0
+        self.isBodiesFolderLightBulbOn = True
+        self.isSketchFolderLightBulbOn = True
+
+        self.bRepBodies = BRepBodies(component=self)
+        self.features = Features(self)
+        self.sketches = Sketches()
+        self.joints = Joints()
+        self.asBuiltJoints = AsBuiltJoints()
+        self.jointOrigins = JointOrigins()
+        self.rigidGroups = RigidGroups()
+        self.occurrences = Occurrences()
+
+        for axis in ["x", "y", "z"]:
+            setattr(self, f"{axis}ConstructionAxis",
+                    ConstructionAxis(f"{axis.upper()} Axis", f"{entity_token}_{axis}", self))
+        for plane in ["xY", "xZ", "yZ"]:
+            setattr(self, f"{plane}ConstructionPlane",
+                    ConstructionPlane(f"{plane.upper()} Plane", f"{entity_token}_{plane}", self))
+
+        # root component only, set by the design builder
+        self.allOccurrences = OccurrenceList()
+        self.allJoints = JointList()
+        self.allJointOrigins = JointOriginList()
+        self.allAsBuiltJoints = AsBuiltJointList()
+        self.allRigidGroups = RigidGroupList()
+
+    @property
+    def boundingBox(self):
+        boxes = [b.boundingBox for b in self.bRepBodies]
+        if not boxes:
+            return core.BoundingBox3D()
+        return core.BoundingBox3D(
+            core.Point3D(*[min(b.minPoint.asArray()[i] for b in boxes) for i in range(3)]),
+            core.Point3D(*[max(b.maxPoint.asArray()[i] for b in boxes) for i in range(3)]),
+        )
+
+
+class Occurrence(FusionBase):
+    """
+    occurrences in allOccurrences/childOccurrences are proxies, one per
+    path through the assembly, each with its own entityToken
+    """
+
+    def __init__(self, name, entity_token, component, assembly_context=None):
+        self.name = name
+        self.entityToken = entity_token
+        self.component = component
+        self.assemblyContext = assembly_context
+        self.sourceComponent = assembly_context.component if assembly_context else None
+        self.childOccurrences = OccurrenceList()
+        self.transform = core.Matrix3D()
+        self.transform2 = self.transform
+        self.isLightBulbOn = True
+        self.isVisible = True
+        self.isGrounded = False
+        self.isReferencedComponent = False
+        self.appearance = None
+        self.nativeObject = None
+
+    @property
+    def fullPathName(self):
+        if self.assemblyContext is None:
+            return self.name
+        return f"{self.assemblyContext.fullPathName}+{self.name}"
+
+    @property
+    def bRepBodies(self):
+        return self.component.bRepBodies
+
+    @property
+    def sketches(self):
+        return self.component.sketches
+
+    @property
+    def boundingBox(self):
+        return self.component.boundingBox
+
+
+class Design(FusionBase):
+
+    def __init__(self, name="Untitled"):
+        self.parentDocument = core.Document(name)
+        self.rootComponent = None
+        self.allComponents = Components()
+        self.allParameters = ParameterList()
+        self.userParameters = UserParameters()
+        self.timeline = Timeline()
+        self.designType = "DesignTypes.ParametricDesignType"
+        self.isRootComponentActive = True
+        self._isComputeDeferred = False
+        # recomputes triggered by turning isComputeDeferred off
+        self.n_computes = 0
+
+    @property
+    def isComputeDeferred(self):
+        return self._isComputeDeferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value):
+        if self._isComputeDeferred and not value:
+            self.n_computes += 1
+        self._isComputeDeferred = value
+
+    @property
+    def activeComponent(self):
+        return self.rootComponent
@@ -0,0 +1,115 @@
+"""
+Loads the Fusion-GPT-Addin package against the fake adsk package and a
+synthetic design, so add-in code can run on a plain Python install.
+"""
+import os
+import sys
+import importlib
+import importlib.util
+import contextlib
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+ADDIN_DIR = os.path.join(REPO_ROOT, "Fusion-GPT-Addin")
+FAKE_ADSK_DIR = os.path.join(BENCH_DIR, "fake_adsk")
+
+# import name for the add-in directory, which is not a valid identifier
+ADDIN_PACKAGE = "gpt_addin"
+
+# defaults match the checkbox state in index.html
+DEFAULT_SETTINGS = {
+    "log_results": True,
+    "log_errors": True,
+    "reload_object_index": False,
+    "index_sketch_children": False,
+    "index_brep_children": False,
+}
+
+
+def install_fake_adsk():
+    """put the fake adsk package first on sys.path"""
+    if FAKE_ADSK_DIR not in sys.path:
+        sys.path.insert(0, FAKE_ADSK_DIR)
+    if BENCH_DIR not in sys.path:
+        sys.path.insert(0, BENCH_DIR)
+
+    adsk_mod = sys.modules.get("adsk")
+    if adsk_mod is not None and not getattr(adsk_mod, "__file__", "").startswith(FAKE_ADSK_DIR):
+        raise RuntimeError(f"a different adsk package is already imported: {adsk_mod}")
+
+    import adsk.core
+    import adsk.fusion
+    import adsk.cam
+
+
+def load_addin_module(module_name: str):
+    """
+    import a module from the add-in directory, e.g "f_interface.fusion_interface"
+    """
+    if ADDIN_PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_loader(ADDIN_PACKAGE, loader=None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [ADDIN_DIR]
+        sys.modules[ADDIN_PACKAGE] = package
+
+    return importlib.import_module(f"{ADDIN_PACKAGE}.{module_name}")
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """add-in modules log everything through print, silence it while measuring"""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class BenchEnv:
+    """
+    synthetic design + FusionInterface instance
+    """
+
+    def __init__(self, preset: str = "small", seed: int = 0, settings: dict = None, **size_overrides):
+        if sys.version_info < (3, 12):
+            raise RuntimeError("Fusion-GPT-Addin requires Python 3.12+ (PEP 701 f-strings)")
+
+        install_fake_adsk()
+        import synthetic
+        import adsk.core
+
+        self.preset = preset
+        self.seed = seed
+        self.builder = synthetic.build_design(preset, seed, **size_overrides)
+        self.design = self.builder.design
+        self.sizes = self.builder.sizes
+        self.app = adsk.core.Application.get()
+
+        with quiet():
+            self.fusion_interface = load_addin_module("f_interface.fusion_interface")
+            self.shared = load_addin_module("f_interface.modules.shared")
+
+            self.apply_settings(dict(DEFAULT_SETTINGS, **(settings or {})))
+
+            self.fusion_interface.ent_dict.clear()
+            self.fusion_itf = self.fusion_interface.FusionInterface(self.app, self.app.userInterface)
+
+        # tool collections by class name, e.g self.tools["SQL"]
+        self.tools = {submod.__class__.__name__: submod for submod in self.fusion_itf.submodules}
+
+    def apply_settings(self, settings: dict):
+        """same path as fusion-setting inputs in the palette"""
+        for name, val in settings.items():
+            self.shared.ToolCollection.set_class_attr({"setting_name": name, "setting_val": val})
+
+    def counts(self) -> dict:
+        root = self.design.rootComponent
+        return {
+            "components": self.design.allComponents.count,
+            "occurrences": root.allOccurrences.count,
+            "bodies": sum(c.bRepBodies.count for c in self.design.allComponents),
+            "edges": sum(b.edges.count for c in self.design.allComponents for b in c.bRepBodies),
+            "sketches": sum(c.sketches.count for c in self.design.allComponents),
+            "parameters": self.design.allParameters.count,
+        }
@@ -0,0 +1,185 @@
+"""
+End to end load test of the connection.py <-> GptClient pipeline, no network
+and no Fusion 360. Each client gets its own in process Assistant server with
+the fake Assistants backend (oai_container/backends.py) and a GptClient running
+tool calls against a synthetic design.
+
+    python benchmarks/pipeline_load.py --scenario assembly_queries --time-scale 0
+    python benchmarks/pipeline_load.py --scenario tool_fan_out --concurrency 4 --turns 20
+
+Requires Python 3.12+, same as the add-in.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+from multiprocessing.connection import Listener
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness
+
+OAI_DIR = os.path.join(harness.REPO_ROOT, "oai_container")
+AUTHKEY = b'fusion260'
+
+# palette events that carry model output
+DELTA_ACTIONS = ("messageDelta", "stepDelta")
+
+
+def load_server_modules():
+    """connection.py and backends.py, imported from the oai_container directory"""
+    if OAI_DIR not in sys.path:
+        sys.path.insert(0, OAI_DIR)
+    import connection
+    import backends
+    return connection, backends
+
+
+class PipelineClient:
+    """
+    GptClient connected to its own in process server, records per turn timing
+    """
+
+    def __init__(self, env, connection, backends, scenario, time_scale, port):
+        self.gpt_client_mod = harness.load_addin_module("f_interface.gpt_client")
+        self.connection = connection
+
+        backend = backends.load_scenario_backend(scenario, time_scale)
+        self.assistant = connection.Assistant(assistant_id="asst_fake", backend=backend)
+
+        self.address = ("localhost", port)
+        self.listener = Listener(self.address, authkey=AUTHKEY)
+        ready = threading.Event()
+        self.server_thread = threading.Thread(target=self.serve, args=(ready,), daemon=True)
+        self.server_thread.start()
+        ready.wait()
+
+        self.client = self.gpt_client_mod.GptClient()
+        self.client.record_calls = False
+        self.client.server_address = self.address
+        # reuse the design wide FusionInterface
+        self.client.fusion_itf = env.fusion_itf
+
+        self.stats = []
+        self._turn = None
+        send_to_browser = self.client.sendToBrowser
+
+        def timed_send_to_browser(function_name, data):
+            turn = self._turn
+            if turn is not None:
+                turn["n_events"] += 1
+                if function_name in DELTA_ACTIONS and turn["first_delta_s"] is None:
+                    turn["first_delta_s"] = time.monotonic() - turn["start"]
+                if function_name == "toolCallResponse":
+                    turn["n_tool_calls"] += 1
+            return send_to_browser(function_name, data)
+
+        self.client.sendToBrowser = timed_send_to_browser
+
+    def serve(self, ready):
+        ready.set()
+        with self.listener:
+            with self.listener.accept() as conn:
+                self.connection.set_nodelay(conn)
+                try:
+                    self.assistant.run(conn)
+                except (EOFError, OSError):
+                    pass
+
+    def run_turns(self, messages: list, n_turns: int):
+        for index in range(n_turns):
+            self._turn = {"start": time.monotonic(), "first_delta_s": None, "n_events": 0, "n_tool_calls": 0}
+            self.client.send_message(messages[index % len(messages)])
+            turn = self._turn
+            turn["turn_s"] = time.monotonic() - turn["start"]
+            self.stats.append(turn)
+            self._turn = None
+
+    def close(self):
+        if self.client.connected:
+            self.client.conn.close()
+        self.server_thread.join(timeout=5)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def load_test(preset, scenario, time_scale, concurrency, n_turns, port):
+    env = harness.BenchEnv(preset)
+
+    messages = ["inspect the design", "find bolts and the largest bodies", "thanks"]
+
+    with harness.quiet():
+        connection, backends = load_server_modules()
+        clients = []
+        for i in range(concurrency):
+            clients.append(PipelineClient(env, connection, backends, scenario, time_scale, port + i))
+
+        threads = [threading.Thread(target=c.run_turns, args=(messages, n_turns)) for c in clients]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.monotonic() - start
+
+        for client in clients:
+            client.close()
+
+    # backend latency, merged over clients
+    metrics = connection.BackendMetrics(clients[0].assistant.backend.name)
+    for client in clients:
+        client_metrics = client.assistant.metrics
+        metrics.n_turns += client_metrics.n_turns
+        metrics.n_requests += client_metrics.n_requests
+        for name, values in client_metrics.samples.items():
+            metrics.samples[name].extend(values)
+
+    stats = [s for c in clients for s in c.stats]
+    turn_times = [s["turn_s"] for s in stats]
+    first_deltas = [s["first_delta_s"] for s in stats if s["first_delta_s"] is not None]
+    n_events = sum(s["n_events"] for s in stats)
+
+    return {
+        "preset": preset,
+        "scenario": scenario,
+        "time_scale": time_scale,
+        "concurrency": concurrency,
+        "turns": len(stats),
+        "tool_calls": sum(s["n_tool_calls"] for s in stats),
+        "palette_events": n_events,
+        "wall_s": round(wall, 4),
+        "events_per_s": round(n_events / wall, 1) if wall else None,
+        "turn_p50_ms": round(percentile(turn_times, 50) * 1000, 3),
+        "turn_p95_ms": round(percentile(turn_times, 95) * 1000, 3),
+        "turn_max_ms": round(max(turn_times, default=0.0) * 1000, 3),
+        "first_delta_mean_ms": round(statistics.fmean(first_deltas) * 1000, 3) if first_deltas else None,
+        "backend_metrics": metrics.summary(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="connection.py <-> GptClient pipeline load test")
+    parser.add_argument("--preset", default="small", help="synthetic design size")
+    parser.add_argument("--scenario", default="assembly_queries", help="scenario name or path")
+    parser.add_argument("--time-scale", type=float, default=0.0, help="scale simulated model latency, 0 = none")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--turns", type=int, default=9, help="user messages per client")
+    parser.add_argument("--port", type=int, default=6100, help="first server port, one per client")
+    args = parser.parse_args(argv)
+
+    results = load_test(args.preset, args.scenario, args.time_scale, args.concurrency, args.turns, args.port)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
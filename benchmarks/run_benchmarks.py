@@ -0,0 +1,196 @@
+"""
+Offline benchmark runner, no Fusion 360 required.
+
+    python benchmarks/run_benchmarks.py --preset medium
+    python benchmarks/run_benchmarks.py --preset large -k sql --save before.json
+    python benchmarks/run_benchmarks.py --preset large -k sql --compare before.json
+
+Requires Python 3.12+, same as the add-in.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness
+
+
+class Benchmark:
+    """
+    minimal pytest-benchmark style fixture:
+        result = benchmark(func, *args, **kwargs)
+        result = benchmark.pedantic(func, args=(), setup=None, rounds=5)
+    """
+
+    def __init__(self, name: str, rounds: int = 10, warmup: int = 1, min_time: float = 0.0):
+        self.name = name
+        self.rounds = rounds
+        self.warmup = warmup
+        self.min_time = min_time
+        self.times = []
+        self.extra_info = {}
+
+    def __call__(self, func, *args, **kwargs):
+        return self.pedantic(func, args=args, kwargs=kwargs)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None, rounds=None, warmup_rounds=None):
+        kwargs = kwargs or {}
+        rounds = rounds or self.rounds
+        warmup_rounds = self.warmup if warmup_rounds is None else warmup_rounds
+
+        with harness.quiet():
+            for _ in range(warmup_rounds):
+                if setup:
+                    setup()
+                func(*args, **kwargs)
+
+            result = None
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                start_all = time.perf_counter()
+                n = 0
+                while n < rounds or (time.perf_counter() - start_all) < self.min_time:
+                    if setup:
+                        setup()
+                    start = time.perf_counter()
+                    result = func(*args, **kwargs)
+                    self.times.append(time.perf_counter() - start)
+                    n += 1
+            finally:
+                if gc_enabled:
+                    gc.enable()
+
+        return result
+
+    def stats(self) -> dict:
+        times = self.times
+        return {
+            "name": self.name,
+            "rounds": len(times),
+            "min": min(times),
+            "max": max(times),
+            "mean": statistics.fmean(times),
+            "median": statistics.median(times),
+            "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "extra_info": self.extra_info,
+        }
+
+
+def collect_suites(keyword: str = None) -> dict:
+    import suites
+
+    collected = {}
+    for name in dir(suites):
+        if not name.startswith("bench_"):
+            continue
+        func = getattr(suites, name)
+        if not callable(func):
+            continue
+        short_name = name[len("bench_"):]
+        if keyword and keyword not in short_name:
+            continue
+        collected[short_name] = func
+
+    return collected
+
+
+def format_table(results: list, compare: dict = None, threshold: float = 0.1) -> str:
+    """ms table, columns follow pytest-benchmark"""
+    header = f"{'name':<45} {'min':>10} {'max':>10} {'mean':>10} {'stddev':>10} {'median':>10} {'rounds':>7}"
+    if compare:
+        header += f" {'vs base':>9}"
+
+    lines = [header, "-" * len(header)]
+    for r in sorted(results, key=lambda r: r["name"]):
+        line = f"{r['name']:<45}"
+        for k in ["min", "max", "mean", "stddev", "median"]:
+            line += f" {r[k] * 1000:>10.3f}"
+        line += f" {r['rounds']:>7}"
+
+        if compare:
+            base = compare.get(r["name"])
+            if base:
+                change = (r["median"] - base["median"]) / base["median"]
+                flag = " !" if change > threshold else ""
+                line += f" {change * 100:>+8.1f}%{flag}"
+            else:
+                line += f" {'-':>9}"
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fusion-GPT-Addin offline benchmarks")
+    parser.add_argument("--preset", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.0, help="minimum seconds per benchmark")
+    parser.add_argument("-k", "--keyword", default=None, help="only run benchmarks whose name contains keyword")
+    parser.add_argument("--setting", action="append", default=[], help="fusion setting, e.g --setting index_brep_children=true")
+    parser.add_argument("--save", default=None, help="write results json")
+    parser.add_argument("--compare", default=None, help="results json to compare median times against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="flag regressions slower than this fraction")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    suites = collect_suites(args.keyword)
+    if args.list:
+        print("\n".join(sorted(suites)))
+        return 0
+
+    settings = {}
+    for s in args.setting:
+        name, _, val = s.partition("=")
+        settings[name] = val.lower() in ("1", "true", "yes")
+
+    env = harness.BenchEnv(args.preset, args.seed, settings=settings)
+    print(f"preset: {args.preset}, seed: {args.seed}, python: {platform.python_version()}")
+    print(f"design: {env.counts()}")
+
+    results = []
+    failed = {}
+    for name, suite in suites.items():
+        benchmark = Benchmark(name, rounds=args.rounds, warmup=args.warmup, min_time=args.min_time)
+        try:
+            suite(benchmark, env)
+        except Exception as e:
+            failed[name] = f"{e.__class__.__name__}: {e}"
+            continue
+        results.append(benchmark.stats())
+
+    compare = None
+    if args.compare:
+        with open(args.compare) as f:
+            compare = {r["name"]: r for r in json.load(f)["benchmarks"]}
+
+    print(format_table(results, compare, args.threshold))
+
+    for name, error in failed.items():
+        print(f"FAILED {name}: {error}")
+
+    if args.save:
+        output = {
+            "preset": args.preset,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "settings": settings,
+            "counts": env.counts(),
+            "benchmarks": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(output, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
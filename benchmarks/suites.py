@@ -0,0 +1,333 @@
+"""
+Benchmark suites, any function named bench_* is collected by run_benchmarks.py.
+Each suite receives a benchmark callable (pytest-benchmark style) and a BenchEnv.
+Suites check the result so a broken code path can't report a fast time.
+"""
+import json
+
+
+SQL_QUERIES = {
+    "occurrence_like": "SELECT name,entityToken FROM Occurrence WHERE name LIKE '%screw%'",
+    "occurrence_sub_attr": "SELECT name,component.name,appearance.name FROM Occurrence WHERE component.name LIKE '%gear%' OR name LIKE '%bolt%'",
+    "body_order_limit": "SELECT name,volume,entityToken FROM BRepBody WHERE volume > 10 ORDER BY volume DESC LIMIT 50",
+    "component_in_list": "SELECT name,material.name FROM Component WHERE material.name IN ('Steel', 'Brass', 'Aluminum 6061')",
+    "update_occurrence": "UPDATE Occurrence SET isLightBulbOn=true WHERE name LIKE '%washer%'",
+    "update_all_occurrences": "UPDATE Occurrence SET isLightBulbOn=true",
+    "join_body_component": "SELECT b.name,b.entityToken,c.name FROM BRepBody b JOIN Component c ON b.parentComponent = c WHERE c.name LIKE '%gear%' AND c.material.name LIKE '%Steel%' ORDER BY b.volume DESC LIMIT 20",
+}
+
+
+def check_json(result):
+    data = json.loads(result)
+    if isinstance(data, dict):
+        # tool_call wraps plain string results, e.g "Error: ..."
+        wrapped = data.get("results")
+        if "error" in data or "Error" in data or (isinstance(wrapped, str) and wrapped.startswith("Error")):
+            raise AssertionError(f"tool returned error: {result[:500]}")
+    return data
+
+
+def make_sql_bench(query_name, query_str):
+    def bench(benchmark, env):
+        sql = env.tools["SQL"]
+        # measure execution, not result cache hits
+        sql.use_query_cache = False
+        try:
+            result = benchmark(sql.run_sql_query, query_str)
+        finally:
+            sql.use_query_cache = True
+        data = check_json(result)
+        benchmark.extra_info["count"] = data.get("count", data.get("foundCount"))
+
+        # one extra profiled run, per stage times and slowest attribute paths
+        sql.profile_queries = True
+        try:
+            sql.run_sql_query(query_str)
+        finally:
+            sql.profile_queries = False
+        profile = sql.last_query_profile.summary()
+        benchmark.extra_info["stages"] = {s["stage"]: s["ms"] for s in profile["stages"]}
+        benchmark.extra_info["slowest_paths"] = profile["slowestPaths"]
+
+    bench.__name__ = f"bench_run_sql_query_{query_name}"
+    return bench
+
+
+for _name, _query in SQL_QUERIES.items():
+    _bench = make_sql_bench(_name, _query)
+    globals()[_bench.__name__] = _bench
+
+
+def bench_run_sql_query_cached(benchmark, env):
+    """repeated identical SELECT, served from the result cache"""
+    sql = env.tools["SQL"]
+    query_str = SQL_QUERIES["occurrence_like"]
+    sql.run_sql_query(query_str)
+    hits = sql.query_cache_stats["hits"]
+    result = benchmark(sql.run_sql_query, query_str)
+    check_json(result)
+    benchmark.extra_info["hits"] = sql.query_cache_stats["hits"] - hits
+
+
+def bench_run_sql_query_cold_columns(benchmark, env):
+    """numeric WHERE and ORDER BY including the float column capture"""
+    sql = env.tools["SQL"]
+    query_str = SQL_QUERIES["body_order_limit"]
+
+    def run():
+        sql.column_snapshots = {}
+        return sql.run_sql_query(query_str)
+
+    sql.use_query_cache = False
+    try:
+        result = benchmark(run)
+    finally:
+        sql.use_query_cache = True
+    benchmark.extra_info["count"] = check_json(result)["count"]
+
+
+def bench_sql_document_objects(benchmark, env):
+    """object index rebuild, runs on every query when reload_object_index is set"""
+    sql = env.tools["SQL"]
+    object_dict = benchmark(sql.document_objects)
+    benchmark.extra_info["n_classes"] = len(object_dict)
+
+
+def bench_list_document_structure(benchmark, env):
+    state = env.tools["GetStateData"]
+
+    def list_structure():
+        # streamed result, consumed the same way GptClient sends it
+        result = state.list_document_structure()
+        chunks = list(result)
+        return result, "".join(chunks)
+
+    stream, result = benchmark(list_structure)
+    data = check_json(result)
+    benchmark.extra_info["n_top_occurrences"] = len(data["occurrences"])
+    benchmark.extra_info["bytes"] = len(result)
+    benchmark.extra_info["n_chunks"] = stream.n_chunks
+
+
+def bench_list_document_structure_expanded(benchmark, env):
+    """component contents repeated in every occurrence"""
+    state = env.tools["GetStateData"]
+    result = benchmark(lambda: state.list_document_structure(compact=False).text())
+    data = check_json(result)
+    benchmark.extra_info["bytes"] = len(result)
+
+
+def bench_list_document_structure_depth_1(benchmark, env):
+    """top level occurrences only, child counts in place of children"""
+    state = env.tools["GetStateData"]
+    result = benchmark(lambda: state.list_document_structure(max_depth=1).text())
+    data = check_json(result)
+    benchmark.extra_info["bytes"] = len(result)
+
+
+def bench_set_obj_hash_bodies(benchmark, env):
+    """hash every body and edge in the design"""
+    tool = env.tools["SQL"]
+    entities = [
+        ent
+        for comp in env.design.allComponents
+        for body in comp.bRepBodies
+        for ent in [body, *body.edges]
+    ]
+
+    def hash_all():
+        return [tool.set_obj_hash(ent) for ent in entities]
+
+    tokens = benchmark(hash_all)
+    assert tool.get_hash_obj(tokens[0]) is entities[0]
+    benchmark.extra_info["n_entities"] = len(entities)
+
+
+def bench_set_obj_hash_components(benchmark, env):
+    """components take the get_comp_str path"""
+    tool = env.tools["SQL"]
+    comps = list(env.design.allComponents)
+
+    def hash_all():
+        return [tool.set_obj_hash(comp) for comp in comps]
+
+    benchmark(hash_all)
+    benchmark.extra_info["n_entities"] = len(comps)
+
+
+def bench_get_docstr(benchmark, env):
+    result = benchmark(env.fusion_itf.get_docstr)
+    tools = json.loads(result)
+    benchmark.extra_info["n_tools"] = len(tools)
+
+
+def bench_get_available_classes(benchmark, env):
+    """warm calls, class descriptions come from the introspection cache"""
+    result = benchmark(env.tools["SQL"].get_available_classes)
+    data = check_json(result)
+    benchmark.extra_info["n_classes"] = len(data["document_objects"]) + len(data["transient_objects"])
+
+
+def bench_object_creation_response(benchmark, env):
+    """response for an extrude feature with one body per part component"""
+    import adsk.fusion
+
+    tool = env.tools["CreateObjects"]
+    bodies = adsk.fusion.BRepBodies([comp.bRepBodies.item(0) for comp in env.design.allComponents if comp.bRepBodies.count])
+    feature = adsk.fusion.ExtrudeFeature("Extrude_bench", "extrude/bench", bodies)
+
+    results = benchmark(tool.object_creation_response, feature)
+    assert len(results) == bodies.count
+    benchmark.extra_info["n_objects"] = len(results)
+    benchmark.extra_info["n_chars"] = len(json.dumps(results))
+
+
+def bench_object_creation_response_verbose(benchmark, env):
+    """same response with the verbose profile, sub objects get tokens and names"""
+    import adsk.fusion
+
+    tool = env.tools["CreateObjects"]
+    bodies = adsk.fusion.BRepBodies([comp.bRepBodies.item(0) for comp in env.design.allComponents if comp.bRepBodies.count])
+    feature = adsk.fusion.ExtrudeFeature("Extrude_bench", "extrude/bench", bodies)
+
+    results = benchmark(tool.object_creation_response, feature, "verbose")
+    assert len(results) == bodies.count
+    benchmark.extra_info["n_objects"] = len(results)
+    benchmark.extra_info["n_chars"] = len(json.dumps(results))
+
+
+def bench_find_occurrence_by_name(benchmark, env):
+    """every occurrence by full path, one name index build per design generation"""
+    tool = env.tools["Joints"]
+    paths = [occ.fullPathName for occ in env.design.rootComponent.allOccurrences]
+
+    def find_all():
+        return [tool._find_occurrence_by_name(path)[0] for path in paths]
+
+    occs = benchmark(find_all)
+    assert all(occs)
+    benchmark.extra_info["n_lookups"] = len(paths)
+
+
+def bench_create_joints_batch(benchmark, env):
+    """one rigid joint between each pair of consecutive occurrences with joint origins"""
+    tool = env.tools["Joints"]
+    occs = [occ for occ in env.design.rootComponent.allOccurrences if occ.component.jointOrigins.count]
+    joint_requests = [
+        {
+            "occurrence_1_name": occ_1.fullPathName,
+            "joint_origin_1": occ_1.component.jointOrigins.item(0).name,
+            "occurrence_2_name": occ_2.fullPathName,
+            "joint_origin_2": occ_2.component.jointOrigins.item(0).name,
+            "jointType": "RigidJointType",
+        }
+        for occ_1, occ_2 in zip(occs, occs[1:])
+    ]
+
+    result = benchmark(tool.create_joints_between_origins, joint_requests)
+    data = check_json(result)
+    assert data["failed"] == 0
+    benchmark.extra_info["n_joints"] = data["created"]
+
+
+def bench_list_joint_origin_references_near_point(benchmark, env):
+    """10 references closest to a point, reference table cached after the first call"""
+    tool = env.tools["Joints"]
+    comp = max(env.design.allComponents, key=lambda c: sum(b.edges.count + b.faces.count for b in c.bRepBodies))
+
+    result = benchmark(
+        tool.list_joint_origin_references, comp.name,
+        geometry_types=["faces", "edges", "vertices", "sketch_points"], edge_types=[],
+        near_point=[0, 0, 0], limit=10,
+    )
+    data = check_json(result)
+    assert data["returned"] == 10
+    benchmark.extra_info["n_references"] = len(tool.reference_tables[tool.get_comp_str(comp)].rows)
+
+
+def bench_create_point3d_list_10k(benchmark, env):
+    """10k point lattice packed into one transient array"""
+    tool = env.tools["TransientObjects"]
+    coords_list = [[x * 0.5, y * 0.5, z * 0.5] for x in range(25) for y in range(20) for z in range(20)]
+
+    result = benchmark(tool.create_point3d_list, coords_list)
+    data = check_json(result)
+    assert data["count"] == len(coords_list)
+    benchmark.extra_info["n_chars"] = len(result)
+
+
+def bench_circular_pattern_point_grid(benchmark, env):
+    """10k point grid copied 12 times around Z without re-sending coordinates"""
+    tool = env.tools["TransientObjects"]
+    grid = check_json(tool.create_point_grid([5, 0, 0], [100, 100, 1], [0.1, 0.1, 0.1]))
+
+    result = benchmark(tool.circular_pattern_transient_array, grid["arrayToken"], [0, 0, 0], [0, 0, 1], 12)
+    data = check_json(result)
+    assert data["count"] == 12 * grid["count"]
+    benchmark.extra_info["n_chars"] = len(result)
+
+
+def bench_create_spheres_from_point_array(benchmark, env):
+    """1k spheres from one transient array token in a single base feature edit"""
+    tool = env.tools["CreateObjects"]
+    grid = check_json(env.tools["TransientObjects"].create_point_grid([0, 0, 0], [10, 10, 10], [3, 3, 3]))
+
+    result = benchmark(tool.create_bodies_from_points, "", [grid["arrayToken"]], "sphere", 1.0)
+    data = check_json(result)
+    assert data["bodies"] == grid["count"]
+    benchmark.extra_info["n_chars"] = len(result)
+
+
+def bench_modeling_batch(benchmark, env):
+    """three body creation calls between begin_batch and commit_batch"""
+    tool = env.tools["CreateObjects"]
+    grid = check_json(env.tools["TransientObjects"].create_point_grid([0, 0, 0], [5, 5, 4], [3, 3, 3]))
+
+    def run():
+        check_json(tool.begin_batch("bench"))
+        for primitive in ["sphere", "box", "cylinder"]:
+            tool.create_bodies_from_points("", [grid["arrayToken"]], primitive)
+        return tool.commit_batch()
+
+    result = benchmark(run)
+    data = check_json(result)
+    assert data["toolCalls"] == 3 and data["timelineObjects"] == 3
+    benchmark.extra_info["n_chars"] = len(result)
+
+
+def bench_create_pipe_from_lines_chain(benchmark, env):
+    """200 segment polyline in shuffled token order, one pipe feature"""
+    import random
+    import adsk.core
+    import adsk.fusion
+
+    tool = env.tools["CreateObjects"]
+    comp = env.design.rootComponent
+    sketch = adsk.fusion.Sketch("Sketch_frame", "sketch/bench_frame", comp)
+    points = [
+        adsk.fusion.SketchPoint(f"skpt/frame/{i}", adsk.core.Point3D(i, (i % 2) * 2.0, 0), sketch)
+        for i in range(201)
+    ]
+    lines = [adsk.fusion.SketchLine(f"skline/frame/{i}", points[i], points[i + 1], sketch) for i in range(200)]
+    tokens = [tool.set_obj_hash(line) for line in lines]
+    random.Random(0).shuffle(tokens)
+
+    result = benchmark(tool.create_pipe_from_lines, tokens, 0.5)
+    data = check_json(result)
+    assert len(data["pipeFeatures"]) == 1 and data["succeeded"] == 200
+    benchmark.extra_info["n_chars"] = len(result)
+
+
+def bench_extrude_profiles_batch(benchmark, env):
+    """one extrude spec per component sketch, validated and added in one call"""
+    tool = env.tools["CreateObjects"]
+    specs = [
+        {"profile_tokens": [tool.set_obj_hash(p) for p in sketch.profiles], "distance": 0.5 + n % 3}
+        for n, sketch in enumerate(s for comp in env.design.allComponents for s in comp.sketches)
+        if sketch.profiles.count
+    ]
+
+    result = benchmark(tool.extrude_profiles_batch, specs)
+    data = check_json(result)
+    assert len(data["features"]) == len(specs)
+    benchmark.extra_info["n_chars"] = len(result)
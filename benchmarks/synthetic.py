@@ -0,0 +1,271 @@
+"""
+Deterministic synthetic Fusion designs built from the fake adsk package.
+The same preset and seed always produce the same names, tokens and values.
+"""
+import random
+import string
+
+import adsk.core
+import adsk.fusion
+
+
+# occurrences per assembly level = fan_out ** level, e.g medium: 6 + 36 + 216
+PRESETS = {
+    "small": {
+        "depth": 2,
+        "fan_out": 4,
+        "n_parts": 10,
+        "bodies": 2,
+        "edges": 12,
+        "faces": 6,
+        "sketches": 1,
+        "profiles": 2,
+        "sketch_lines": 8,
+        "joint_origins": 1,
+        "joints": 2,
+        "parameters": 20,
+    },
+    "medium": {
+        "depth": 3,
+        "fan_out": 6,
+        "n_parts": 40,
+        "bodies": 3,
+        "edges": 24,
+        "faces": 10,
+        "sketches": 2,
+        "profiles": 3,
+        "sketch_lines": 12,
+        "joint_origins": 2,
+        "joints": 4,
+        "parameters": 100,
+    },
+    "large": {
+        "depth": 3,
+        "fan_out": 12,
+        "n_parts": 120,
+        "bodies": 4,
+        "edges": 36,
+        "faces": 14,
+        "sketches": 3,
+        "profiles": 4,
+        "sketch_lines": 16,
+        "joint_origins": 2,
+        "joints": 6,
+        "parameters": 400,
+    },
+}
+
+PART_WORDS = [
+    "bolt", "screw", "bracket", "plate", "housing", "gear",
+    "shaft", "washer", "nut", "spacer", "bearing", "cover",
+]
+
+APPEARANCE_NAMES = [
+    "Aluminum - Anodized Red", "Aluminum - Anodized Blue", "Aluminum - Satin",
+    "Steel - Satin", "Steel - Polished", "Brass - Polished",
+    "Plastic - Matte (Black)", "Plastic - Glossy (White)", "Rubber - Soft",
+    "Paint - Enamel Glossy (Yellow)", "Glass - Clear", "Wood - Oak",
+]
+
+MATERIAL_NAMES = [
+    "Aluminum 6061", "Steel", "Stainless Steel", "Brass", "ABS Plastic",
+    "Nylon 6/6", "Rubber", "Glass", "Oak", "Titanium",
+]
+
+
+class DesignBuilder:
+    """
+    builds a synthetic assembly:
+    root -> fan_out sub assemblies -> ... -> part occurrences (reused components)
+    """
+
+    def __init__(self, preset: str = "small", seed: int = 0, **overrides):
+        self.sizes = dict(PRESETS[preset])
+        self.sizes.update(overrides)
+        self.preset = preset
+        self.rng = random.Random(seed)
+        self._alphabet = string.ascii_letters + string.digits
+        self._n_ids = 0
+
+    def token(self, prefix: str) -> str:
+        """entityToken like string, long and opaque"""
+        body = "".join(self.rng.choices(self._alphabet, k=40))
+        return f"{prefix}/{body}"
+
+    def next_id(self) -> str:
+        self._n_ids += 1
+        return f"{self._n_ids:08x}-0000-4000-8000-{self.rng.getrandbits(48):012x}"
+
+    def build(self):
+        s = self.sizes
+        rng = self.rng
+
+        design = adsk.fusion.Design(f"synthetic_{self.preset}")
+
+        appearances = [adsk.fusion.Appearance(n, self.next_id()) for n in APPEARANCE_NAMES]
+        materials = [adsk.fusion.Material(n, self.next_id(), rng.uniform(0.9, 8.5)) for n in MATERIAL_NAMES]
+
+        self.appearances = appearances
+        self.materials = materials
+
+        libraries = adsk.core.MaterialLibraries([
+            adsk.core.MaterialLibrary("Fusion Appearance Library", appearances=adsk.core.Collection(appearances)),
+            adsk.core.MaterialLibrary("Fusion Material Library", materials=adsk.core.Collection(materials)),
+        ])
+
+        root = self.new_component(design, "root")
+        design.rootComponent = root
+
+        # parameters
+        for i in range(s["parameters"]):
+            param = adsk.fusion.ModelParameter(f"d{i + 1}", round(rng.uniform(0.1, 50.0), 3))
+            design.allParameters._append(param)
+
+        # leaf part components, reused by many occurrences
+        parts = []
+        for i in range(s["n_parts"]):
+            word = PART_WORDS[i % len(PART_WORDS)]
+            comp = self.new_component(design, f"{word}_{i}")
+            self.add_part_geometry(design, comp)
+            parts.append(comp)
+
+        # sub assembly components, one set per non leaf level
+        levels = [[root]]
+        for level in range(1, s["depth"]):
+            level_comps = []
+            for i in range(s["fan_out"]):
+                comp = self.new_component(design, f"assembly_L{level}_{i}")
+                level_comps.append(comp)
+            levels.append(level_comps)
+        levels.append(parts)
+
+        # native occurrences in each assembly component
+        for level in range(s["depth"]):
+            children = levels[level + 1]
+            for comp in levels[level]:
+                for i in range(s["fan_out"]):
+                    child_comp = children[(i + rng.randrange(len(children))) % len(children)]
+                    self.new_native_occurrence(comp, child_comp)
+
+        # joints / rigid groups live in assembly components
+        for level_comps in levels[:-1]:
+            for comp in level_comps:
+                occs = list(comp.occurrences)
+                for i in range(min(s["joints"], len(occs) - 1)):
+                    joint = adsk.fusion.Joint(f"Joint{i + 1}", self.token("joint"), occs[i], occs[i + 1])
+                    comp.joints._append(joint)
+                    design.timeline._append(adsk.fusion.TimelineObject(joint.name, joint))
+                if len(occs) > 1:
+                    group = adsk.fusion.RigidGroup("Rigid1", self.token("rigid"), adsk.fusion.OccurrenceList(occs[:2]))
+                    comp.rigidGroups._append(group)
+
+        # occurrence proxies, one per path
+        for native in root.occurrences:
+            self.new_proxy(root, native, None)
+
+        # root level all* lists
+        for comp in design.allComponents:
+            for j in comp.joints:
+                root.allJoints._append(j)
+            for jo in comp.jointOrigins:
+                root.allJointOrigins._append(jo)
+            for rg in comp.rigidGroups:
+                root.allRigidGroups._append(rg)
+
+        self.design = design
+        self.libraries = libraries
+        return design, libraries
+
+    def new_component(self, design, name):
+        comp = adsk.fusion.Component(name, self.next_id(), self.token("comp"), design)
+        comp.material = self.rng.choice(self.materials)
+        design.allComponents._append(comp)
+        return comp
+
+    def add_part_geometry(self, design, comp):
+        s = self.sizes
+        rng = self.rng
+
+        for b in range(s["bodies"]):
+            body = adsk.fusion.BRepBody(f"Body{b + 1}", self.token("body"), comp)
+            body.appearance = rng.choice(self.appearances)
+            body.material = comp.material
+
+            for e in range(s["edges"]):
+                body.edges._append(adsk.fusion.BRepEdge(self.token("edge"), round(rng.uniform(0.05, 20.0), 4), body, e))
+            for f in range(s["faces"]):
+                body.faces._append(adsk.fusion.BRepFace(self.token("face"), round(rng.uniform(0.1, 50.0), 4), body, f))
+
+            body.area = round(sum(f.area for f in body.faces), 4)
+            body.volume = round(rng.uniform(0.05, 120.0), 4)
+
+            lo = [rng.uniform(-20.0, 20.0) for _ in range(3)]
+            hi = [v + rng.uniform(0.5, 10.0) for v in lo]
+            body.boundingBox = adsk.core.BoundingBox3D(adsk.core.Point3D(*lo), adsk.core.Point3D(*hi))
+
+            comp.bRepBodies._append(body)
+            design.timeline._append(adsk.fusion.TimelineObject(f"Extrude{design.timeline.count + 1}", body))
+
+        for k in range(s["sketches"]):
+            sketch = adsk.fusion.Sketch(f"Sketch{k + 1}", self.token("sketch"), comp)
+            sketch.referencePlane = comp.xYConstructionPlane
+
+            points = []
+            for p in range(s["sketch_lines"] + 1):
+                geom = adsk.core.Point3D(round(rng.uniform(-10, 10), 3), round(rng.uniform(-10, 10), 3), 0.0)
+                points.append(sketch.sketchPoints._append(adsk.fusion.SketchPoint(self.token("skpt"), geom, sketch)))
+            for l in range(s["sketch_lines"]):
+                line = adsk.fusion.SketchLine(self.token("skline"), points[l], points[l + 1], sketch)
+                sketch.sketchCurves._append(line)
+            for p in range(s["profiles"]):
+                sketch.profiles._append(adsk.fusion.Profile(self.token("profile"), round(rng.uniform(1.0, 40.0), 4), sketch))
+
+            comp.sketches._append(sketch)
+            design.timeline._append(adsk.fusion.TimelineObject(sketch.name, sketch))
+
+        for j in range(s["joint_origins"]):
+            comp.jointOrigins._append(adsk.fusion.JointOrigin(f"JointOrigin{j + 1}", self.token("jo"), comp))
+
+    def new_native_occurrence(self, parent_comp, child_comp):
+        n = sum(1 for o in parent_comp.occurrences if o.component is child_comp) + 1
+        occ = adsk.fusion.Occurrence(f"{child_comp.name}:{n}", self.token("occ"), child_comp)
+        translation = adsk.core.Vector3D(*[round(self.rng.uniform(-100, 100), 3) for _ in range(3)])
+        occ.transform.translation = translation
+        if self.rng.random() < 0.3:
+            occ.appearance = self.rng.choice(self.appearances)
+        parent_comp.occurrences._append(occ)
+        return occ
+
+    def new_proxy(self, root, native, context):
+        """
+        proxy occurrence for native occurrence in the given assembly context,
+        occurrences directly under root are not proxies
+        """
+        if context is None:
+            proxy = native
+        else:
+            proxy = adsk.fusion.Occurrence(native.name, self.token("occ"), native.component, context)
+            proxy.transform = native.transform.copy()
+            proxy.transform2 = proxy.transform
+            proxy.appearance = native.appearance
+            proxy.nativeObject = native
+        root.allOccurrences._append(proxy)
+
+        if context is not None:
+            context.childOccurrences._append(proxy)
+
+        for child_native in native.component.occurrences:
+            self.new_proxy(root, child_native, proxy)
+
+        return proxy
+
+
+def build_design(preset: str = "small", seed: int = 0, **overrides):
+    """
+    build a synthetic design and set it as the active product
+    returns the DesignBuilder, with .design and .sizes
+    """
+    builder = DesignBuilder(preset, seed, **overrides)
+    design, libraries = builder.build()
+    adsk.core.Application.get()._set_design(design, libraries)
+    return builder
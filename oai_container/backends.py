@@ -0,0 +1,518 @@
+
+import os
+import json
+import time
+import itertools
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+
+try:
+    from openai import OpenAI
+except ImportError:
+    OpenAI = None
+
+
+def stream_event(event_type, **data):
+    """Assistants API style stream event"""
+    return SimpleNamespace(event=event_type, data=SimpleNamespace(**data))
+
+
+def step_delta_event(step_id, tool_call_id, function):
+    """thread.run.step.delta carrying a single tool call"""
+    tool_call = SimpleNamespace(id=tool_call_id, type="function", function=function)
+    delta = SimpleNamespace(step_details=SimpleNamespace(type="tool_calls", tool_calls=[tool_call]))
+    return stream_event("thread.run.step.delta", id=step_id, delta=delta)
+
+
+class AssistantBackend(ABC):
+    """
+    Model API used by Assistant. One backend instance holds one conversation.
+    create_run / submit_tool_outputs return an iterable of Assistants API style
+    stream events, each with .event (e.g "thread.message.delta") and .data
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def list_models(self) -> list:
+        ...
+
+    @abstractmethod
+    def update_assistant(self, model: str, instructions: str, tools: list, reasoning_effort: str = None) -> dict:
+        ...
+
+    @abstractmethod
+    def start_thread(self) -> str:
+        ...
+
+    @abstractmethod
+    def add_message(self, message_text: str) -> str:
+        ...
+
+    @abstractmethod
+    def create_run(self):
+        ...
+
+    @abstractmethod
+    def submit_tool_outputs(self, run_id: str, tool_outputs: list):
+        ...
+
+    @abstractmethod
+    def cancel_run(self, run_id: str):
+        ...
+
+
+class OpenAIAssistantsBackend(AssistantBackend):
+    """
+    OpenAI Assistants API (client.beta.threads), conversation state is stored by OpenAI
+    """
+
+    name = "openai_assistants"
+
+    def __init__(self, assistant_id: str):
+        if OpenAI is None:
+            raise ImportError("openai package is required for the OpenAI backend")
+
+        self.client = OpenAI()
+        self.assistant_id = assistant_id
+        self.thread_id = None
+
+    def list_models(self):
+        models_resp = self.client.models.list()
+        return [m.id for m in models_resp.data]
+
+    def update_assistant(self, model, instructions, tools, reasoning_effort=None):
+        updated_assistant = self.client.beta.assistants.update(
+            self.assistant_id,
+            model=model,
+            instructions=instructions,
+            tools=tools,
+            reasoning_effort=reasoning_effort,
+            response_format="auto",
+        )
+
+        return {
+            "id": updated_assistant.id,
+            "name": updated_assistant.name,
+            "model": updated_assistant.model,
+            "created_at": updated_assistant.created_at,
+        }
+
+    def start_thread(self):
+        thread = self.client.beta.threads.create()
+        self.thread_id = thread.id
+        return thread.id
+
+    def add_message(self, message_text):
+        message = self.client.beta.threads.messages.create(
+            thread_id=self.thread_id,
+            role="user",
+            content=message_text
+        )
+        return message.id
+
+    def create_run(self):
+        return self.client.beta.threads.runs.create(
+            thread_id=self.thread_id,
+            assistant_id=self.assistant_id,
+            stream=True
+        )
+
+    def submit_tool_outputs(self, run_id, tool_outputs):
+        return self.client.beta.threads.runs.submit_tool_outputs(
+            thread_id=self.thread_id,
+            run_id=run_id,
+            tool_outputs=tool_outputs,
+            stream=True,
+        )
+
+    def cancel_run(self, run_id):
+        return self.client.beta.threads.runs.cancel(
+            thread_id=self.thread_id,
+            run_id=run_id
+        )
+
+
+class OpenAIChatBackend(AssistantBackend):
+    """
+    Chat Completions streaming, conversation state is held locally.
+    Adding a message makes no request, each run or tool output submission
+    is a single streaming request. Chunks are translated to the Assistants
+    stream events connection.py already handles.
+    """
+
+    name = "openai_chat"
+
+    def __init__(self, model: str = "gpt-4o"):
+        if OpenAI is None:
+            raise ImportError("openai package is required for the OpenAI backend")
+
+        self.client = OpenAI()
+        self.model = model
+        self.instructions = ""
+        self.tools = []
+        self.reasoning_effort = None
+
+        self.ids = itertools.count(1)
+        self.thread_id = None
+        self.run_id = None
+        self.messages = []
+        self.response = None
+
+    def new_id(self, prefix):
+        return f"{prefix}_local{next(self.ids):06d}"
+
+    def list_models(self):
+        models_resp = self.client.models.list()
+        return [m.id for m in models_resp.data]
+
+    def update_assistant(self, model, instructions, tools, reasoning_effort=None):
+        """settings are sent with every request"""
+        self.model = model
+        self.instructions = instructions
+        self.tools = tools
+        self.reasoning_effort = reasoning_effort
+
+        return {
+            "id": self.name,
+            "name": self.name,
+            "model": model,
+            "created_at": int(time.time()),
+        }
+
+    def start_thread(self):
+        self.thread_id = self.new_id("thread")
+        self.messages = []
+        return self.thread_id
+
+    def add_message(self, message_text):
+        self.messages.append({"role": "user", "content": message_text})
+        return self.new_id("msg")
+
+    def create_run(self):
+        self.run_id = self.new_id("run")
+        self.send_request()
+        return self.stream(created=True)
+
+    def submit_tool_outputs(self, run_id, tool_outputs):
+        if run_id != self.run_id:
+            raise ValueError(f"unknown run: {run_id}")
+        for output in tool_outputs:
+            self.messages.append({"role": "tool", "tool_call_id": output["tool_call_id"], "content": output["output"]})
+        self.send_request()
+        return self.stream(created=False)
+
+    def cancel_run(self, run_id):
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+
+        # cancelled at requires_action, every tool call needs a tool message
+        # or the next request is rejected
+        for tool_call_id in self.unanswered_tool_calls():
+            self.messages.append({"role": "tool", "tool_call_id": tool_call_id, "content": "Error: run cancelled before the tool was called"})
+
+        self.run_id = None
+        return SimpleNamespace(id=run_id, status="cancelled")
+
+    def unanswered_tool_calls(self) -> list:
+        """tool call ids of the last assistant message without a tool message"""
+        answered = set()
+        for message in reversed(self.messages):
+            if message["role"] == "tool":
+                answered.add(message["tool_call_id"])
+            elif message["role"] == "assistant":
+                return [c["id"] for c in message.get("tool_calls", []) if c["id"] not in answered]
+            else:
+                break
+        return []
+
+    def request_kwargs(self) -> dict:
+        messages = self.messages
+        if self.instructions:
+            messages = [{"role": "system", "content": self.instructions}] + messages
+
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+        }
+        if self.tools:
+            kwargs["tools"] = self.tools
+        if self.reasoning_effort:
+            kwargs["reasoning_effort"] = self.reasoning_effort
+        return kwargs
+
+    def send_request(self):
+        """
+        start the streaming request before the events are iterated, so the
+        caller's create_run / submit_tool_outputs timing covers the request
+        """
+        self.response = self.client.chat.completions.create(**self.request_kwargs())
+
+    def stream(self, created: bool):
+        """
+        events of the request started by send_request, message text becomes
+        message.delta events, tool calls become step.delta events followed
+        by requires_action
+        """
+        run_id = self.run_id
+
+        if created:
+            yield stream_event("thread.run.created", id=run_id, status="queued")
+
+        message_id = None
+        message_step_id = None
+        text_parts = []
+
+        tool_step_id = None
+        # tool calls by stream index
+        tool_calls = {}
+
+        for chunk in self.response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                if message_id is None:
+                    message_id = self.new_id("msg")
+                    message_step_id = self.new_id("step")
+                    yield stream_event("thread.run.step.created", id=message_step_id, run_id=run_id, status="in_progress",
+                                       type="message_creation", step_details=SimpleNamespace(type="message_creation"))
+                    yield stream_event("thread.message.created", id=message_id, run_id=run_id)
+
+                text_parts.append(delta.content)
+                text_delta = SimpleNamespace(content=[SimpleNamespace(text=SimpleNamespace(value=delta.content))])
+                yield stream_event("thread.message.delta", id=message_id, delta=text_delta)
+
+            for tool_call_delta in delta.tool_calls or []:
+                if tool_step_id is None:
+                    tool_step_id = self.new_id("step")
+                    yield stream_event("thread.run.step.created", id=tool_step_id, run_id=run_id, status="in_progress",
+                                       type="tool_calls", step_details=SimpleNamespace(type="tool_calls", tool_calls=[]))
+
+                call = tool_calls.setdefault(tool_call_delta.index, {"id": None, "name": "", "arguments": ""})
+                if tool_call_delta.id:
+                    call["id"] = tool_call_delta.id
+
+                function = tool_call_delta.function
+                name = getattr(function, "name", None)
+                arguments = getattr(function, "arguments", None) or ""
+                if name:
+                    call["name"] += name
+                call["arguments"] += arguments
+
+                function_delta = SimpleNamespace(name=name, arguments=arguments, output=None)
+                yield step_delta_event(tool_step_id, tool_call_delta.id, function_delta)
+
+        self.response = None
+        text = "".join(text_parts)
+
+        if message_id is not None:
+            yield stream_event("thread.message.completed", id=message_id, run_id=run_id,
+                               content=[SimpleNamespace(text=SimpleNamespace(value=text))])
+            yield stream_event("thread.run.step.completed", id=message_step_id, run_id=run_id,
+                               step_details=SimpleNamespace(type="message_creation"))
+
+        assistant_message = {"role": "assistant", "content": text or None}
+
+        if tool_calls:
+            calls = [tool_calls[index] for index in sorted(tool_calls)]
+            assistant_message["tool_calls"] = [
+                {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                for c in calls
+            ]
+            self.messages.append(assistant_message)
+
+            required_calls = [
+                SimpleNamespace(
+                    id=c["id"],
+                    type="function",
+                    function=SimpleNamespace(name=c["name"], arguments=c["arguments"], output=None),
+                )
+                for c in calls
+            ]
+            required_action = SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=required_calls))
+            yield stream_event("thread.run.requires_action", id=run_id, status="requires_action", required_action=required_action)
+            return
+
+        self.messages.append(assistant_message)
+        yield stream_event("thread.run.completed", id=run_id, status="completed")
+
+
+class FakeAssistantsBackend(AssistantBackend):
+    """
+    Local stand in for the Assistants streaming API, no network calls.
+    Plays scripted scenarios (see scenarios/*.json), each user message runs the
+    next turn in the scenario. Event timing follows the scenario token rate and
+    latency settings, scaled by time_scale (0 emits events without sleeping).
+
+    scenario format:
+    {
+      "name": "...",
+      "tokens_per_second": 60,          # message text and tool argument deltas
+      "first_token_latency": 0.5,       # seconds before the first event of each request
+      "chars_per_token": 4,
+      "turns": [
+        {"steps": [
+          {"tool_calls": [{"function_name": "run_sql_query", "arguments": {...}}], "fan_out": 1},
+          {"message": "text streamed as message deltas"}
+        ]}
+      ]
+    }
+    """
+
+    name = "fake_assistants"
+
+    def __init__(self, scenario: dict, time_scale: float = 1.0):
+        self.scenario = scenario
+        self.time_scale = time_scale
+
+        self.tokens_per_second = float(scenario.get("tokens_per_second", 60))
+        self.first_token_latency = float(scenario.get("first_token_latency", 0.5))
+        self.chars_per_token = int(scenario.get("chars_per_token", 4))
+        self.turns = scenario["turns"]
+
+        self.ids = itertools.count(1)
+        self.thread_id = None
+        self.turn_index = 0
+
+        # steps left to play in the current run
+        self.pending_steps = []
+        self.run_id = None
+        self.messages = []
+
+    @classmethod
+    def from_file(cls, path: str, time_scale: float = 1.0):
+        with open(path) as f:
+            scenario = json.load(f)
+        return cls(scenario, time_scale)
+
+    def new_id(self, prefix):
+        return f"{prefix}_fake{next(self.ids):06d}"
+
+    def sleep(self, seconds):
+        if self.time_scale and seconds > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def chunks(self, text: str) -> list:
+        """split text into token sized deltas"""
+        size = max(self.chars_per_token, 1)
+        return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+    def list_models(self):
+        return ["fake-model"]
+
+    def update_assistant(self, model, instructions, tools, reasoning_effort=None):
+        self.tools = tools
+        return {
+            "id": "asst_fake",
+            "name": self.scenario.get("name", "fake"),
+            "model": model,
+            "created_at": int(time.time()),
+        }
+
+    def start_thread(self):
+        self.thread_id = self.new_id("thread")
+        return self.thread_id
+
+    def add_message(self, message_text):
+        message_id = self.new_id("msg")
+        self.messages.append({"role": "user", "id": message_id, "content": message_text})
+        return message_id
+
+    def create_run(self):
+        turn = self.turns[self.turn_index % len(self.turns)]
+        self.turn_index += 1
+
+        self.run_id = self.new_id("run")
+        self.pending_steps = list(turn["steps"])
+        return self.stream(created=True)
+
+    def submit_tool_outputs(self, run_id, tool_outputs):
+        if run_id != self.run_id:
+            raise ValueError(f"unknown run: {run_id}")
+        for output in tool_outputs:
+            self.messages.append({"role": "tool", "tool_call_id": output["tool_call_id"], "content": output["output"]})
+        return self.stream(created=False)
+
+    def cancel_run(self, run_id):
+        self.pending_steps = []
+        return SimpleNamespace(id=run_id, status="cancelled")
+
+    def stream(self, created: bool):
+        """
+        events for the remaining steps, stops at the first tool call step
+        (requires_action), the rest is played after submit_tool_outputs
+        """
+        token_delay = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+        run_id = self.run_id
+
+        self.sleep(self.first_token_latency)
+
+        if created:
+            yield stream_event("thread.run.created", id=run_id, status="queued")
+        yield stream_event("thread.run.in_progress", id=run_id, status="in_progress")
+
+        while self.pending_steps:
+            step = self.pending_steps.pop(0)
+            step_id = self.new_id("step")
+
+            if "message" in step:
+                message_id = self.new_id("msg")
+                text = step["message"]
+
+                yield stream_event("thread.run.step.created", id=step_id, run_id=run_id, status="in_progress",
+                                 type="message_creation", step_details=SimpleNamespace(type="message_creation"))
+                yield stream_event("thread.message.created", id=message_id, run_id=run_id)
+
+                for chunk in self.chunks(text):
+                    self.sleep(token_delay)
+                    delta = SimpleNamespace(content=[SimpleNamespace(text=SimpleNamespace(value=chunk))])
+                    yield stream_event("thread.message.delta", id=message_id, delta=delta)
+
+                self.messages.append({"role": "assistant", "id": message_id, "content": text})
+                yield stream_event("thread.message.completed", id=message_id, run_id=run_id,
+                                 content=[SimpleNamespace(text=SimpleNamespace(value=text))])
+                yield stream_event("thread.run.step.completed", id=step_id, run_id=run_id,
+                                 step_details=SimpleNamespace(type="message_creation"))
+                continue
+
+            # tool call step, fan_out repeats the listed calls
+            tool_calls = []
+            for _ in range(int(step.get("fan_out", 1))):
+                for call in step["tool_calls"]:
+                    arguments = call.get("arguments", {})
+                    if not isinstance(arguments, str):
+                        arguments = json.dumps(arguments)
+                    tool_calls.append(SimpleNamespace(
+                        id=self.new_id("call"),
+                        type="function",
+                        function=SimpleNamespace(name=call["function_name"], arguments=arguments, output=None),
+                    ))
+
+            yield stream_event("thread.run.step.created", id=step_id, run_id=run_id, status="in_progress",
+                             type="tool_calls", step_details=SimpleNamespace(type="tool_calls", tool_calls=[]))
+
+            for tool_call in tool_calls:
+                # first delta carries id and name, following deltas carry argument chunks
+                name_fn = SimpleNamespace(name=tool_call.function.name, arguments="", output=None)
+                yield step_delta_event(step_id, tool_call.id, name_fn)
+                for chunk in self.chunks(tool_call.function.arguments):
+                    self.sleep(token_delay)
+                    yield step_delta_event(step_id, None, SimpleNamespace(name=None, arguments=chunk, output=None))
+
+            required_action = SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=tool_calls))
+            yield stream_event("thread.run.requires_action", id=run_id, status="requires_action", required_action=required_action)
+            return
+
+        yield stream_event("thread.run.completed", id=run_id, status="completed")
+
+
+def load_scenario_backend(scenario: str, time_scale: float = 1.0) -> FakeAssistantsBackend:
+    """scenario name (scenarios/<name>.json) or path"""
+    path = scenario
+    if not os.path.exists(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", f"{scenario}.json")
+    return FakeAssistantsBackend.from_file(path, time_scale)
@@ -4,20 +4,31 @@ import os
 from multiprocessing.connection import Listener
 from array import array
 import traceback
+import argparse
 import math
 import os
 import json
 import subprocess
 import sys
 import time
-from openai import OpenAI
-import adsk
+import wave
 
+# audio input is optional, not needed for text or the fake backend
+try:
+    import whisper
+    import pyaudio
+except ImportError:
+    whisper = None
+    pyaudio = None
 
-import whisper
-import pyaudio
-import wave
+from tracing import SpanRecorder, BackendMetrics, TRACE_META_KEY
+from backends import OpenAIAssistantsBackend, OpenAIChatBackend, load_scenario_backend
+from ipc import set_nodelay
 
+# streamed tool result markers are shared with the add-in, json_stream has no
+# Fusion dependencies. Appended so the local tracing module is found first
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Fusion-GPT-Addin", "f_interface"))
+from json_stream import CHUNK_PREFIX, CHUNK_END
 
 user_config = configparser.ConfigParser()
 # path to config file containing open ai API keys, Python env path
@@ -26,13 +37,23 @@ config_path = os.path.join(parent_dir,"config.env")
 user_config.read(config_path)
 
 default_config = user_config["DEFAULT"]
-OPENAI_API_KEY = default_config["OPEN_AI_API_KEY"]
-os.environ['OPENAI_API_KEY'] =  OPENAI_API_KEY
+OPENAI_API_KEY = default_config.get("OPEN_AI_API_KEY")
+if OPENAI_API_KEY:
+    os.environ['OPENAI_API_KEY'] =  OPENAI_API_KEY
 
 #client = OpenAI(api_key=OPENAI_API_KEY)
-ASSISTANT_ID = default_config["ASSISTANT_ID"]
+ASSISTANT_ID = default_config.get("ASSISTANT_ID")
+# assistants, chat or fake, see backends.py
+MODEL_BACKEND = default_config.get("MODEL_BACKEND", "assistants")
 
-client = OpenAI()
+
+# run events after which the run takes no more tool results
+RUN_END_EVENTS = (
+    "thread.run.completed",
+    "thread.run.cancelled",
+    "thread.run.failed",
+    "thread.run.expired",
+)
 
 print(f"RELOADED: {__name__.split('%2F')[-1]}")
 
@@ -43,15 +64,22 @@ class Assistant:
     base assistant class
     """
 
-    def __init__(self, assistant_id=None, initial_message=None):
+    def __init__(self, assistant_id=None, initial_message=None, backend=None):
         """get assistant and create new thread"""
 
-        self.client = OpenAI()
-
         # assistant_id is defined in the OpenAI Assistant API website
         self.assistant_id = assistant_id
         print(f'assistant_id: {assistant_id}')
 
+        # model API, OpenAI Assistants by default, see backends.py
+        if backend is None:
+            backend = OpenAIAssistantsBackend(assistant_id)
+        self.backend = backend
+        print(f'backend: {backend.name}')
+
+        # per backend latency, see get_backend_metrics
+        self.metrics = BackendMetrics(backend.name)
+
         #self.audio_interface = AudioInterface()
 
         # TODO eventualy, user should be able to restart thred from Fusion
@@ -70,6 +98,9 @@ class Assistant:
         # and continue the thread
         self.pending_tool_calls = {}
 
+        # timing spans, active when Fusion sends a trace context
+        self.tracer = SpanRecorder("connection")
+
         # whisper model size
         model_size = "base"
         #self.model = whisper.load_model(model_size)  # Load the selected model
@@ -85,6 +116,9 @@ class Assistant:
         :param format: pyaudio format (default: pyaudio.paInt16).
         """
 
+        if pyaudio is None:
+            return "Error: pyaudio is not installed"
+
         filename="output.wav"
         sample_rate=44100
         chunk_size=1024
@@ -173,12 +207,15 @@ class Assistant:
         List available Assistant models,
         This partially depends on on user payment tier
         """
-        models_resp = self.client.models.list()
-        models = models_resp.data
-        model_ids = [m.id for m in models]
-        return model_ids
+        return self.backend.list_models()
 
 
+    def get_backend_metrics(self):
+        """
+        time to first token and tool round trip latency for the current backend
+        """
+        return self.metrics.summary()
+
     def update_settings(self, model_settings):
         """
         update assistant tools, and initial prompt instructions
@@ -204,22 +241,13 @@ class Assistant:
             updated_tools.append({"type": "function", "function": tool})
             print(f"{index}: {tool['name']}")
         try:
-            updated_assistant = client.beta.assistants.update(
-                self.assistant_id,
-                model=model_name,
-                instructions=instructions,
-                tools=updated_tools,
+            return self.backend.update_assistant(
+                model_name,
+                instructions,
+                updated_tools,
                 reasoning_effort=reasoning_effort,
-                response_format="auto",
             )
 
-            return {
-                "id": updated_assistant.id,
-                "name": updated_assistant.name,
-                "model": updated_assistant.model,
-                "created_at": updated_assistant.created_at,
-            }
-
         except Exception as e:
             for index, tool in enumerate(tools):
                 print(f"{index}: {tool['name']}")
@@ -231,14 +259,12 @@ class Assistant:
         start thread (conversation) with Assistant API
         """
         # create new thread
-        self.thread = self.client.beta.threads.create()
-
-        self.thread_id = self.thread.id
+        self.thread_id = self.backend.start_thread()
 
         # last run step
         self.run_steps = None
         self.thread_started = True
-        print(f"Thread created: {self.thread.id}")
+        print(f"Thread created: {self.thread_id}")
 
 
     def run(self, conn):
@@ -288,6 +314,8 @@ class Assistant:
 
             if message_type == "thread_update":
                 message_text = message["content"]
+                self.tracer.set_context(message.get(TRACE_META_KEY))
+                self.metrics.start_turn()
 
             # start audio recording
             elif message_type == "start_record":
@@ -313,15 +341,19 @@ class Assistant:
             thread_start = 0
 
             # TODO condense much of this
-            while event_type != "thread.run.completed":
+            while event_type not in RUN_END_EVENTS:
                 print(f"THREAD START")
                 thread_start +=1
 
                 if thread_start > 20:
                     return
 
+                wait_start = time.monotonic()
+                first_event = True
                 for event in self.stream:
                     event_type = event.event
+                    self.tracer.add_stream_wait(wait_start, time.monotonic(), event_type, first_event)
+                    first_event = False
                     print(event_type)
                     thread_start = 0
                     data = event.data
@@ -383,6 +415,8 @@ class Assistant:
 
 
                     elif event_type == "thread.message.delta":
+                        self.tracer.mark_first_token(event_type)
+                        self.metrics.first_token()
                         delta_text = event.data.delta.content[0].text.value
                         message_id = event.data.id
 
@@ -401,6 +435,8 @@ class Assistant:
 
 
                     elif event_type == "thread.run.step.delta":
+                        self.tracer.mark_first_token(event_type)
+                        self.metrics.first_token()
 
                         try:
                             function = event.data.delta.step_details.tool_calls[0].function
@@ -446,6 +482,7 @@ class Assistant:
                     elif event_type == "thread.run.requires_action":
 
                         tool_calls = event.data.required_action.submit_tool_outputs.tool_calls
+                        self.metrics.start_tool_calls()
 
                         # return data for all tool calls in a step
                         tool_call_results = []
@@ -472,9 +509,12 @@ class Assistant:
                             # set tool call status in case of Exception during tool call
                             self.pending_tool_calls[tool_call_id] = "in_progress"
 
-                            conn.send(json.dumps(fusion_call))
                             # Fusion360 function results
-                            function_result = conn.recv()
+                            tool_call_start = time.monotonic()
+                            with self.tracer.span("ipc.tool_call", function_name=function_name):
+                                conn.send(json.dumps(self.tracer.attach(fusion_call)))
+                                function_result = self.recv_tool_result(conn)
+                            self.metrics.add_tool_call(time.monotonic() - tool_call_start)
 
                             tool_call_results.append({
                                 "tool_call_id" : tool_call.id,
@@ -490,6 +530,7 @@ class Assistant:
                         ## submit results for all tool calls in step
                         self.stream = self.submit_tool_call(tool_call_results)
                         print("TOOL CALL RESUTS FINISHED")
+                        wait_start = time.monotonic()
                         continue
 
                     elif event_type == "thread.run.step.completed":
@@ -524,6 +565,7 @@ class Assistant:
 
                     elif event_type == "thread.run.completed":
                         print("THREAD.RUN.COMPLETED")
+                        self.metrics.end_turn()
                         #print(event.data)
 
                         fusion_call = {
@@ -533,14 +575,45 @@ class Assistant:
                             "text": message_text
                         }
 
+                    elif event_type in RUN_END_EVENTS:
+                        # cancelled, failed or expired, Fusion closes the run
+                        print(f"{event_type.upper()}")
+                        self.metrics.end_turn()
+
+                        fusion_call = {
+                            "run_status": event_type,
+                            "response_type": "message",
+                            "event": event_type,
+                            "text": message_text
+                        }
+
 
                     if fusion_call != None:
-                        conn.send(json.dumps(fusion_call))
+                        conn.send(json.dumps(self.tracer.attach(fusion_call)))
 
+                    wait_start = time.monotonic()
+
+
+    def recv_tool_result(self, conn):
+        """
+        tool call result from Fusion, large results arrive as a
+        series of chunk messages ending with CHUNK_END
+        """
+        message = conn.recv()
+        if not message.startswith(CHUNK_PREFIX):
+            return message
 
-    def start_server(self):
+        chunks = []
+        while message != CHUNK_END:
+            chunks.append(message[len(CHUNK_PREFIX):])
+            message = conn.recv()
+
+        print(f"    CHUNKED RESULT: {len(chunks)} chunks")
+        return "".join(chunks)
+
+    def start_server(self, address=('localhost', 6000)):
         # start run on local host, Fusion client must connect to this address
-        address = ('localhost', 6000) # family is deduced to be 'AF_INET'
+        # family is deduced to be 'AF_INET'
 
         while True:
             try:
@@ -550,6 +623,7 @@ class Assistant:
                     # Fusion 360 Add-In connect here
                     with listener.accept() as conn:
                         print("CONNECTION ACCEPTED FROM", listener.last_accepted)
+                        set_nodelay(conn)
                         self.run(conn)
 
             except Exception as e:
@@ -565,14 +639,11 @@ class Assistant:
         """
         create new message and add it to thread
         """
-        message = self.client.beta.threads.messages.create(
-            thread_id=self.thread_id,
-            role="user",
-            content=message_text
-        )
+        with self.tracer.span("openai.add_message"):
+            message_id = self.backend.add_message(message_text)
 
-        self.message_id = message.id
-        print(f'  MESSAGE ADDED: {message.id}')
+        self.message_id = message_id
+        print(f'  MESSAGE ADDED: {message_id}')
 
     def parse_stream(self, stream):
 
@@ -596,23 +667,12 @@ class Assistant:
     def create_run(self):
         """create initial run"""
 
-        stream = self.client.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id=self.assistant_id,
-            stream=True
-        )
+        self.tracer.mark_request()
+        self.metrics.start_request()
+        with self.tracer.span("openai.create_run"):
+            stream = self.backend.create_run()
         return stream
 
-    def run_status(self):
-        """get run status"""
-        # get run status
-        run = self.client.beta.threads.runs.retrieve(
-            thread_id=self.thread_id,
-            run_id=self.run_id,
-        )
-
-        return run
-
     def submit_tool_call(self, response_list: list):
         """
         send tool call responses
@@ -620,65 +680,33 @@ class Assistant:
         """
 
         # function reply
-        stream = self.client.beta.threads.runs.submit_tool_outputs(
-            thread_id=self.thread_id,
-            run_id=self.run_id,
-            tool_outputs=response_list,
-            stream=True,
-        )
+        self.tracer.mark_request()
+        self.metrics.start_request()
+        with self.tracer.span("openai.submit_tool_outputs", n_outputs=len(response_list)):
+            stream = self.backend.submit_tool_outputs(self.run_id, response_list)
 
         return stream
 
-    def send_func_response(self, response_list: list):
-        """
-        send tool call responses
-        response_list : list of dicts, each dict contains tool_call id and output
-        """
-
-        # function reply
-        run = self.client.beta.threads.runs.submit_tool_outputs(
-            thread_id=self.thread_id,
-            run_id=self.run_id,
-            tool_outputs=response_list
-        )
-
-        print(f"RESP RUN STATUS: run_id: {run.id}, status: {run.status}")
-
-
     def cancel_run(self):
-        run = self.client.beta.threads.runs.cancel(
-            thread_id=self.thread_id,
-            run_id=self.run_id
-        )
+        run = self.backend.cancel_run(self.run_id)
         print("RUN CANCEL")
 
 
-
-
 if __name__ == "__main__":
 
-    assistant = Assistant(assistant_id =ASSISTANT_ID)
-    assistant.start_server()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    parser = argparse.ArgumentParser(description="Fusion 360 GPT Assistant server")
+    parser.add_argument("--backend", choices=["assistants", "chat", "fake"], default=MODEL_BACKEND)
+    parser.add_argument("--model", default="gpt-4o", help="chat backend, model used until settings are uploaded")
+    parser.add_argument("--scenario", default="assembly_queries", help="fake backend, scenario name or path")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="fake backend, 0 = no simulated latency")
+    parser.add_argument("--port", type=int, default=6000)
+    args = parser.parse_args()
+
+    backend = None
+    if args.backend == "chat":
+        backend = OpenAIChatBackend(args.model)
+    elif args.backend == "fake":
+        backend = load_scenario_backend(args.scenario, args.time_scale)
+
+    assistant = Assistant(assistant_id=ASSISTANT_ID, backend=backend)
+    assistant.start_server(('localhost', args.port))
@@ -0,0 +1,15 @@
+# ipc
+import socket
+
+
+def set_nodelay(conn):
+    """
+    disable Nagle on a multiprocessing connection, back to back small
+    messages otherwise wait on the peer's delayed ACK (~40ms)
+    """
+    try:
+        sock = socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.close()
+    except (OSError, AttributeError, ValueError):
+        pass
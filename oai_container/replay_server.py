@@ -0,0 +1,261 @@
+"""
+Replays session recordings (Fusion-GPT-Addin/recordings/*.jsonl) in place of connection.py.
+
+serve: stand in for connection.py, Fusion connects as usual and each user message
+       is answered with the next recorded turn, tool calls are executed live in Fusion.
+    python replay_server.py serve ../Fusion-GPT-Addin/recordings/session_x.jsonl --speed 1
+
+load: in process server plus N concurrent clients replaying the Fusion side of the
+      recording, reports turn latency and message throughput.
+    python replay_server.py load ../Fusion-GPT-Addin/recordings/session_x.jsonl --concurrency 8 --speed 0
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import statistics
+import traceback
+from multiprocessing.connection import Listener, Client
+
+from ipc import set_nodelay
+
+# recording reader is shared with the add-in, it has no Fusion dependencies
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Fusion-GPT-Addin", "f_interface"))
+import session_recording
+
+
+ADDRESS = ('localhost', 6000)
+AUTHKEY = b'fusion260'
+
+
+class Pacer:
+    """
+    sleep so events keep their recorded spacing, divided by speed
+    speed 0 sends as fast as possible
+    """
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.last_t = None
+        self.last_ts = None
+
+    def reset(self, t: float):
+        self.last_t = t
+        self.last_ts = time.monotonic()
+
+    def wait(self, t: float):
+        if self.speed and self.last_t is not None:
+            wait = (t - self.last_t) / self.speed - (time.monotonic() - self.last_ts)
+            if wait > 0:
+                time.sleep(wait)
+        self.reset(t)
+
+
+class ReplayServer:
+    """
+    answers each connection with the recorded server side messages
+    """
+
+    def __init__(self, recording, speed: float = 1.0, address=ADDRESS):
+        self.recording = recording
+        self.turns = recording.turns()
+        self.speed = speed
+        self.address = address
+        self.listener = None
+
+    def function_call_response(self, message: dict):
+        """system calls from GptClient, not part of the recording"""
+        function_name = message.get("function_name")
+        if function_name == "get_available_models":
+            return ["replay"]
+        if function_name == "get_available_system_instructions":
+            return ["replay.txt"]
+        if function_name == "update_settings":
+            return {"id": "replay", "name": "replay", "model": "replay", "created_at": 0}
+        return f"Error: replay server has no function '{function_name}'"
+
+    def replay(self, conn):
+        """serve one connection until it closes"""
+        turn_index = 0
+        pacer = Pacer(self.speed)
+
+        while True:
+            try:
+                message_raw = conn.recv()
+            except EOFError:
+                return
+
+            message = json.loads(message_raw)
+            if message.get("message_type") == "function_call":
+                conn.send(json.dumps(self.function_call_response(message)))
+                continue
+
+            if message.get("message_type") != "thread_update":
+                conn.send(json.dumps({"content": None}))
+                continue
+
+            turn = self.turns[turn_index % len(self.turns)]
+            turn_index += 1
+
+            # first send record is the thread_update we just received
+            records = turn[1:]
+            if records and records[0]["type"] == "send":
+                pacer.reset(records[0]["t"])
+                records = records[1:]
+            else:
+                pacer.reset(turn[0]["t"])
+
+            for rec in records:
+                if rec["type"] == "recv":
+                    pacer.wait(rec["t"])
+                    conn.send(rec["data"])
+                elif rec["type"] == "send":
+                    # live tool call result from Fusion
+                    conn.recv()
+                    pacer.reset(rec["t"])
+
+    def handle(self, conn):
+        set_nodelay(conn)
+        with conn:
+            try:
+                self.replay(conn)
+            except Exception as e:
+                print(f"ERROR: {e} {traceback.format_exc()}")
+
+    def serve(self, max_connections: int = None, ready: threading.Event = None):
+        """accept connections, one thread per connection"""
+        n_accepted = 0
+        threads = []
+        # default backlog is 1, concurrent connects would wait on SYN retries
+        backlog = max(max_connections or 0, 16)
+        with Listener(self.address, backlog=backlog, authkey=AUTHKEY) as listener:
+            self.listener = listener
+            print(f"REPLAY SERVER: {self.recording.path}, turns: {len(self.turns)}, speed: {self.speed}")
+            if ready is not None:
+                ready.set()
+
+            while max_connections is None or n_accepted < max_connections:
+                conn = listener.accept()
+                n_accepted += 1
+                thread = threading.Thread(target=self.handle, args=(conn,), daemon=True)
+                thread.start()
+                threads.append(thread)
+
+            for thread in threads:
+                thread.join()
+
+
+def replay_client(recording, address, speed: float, repeat: int, stats: list):
+    """
+    plays the Fusion side of the recording: sends recorded user messages and
+    tool results, waits for each recorded server message
+    """
+    pacer = Pacer(speed)
+    with Client(address, authkey=AUTHKEY) as conn:
+        set_nodelay(conn)
+        for _ in range(repeat):
+            for turn in recording.turns():
+                start = time.monotonic()
+                n_recv = 0
+                first_recv = None
+
+                pacer.reset(turn[0]["t"])
+                for rec in turn[1:]:
+                    if rec["type"] == "send":
+                        pacer.wait(rec["t"])
+                        conn.send(rec["data"])
+                    elif rec["type"] == "recv":
+                        conn.recv()
+                        n_recv += 1
+                        if first_recv is None:
+                            first_recv = time.monotonic() - start
+                        pacer.reset(rec["t"])
+
+                end = time.monotonic()
+                stats.append({
+                    "start": start,
+                    "end": end,
+                    "turn_s": end - start,
+                    "first_recv_s": first_recv or 0.0,
+                    "n_recv": n_recv,
+                })
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def load_test(recording, concurrency: int, speed: float, client_speed: float, repeat: int, address):
+    server = ReplayServer(recording, speed, address)
+    ready = threading.Event()
+    server_thread = threading.Thread(target=server.serve, args=(concurrency, ready), daemon=True)
+    server_thread.start()
+    ready.wait()
+
+    stats = []
+    clients = [
+        threading.Thread(target=replay_client, args=(recording, address, client_speed, repeat, stats))
+        for _ in range(concurrency)
+    ]
+
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+    # connection setup and auth handshake are excluded
+    wall = max(s["end"] for s in stats) - min(s["start"] for s in stats) if stats else 0.0
+
+    turn_times = [s["turn_s"] for s in stats]
+    n_messages = sum(s["n_recv"] for s in stats)
+
+    results = {
+        "concurrency": concurrency,
+        "turns": len(stats),
+        "messages": n_messages,
+        "wall_s": round(wall, 4),
+        "messages_per_s": round(n_messages / wall, 1) if wall else None,
+        "turn_p50_ms": round(percentile(turn_times, 50) * 1000, 3),
+        "turn_p95_ms": round(percentile(turn_times, 95) * 1000, 3),
+        "turn_max_ms": round(max(turn_times, default=0.0) * 1000, 3),
+        "first_recv_mean_ms": round(statistics.fmean([s["first_recv_s"] for s in stats]) * 1000, 3) if stats else None,
+        "recorded_duration_s": round(recording.duration, 3),
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="replay session recordings")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("recording", help="session recording .jsonl file")
+    parser.add_argument("--speed", type=float, default=1.0, help="server side speed, 0 = as fast as possible")
+    parser.add_argument("--client-speed", type=float, default=0.0, help="load mode, Fusion side speed")
+    parser.add_argument("--concurrency", type=int, default=1, help="load mode, concurrent connections")
+    parser.add_argument("--repeat", type=int, default=1, help="load mode, replays per connection")
+    parser.add_argument("--port", type=int, default=ADDRESS[1])
+    args = parser.parse_args(argv)
+
+    recording = session_recording.load_recording(args.recording)
+    if not recording.turns():
+        print(f"Error: no user messages in {args.recording}")
+        return 1
+
+    address = (ADDRESS[0], args.port)
+
+    if args.mode == "serve":
+        ReplayServer(recording, args.speed, address).serve()
+    else:
+        results = load_test(recording, args.concurrency, args.speed, args.client_speed, args.repeat, address)
+        print(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
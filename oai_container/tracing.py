@@ -0,0 +1,185 @@
+
+import time
+from contextlib import contextmanager
+
+# key used to pass trace data in messages sent to Fusion
+TRACE_META_KEY = "trace"
+
+# waits between stream events shorter than this are not recorded as spans,
+# a long answer otherwise adds one span per delta
+STREAM_GAP_SECONDS = 0.1
+
+
+class SpanRecorder:
+    """
+    Collects timed spans on the connection process while a trace is active.
+    The trace context is set from the user message sent by Fusion, spans
+    are drained into the next message sent back over the connection.
+    Timestamps use time.monotonic() so both processes share a clock.
+    """
+
+    def __init__(self, process_name="connection"):
+        self.process_name = process_name
+        self.trace_id = None
+        self.spans = []
+
+        # set on first delta of a run, used for time to first token
+        self.run_start = None
+        self.first_token_recorded = False
+
+    @property
+    def active(self):
+        return self.trace_id is not None
+
+    def set_context(self, trace_context):
+        """trace context from Fusion message, None disables recording"""
+        self.spans = []
+        self.run_start = None
+        self.first_token_recorded = False
+
+        if isinstance(trace_context, dict):
+            self.trace_id = trace_context.get("trace_id")
+        else:
+            self.trace_id = None
+
+    @contextmanager
+    def span(self, name, **args):
+        """time the enclosed block, no op when no trace is active"""
+        if not self.active:
+            yield
+            return
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.monotonic(), **args)
+
+    def add_span(self, name, start, end, **args):
+        if not self.active:
+            return
+
+        self.spans.append({
+            "name": name,
+            "ts": start,
+            "dur": max(end - start, 0.0),
+            "proc": self.process_name,
+            "args": args,
+        })
+
+    def add_stream_wait(self, start, end, event, first: bool):
+        """
+        wait for a stream event, recorded for the first event of a stream
+        and for gaps of at least STREAM_GAP_SECONDS
+        """
+        if first or end - start >= STREAM_GAP_SECONDS:
+            self.add_span("openai.stream_wait", start, end, event=event, first=first)
+
+    def mark_request(self):
+        """start of an OpenAI stream request"""
+        self.run_start = time.monotonic()
+        self.first_token_recorded = False
+
+    def mark_first_token(self, event_type):
+        """span from stream request to first delta event"""
+        if self.first_token_recorded or self.run_start is None:
+            return
+        self.first_token_recorded = True
+        self.add_span("openai.first_token", self.run_start, time.monotonic(), event=event_type)
+
+    def drain(self):
+        """return and clear recorded spans"""
+        spans = self.spans
+        self.spans = []
+        return spans
+
+    def attach(self, message: dict) -> dict:
+        """add pending spans to an outgoing message dict"""
+        if self.active and self.spans:
+            message[TRACE_META_KEY] = self.drain()
+        return message
+
+
+class BackendMetrics:
+    """
+    Always on latency counters for the model backend, reported per backend
+    so deployments can compare the Assistants and Chat paths.
+        turn_first_token:  user message received -> first delta, includes thread/message setup calls
+        request_first_token: stream request sent -> first delta
+        tool_round_trip: requires_action -> first delta after tool outputs are submitted
+    """
+
+    def __init__(self, backend_name: str):
+        self.backend_name = backend_name
+        self.samples = {
+            "turn_first_token": [],
+            "request_first_token": [],
+            "tool_round_trip": [],
+            "tool_call": [],
+            "turn": [],
+        }
+        self.n_requests = 0
+        self.n_turns = 0
+
+        self.turn_start = None
+        self.request_start = None
+        self.tool_start = None
+        self.waiting_first_token = False
+
+    def start_turn(self):
+        self.turn_start = time.monotonic()
+        self.tool_start = None
+        self.n_turns += 1
+
+    def end_turn(self):
+        if self.turn_start is not None:
+            self.samples["turn"].append(time.monotonic() - self.turn_start)
+        self.turn_start = None
+
+    def start_request(self):
+        self.request_start = time.monotonic()
+        self.waiting_first_token = True
+        self.n_requests += 1
+
+    def start_tool_calls(self):
+        """requires_action received"""
+        self.tool_start = time.monotonic()
+
+    def add_tool_call(self, duration: float):
+        """one Fusion tool call, ipc round trip"""
+        self.samples["tool_call"].append(duration)
+
+    def first_token(self):
+        if not self.waiting_first_token:
+            return
+        self.waiting_first_token = False
+
+        now = time.monotonic()
+        self.samples["request_first_token"].append(now - self.request_start)
+
+        if self.tool_start is not None:
+            self.samples["tool_round_trip"].append(now - self.tool_start)
+            self.tool_start = None
+        elif self.turn_start is not None:
+            self.samples["turn_first_token"].append(now - self.turn_start)
+
+    def summary(self) -> dict:
+        """ms stats for each sample type"""
+        summary = {
+            "backend": self.backend_name,
+            "turns": self.n_turns,
+            "requests": self.n_requests,
+        }
+        for name, values in self.samples.items():
+            values = sorted(values)
+            if not values:
+                summary[name] = None
+                continue
+            summary[name] = {
+                "n": len(values),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(values[len(values) // 2] * 1000, 3),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return summary